@@ -3,9 +3,22 @@ Hello LangGraph - Primer script de prueba
 Demuestra un grafo simple con LangGraph
 """
 
+import logging
+import os
+import sys
 from typing import TypedDict
 from langgraph.graph import StateGraph, END
 
+# Utilidades del curso en 01-fundamentos (misma ruta que usa graph_registry.py)
+FUNDAMENTOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "01-fundamentos")
+if FUNDAMENTOS not in sys.path:
+    sys.path.insert(0, FUNDAMENTOS)
+
+from node_profiler import profiler_from_env
+
+# Salida de los nodos: se activa en main() según LOG_LEVEL (sin costo si está apagada)
+logger = logging.getLogger("kualtos.hello")
+
 # Definir el estado del grafo
 class GraphState(TypedDict):
     message: str
@@ -14,7 +27,7 @@ class GraphState(TypedDict):
 # Funciones de nodos
 def node_welcome(state: GraphState) -> GraphState:
     """Nodo de bienvenida."""
-    print("🎯 Ejecutando nodo: welcome")
+    logger.info("🎯 Ejecutando nodo: welcome")
     return {
         "message": "¡Bienvenido a LangGraph!",
         "counter": state.get("counter", 0) + 1
@@ -22,7 +35,7 @@ def node_welcome(state: GraphState) -> GraphState:
 
 def node_info(state: GraphState) -> GraphState:
     """Nodo de información."""
-    print("🎯 Ejecutando nodo: info")
+    logger.info("🎯 Ejecutando nodo: info")
     return {
         "message": state["message"] + " Este es un grafo simple.",
         "counter": state["counter"] + 1
@@ -30,16 +43,25 @@ def node_info(state: GraphState) -> GraphState:
 
 def node_farewell(state: GraphState) -> GraphState:
     """Nodo de despedida."""
-    print("🎯 Ejecutando nodo: farewell")
+    logger.info("🎯 Ejecutando nodo: farewell")
     return {
         "message": state["message"] + " ¡Hasta pronto!",
         "counter": state["counter"] + 1
     }
 
-def create_graph():
-    """Crea y configura el grafo."""
+def create_graph(instrumentation=None, optimizer=None):
+    """
+    Crea y configura el grafo.
+    instrumentation (opcional) registra latencias por nodo (ver 01-fundamentos/instrumentation.py).
+    optimizer (opcional) reescribe el grafo antes de compilarlo (ver 01-fundamentos/graph_fusion.py).
+    """
+    if instrumentation is None:
+        instrumentation = profiler_from_env()  # KUALTOS_PROFILE: perfil por nodo (ver node_profiler.py)
     # Inicializar el grafo
-    workflow = StateGraph(GraphState)
+    if instrumentation is None:
+        workflow = StateGraph(GraphState)
+    else:
+        workflow = instrumentation.state_graph(GraphState)
     
     # Agregar nodos
     workflow.add_node("welcome", node_welcome)
@@ -53,9 +75,14 @@ def create_graph():
     workflow.add_edge("farewell", END)
     
     # Compilar el grafo
+    if optimizer is not None:
+        workflow = optimizer(workflow)
     return workflow.compile()
 
 def main():
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(),
+                        format="%(message)s", stream=sys.stdout)
+    
     print("=" * 60)
     print("HELLO LANGGRAPH - Primer Grafo Simple")
     print("=" * 60)
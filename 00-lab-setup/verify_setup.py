@@ -1,11 +1,31 @@
 """
 Script de verificación del entorno de desarrollo.
 Valida que todas las dependencias estén instaladas correctamente.
+
+Por defecto lee las versiones de los metadatos de cada paquete sin importarlo
+(rápido, no carga cientos de módulos). Con --deep además importa cada paquete.
+
+Uso:
+    python verify_setup.py [--deep]
 """
 
+import argparse
+import importlib.util
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
 from typing import List, Tuple
 
+# Nombre de importación → nombre de la distribución en pip (cuando difieren)
+DISTRIBUTION_NAMES = {
+    "langchain_core": "langchain-core",
+    "langchain_anthropic": "langchain-anthropic",
+    "langchain_openai": "langchain-openai",
+    "langchain_community": "langchain-community",
+    "dotenv": "python-dotenv",
+}
+
 def check_python_version() -> Tuple[bool, str]:
     """Verifica que Python sea 3.11 o superior."""
     version = sys.version_info
@@ -13,14 +33,41 @@ def check_python_version() -> Tuple[bool, str]:
         return True, f"✅ Python {version.major}.{version.minor}.{version.micro}"
     return False, f"❌ Python {version.major}.{version.minor} (se requiere 3.11+)"
 
-def check_package(package_name: str) -> Tuple[bool, str]:
-    """Verifica que un paquete esté instalado."""
-    try:
-        module = __import__(package_name.replace("-", "_"))
-        version = getattr(module, "__version__", "unknown")
+def check_package(package_name: str, deep: bool = False) -> Tuple[bool, str]:
+    """
+    Verifica que un paquete esté instalado.
+    Sin deep: versión desde los metadatos y ubicación del módulo, sin importarlo.
+    Con deep: importa el paquete completo.
+    """
+    module_name = package_name.replace("-", "_")
+    distribution = DISTRIBUTION_NAMES.get(module_name, module_name.replace("_", "-"))
+
+    if deep:
+        try:
+            module = __import__(module_name)
+        except ImportError:
+            return False, f"❌ {package_name} no instalado"
+        version = getattr(module, "__version__", None)
+        if version is None:
+            try:
+                version = metadata.version(distribution)
+            except metadata.PackageNotFoundError:
+                version = "unknown"
         return True, f"✅ {package_name} ({version})"
-    except ImportError:
+
+    if importlib.util.find_spec(module_name) is None:
         return False, f"❌ {package_name} no instalado"
+    try:
+        version = metadata.version(distribution)
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    return True, f"✅ {package_name} ({version})"
+
+def timed(check, *args) -> Tuple[bool, str, float]:
+    """Ejecuta una verificación y agrega su duración en milisegundos."""
+    start = time.perf_counter()
+    success, message = check(*args)
+    return success, message, (time.perf_counter() - start) * 1000
 
 def check_env_file() -> Tuple[bool, str]:
     """Verifica que exista el archivo .env."""
@@ -30,15 +77,17 @@ def check_env_file() -> Tuple[bool, str]:
     return False, "⚠️  Archivo .env no encontrado (copia .env.example a .env)"
 
 def main():
+    parser = argparse.ArgumentParser(description="Verificación del entorno de desarrollo")
+    parser.add_argument("--deep", action="store_true",
+                        help="Importa cada paquete además de leer sus metadatos (más lento)")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("VERIFICACIÓN DEL ENTORNO DE DESARROLLO")
     print("=" * 60)
     print()
     
-    checks: List[Tuple[bool, str]] = []
-    
-    # Verificar Python
-    checks.append(check_python_version())
+    start = time.perf_counter()
     
     # Verificar paquetes críticos
     critical_packages = [
@@ -52,15 +101,23 @@ def main():
         "pydantic"
     ]
     
-    for package in critical_packages:
-        checks.append(check_package(package))
+    # Las verificaciones son independientes: se ejecutan en paralelo
+    with ThreadPoolExecutor(max_workers=len(critical_packages) + 2) as pool:
+        futures = [pool.submit(timed, check_python_version)]
+        futures += [pool.submit(timed, check_package, package, args.deep)
+                    for package in critical_packages]
+        futures.append(pool.submit(timed, check_env_file))
+        results = [future.result() for future in futures]
+    
+    total_ms = (time.perf_counter() - start) * 1000
+    checks: List[Tuple[bool, str]] = [(success, message) for success, message, _ in results]
     
-    # Verificar archivo .env
-    checks.append(check_env_file())
+    # Mostrar resultados con la duración de cada verificación
+    for success, message, elapsed_ms in results:
+        print(f"{message:<45} {elapsed_ms:>8.1f} ms")
     
-    # Mostrar resultados
-    for success, message in checks:
-        print(message)
+    print()
+    print(f"⏱️  Tiempo total: {total_ms:.1f} ms ({'--deep' if args.deep else 'metadatos'})")
     
     print()
     print("=" * 60)
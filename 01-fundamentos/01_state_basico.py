@@ -3,10 +3,18 @@ Lección 1.1: Estado Básico en LangGraph
 Aprende cómo definir y manipular el estado compartido entre nodos.
 """
 
+import logging
 from typing import TypedDict, Annotated
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
 
+from graph_registry import register_graph
+from instrumentation import configure_logging
+from node_profiler import profiler_from_env
+
+# Salida de los nodos: se activa con configure_logging() (no cuesta nada si está apagada)
+logger = logging.getLogger("kualtos.estado")
+
 
 # Definir el estado del grafo
 class ConversationState(TypedDict):
@@ -19,8 +27,10 @@ class ConversationState(TypedDict):
 
 def greet_user(state: ConversationState) -> dict:
     """Nodo que saluda al usuario."""
-    print(f"\n🤖 Nodo: greet_user")
-    print(f"   Estado actual: {state}")
+    logger.info("\n🤖 Nodo: greet_user")
+    # Resumen acotado: el historial completo crece con cada turno
+    logger.info("   Estado actual: usuario=%s, mensajes=%d, turno=%s",
+                state["user_name"], len(state["messages"]), state.get("turn_count", 0))
     
     greeting = f"Hola {state['user_name']}! Bienvenido a Kualtos."
     
@@ -32,8 +42,8 @@ def greet_user(state: ConversationState) -> dict:
 
 def ask_question(state: ConversationState) -> dict:
     """Nodo que hace una pregunta."""
-    print(f"\n🤖 Nodo: ask_question")
-    print(f"   Mensajes hasta ahora: {len(state['messages'])}")
+    logger.info("\n🤖 Nodo: ask_question")
+    logger.info("   Mensajes hasta ahora: %s", len(state["messages"]))
     
     question = "¿En qué puedo ayudarte hoy?"
     
@@ -45,7 +55,7 @@ def ask_question(state: ConversationState) -> dict:
 
 def summarize_conversation(state: ConversationState) -> dict:
     """Nodo que resume la conversación."""
-    print(f"\n🤖 Nodo: summarize_conversation")
+    logger.info("\n🤖 Nodo: summarize_conversation")
     
     summary = f"Conversación con {state['user_name']} completada en {state['turn_count']} turnos."
     
@@ -69,15 +79,25 @@ def check_age(state: ConversationState) -> dict:
     }
 
 
-def create_graph():
-    """Crea y compila el grafo."""
-    workflow = StateGraph(ConversationState)
+def create_graph(state_schema=ConversationState, instrumentation=None):
+    """
+    Crea y compila el grafo.
+    state_schema permite usar otra definición del estado con los mismos campos
+    (ej: message_log.WindowedConversationState).
+    instrumentation (opcional) registra latencias por nodo.
+    """
+    if instrumentation is None:
+        instrumentation = profiler_from_env()  # KUALTOS_PROFILE: perfil por nodo (ver node_profiler.py)
+    if instrumentation is None:
+        workflow = StateGraph(state_schema)
+    else:
+        workflow = instrumentation.state_graph(state_schema)
     
-    # Agregar nodos
-    workflow.add_node("greet", greet_user)
-    workflow.add_node("check_age", check_age)
-    workflow.add_node("ask", ask_question)
-    workflow.add_node("summarize", summarize_conversation)
+    # Agregar nodos (input_schema: los nodos reciben el estado elegido)
+    workflow.add_node("greet", greet_user, input_schema=state_schema)
+    workflow.add_node("check_age", check_age, input_schema=state_schema)
+    workflow.add_node("ask", ask_question, input_schema=state_schema)
+    workflow.add_node("summarize", summarize_conversation, input_schema=state_schema)
     
     # Definir flujo
     workflow.set_entry_point("greet")
@@ -89,7 +109,12 @@ def create_graph():
     return workflow.compile()
 
 
+register_graph("conversation", create_graph)
+
+
 def main():
+    configure_logging()
+    
     print("=" * 70)
     print("LECCIÓN 1.1: ESTADO BÁSICO EN LANGGRAPH")
     print("=" * 70)
@@ -3,9 +3,23 @@ Lección 1.2: Nodos y Edges Condicionales
 Aprende a crear flujos dinámicos basados en el estado.
 """
 
+import logging
 from typing import TypedDict, Literal
 from langgraph.graph import StateGraph, END
 
+from graph_registry import register_graph, get_graph
+from instrumentation import configure_logging
+from node_profiler import profiler_from_env
+from loan_pricing import BAND_FLOORS, check_rules, price_loan
+from rules_engine import RulesEngine
+
+# Salida de los nodos: se activa con configure_logging() (no cuesta nada si está apagada)
+logger = logging.getLogger("kualtos.prestamos")
+
+# Umbrales y reglas de decisión (loan_rules.json); quien sirve tráfico llama a
+# RULES.start_watching() para recargarlas solas si el archivo cambia
+RULES = RulesEngine(validate=check_rules)  # Rechaza reglas que aprueben scores sin tasa
+
 
 # Estado del grafo
 class LoanApplicationState(TypedDict):
@@ -16,38 +30,53 @@ class LoanApplicationState(TypedDict):
     employment_status: str
     decision: str
     reason: str
+    route: str  # Ruta decidida por las reglas (una sola vez por invocación, en check_score)
+    quote: dict  # Cotización (solo préstamos aprobados): tasa, cuota y amortización
 
 
 def validate_application(state: LoanApplicationState) -> dict:
     """Nodo que valida los datos iniciales."""
-    print(f"\n🔍 Validando solicitud de {state['applicant_name']}")
-    print(f"   Monto solicitado: ${state['requested_amount']:,.2f}")
-    print(f"   Score de crédito: {state['credit_score']}")
-    print(f"   Estado laboral: {state['employment_status']}")
+    logger.info("\n🔍 Validando solicitud de %s", state["applicant_name"])
+    logger.info("   Monto solicitado: $%.2f", state["requested_amount"])
+    logger.info("   Score de crédito: %s", state["credit_score"])
+    logger.info("   Estado laboral: %s", state["employment_status"])
     
     return {}  # No modifica el estado, solo valida
 
 
 def check_credit_score(state: LoanApplicationState) -> dict:
-    """Nodo que evalúa el score de crédito."""
+    """
+    Nodo que evalúa el score de crédito con las reglas de loan_rules.json.
+    Guarda la ruta y la razón en el estado: el ruteo y el rechazo usan la misma
+    versión de las reglas aunque el archivo se recargue a mitad de la invocación.
+    """
     score = state["credit_score"]
     
-    print(f"\n📊 Evaluando score de crédito: {score}")
+    logger.info("\n📊 Evaluando score de crédito: %s", score)
     
-    if score >= 700:
-        print("   ✅ Score excelente")
-    elif score >= 600:
-        print("   ⚠️  Score aceptable")
-    else:
-        print("   ❌ Score bajo")
+    rules = RULES.current  # Una sola lectura: versión y decisión coinciden
+    route, reason = rules.decide(score, state["employment_status"])
+    logger.info("   Reglas v%s → %s", rules.version, route)
     
+    return {"route": route, "reason": reason or ""}
+
+
+def verify_identity(state: LoanApplicationState) -> dict:
+    """Nodo que verifica la identidad del solicitante (independiente del crédito)."""
+    logger.info("\n🪪 Verificando identidad de %s", state["applicant_name"])
+    return {}
+
+
+def verify_employment(state: LoanApplicationState) -> dict:
+    """Nodo que verifica el estado laboral declarado."""
+    logger.info("\n💼 Verificando empleo: %s", state["employment_status"])
     return {}
 
 
 def approve_loan(state: LoanApplicationState) -> dict:
     """Nodo que aprueba el préstamo."""
-    print(f"\n✅ PRÉSTAMO APROBADO")
-    print(f"   Monto: ${state['requested_amount']:,.2f}")
+    logger.info("\n✅ PRÉSTAMO APROBADO")
+    logger.info("   Monto: $%.2f", state["requested_amount"])
     
     return {
         "decision": "APROBADO",
@@ -55,13 +84,26 @@ def approve_loan(state: LoanApplicationState) -> dict:
     }
 
 
+def price_approved_loan(state: LoanApplicationState) -> dict:
+    """Nodo que cotiza el préstamo aprobado según la banda de su score."""
+    quote = price_loan(state["requested_amount"], state["credit_score"])
+    if quote is None:
+        # check_rules impide cargar reglas así: un aprobado sin tasa es un error, no quote=None
+        raise ValueError(f"Score {state['credit_score']} aprobado sin banda de tasa "
+                         f"(la más baja empieza en {BAND_FLOORS[0]})")
+    
+    logger.info("\n💵 Cotización: %.0f%% anual", quote["annual_rate"] * 100)
+    logger.info("   %s pagos de $%.2f (intereses totales: $%.2f)",
+                quote["term_months"], quote["monthly_payment"], quote["total_interest"])
+    
+    return {"quote": quote}
+
+
 def reject_loan(state: LoanApplicationState) -> dict:
     """Nodo que rechaza el préstamo."""
-    print(f"\n❌ PRÉSTAMO RECHAZADO")
+    logger.info("\n❌ PRÉSTAMO RECHAZADO")
     
-    reason = "Score de crédito insuficiente"
-    if state["employment_status"] == "desempleado":
-        reason = "Sin empleo verificable"
+    reason = state.get("reason") or "Score de crédito insuficiente"
     
     return {
         "decision": "RECHAZADO",
@@ -71,8 +113,8 @@ def reject_loan(state: LoanApplicationState) -> dict:
 
 def manual_review(state: LoanApplicationState) -> dict:
     """Nodo que requiere revisión manual."""
-    print(f"\n⚠️  REVISIÓN MANUAL REQUERIDA")
-    print(f"   Caso limítrofe - requiere análisis adicional")
+    logger.info("\n⚠️  REVISIÓN MANUAL REQUERIDA")
+    logger.info("   Caso limítrofe - requiere análisis adicional")
     
     return {
         "decision": "REVISIÓN_MANUAL",
@@ -83,52 +125,78 @@ def manual_review(state: LoanApplicationState) -> dict:
 def route_by_credit_score(state: LoanApplicationState) -> Literal["approve", "reject", "manual_review"]:
     """
     Función de ruteo condicional basada en score de crédito.
-    Retorna el nombre del siguiente nodo.
+    Retorna la ruta que check_score decidió con las reglas de loan_rules.json:
+    sin empleo = rechazo; score 700+ = aprobación; menos de 600 = rechazo;
+    en medio = revisión manual. Sin ruta (ej: check_score venció su presupuesto)
+    el caso pasa a revisión manual.
     """
-    score = state["credit_score"]
-    employment = state["employment_status"]
-    
-    print(f"\n🔀 Decidiendo ruta...")
-    print(f"   Score: {score}, Empleo: {employment}")
+    logger.info("\n🔀 Decidiendo ruta...")
+    logger.info("   Score: %s, Empleo: %s", state["credit_score"], state["employment_status"])
     
-    # Sin empleo = rechazo automático
-    if employment == "desempleado":
-        print(f"   → Rutear a: reject")
-        return "reject"
-    
-    # Score excelente = aprobación
-    if score >= 700:
-        print(f"   → Rutear a: approve")
-        return "approve"
-    
-    # Score muy bajo = rechazo
-    if score < 600:
-        print(f"   → Rutear a: reject")
-        return "reject"
-    
-    # Score medio = revisión manual
-    print(f"   → Rutear a: manual_review")
-    return "manual_review"
+    route = state.get("route") or "manual_review"
+    logger.info("   → Rutear a: %s", route)
+    return route
 
 
-def create_graph():
-    """Crea el grafo con edges condicionales."""
-    workflow = StateGraph(LoanApplicationState)
+def create_graph(instrumentation=None, optimizer=None, state_schema=LoanApplicationState,
+                 bureau_client=None, checks=None, check_latency=0.0, deadlines=None):
+    """
+    Crea el grafo con edges condicionales.
+    instrumentation (opcional) registra latencias por nodo y decisiones de ruteo.
+    optimizer (opcional) reescribe el grafo antes de compilarlo (ver graph_fusion.py).
+    state_schema permite usar un estado compacto (ver compact_state.LoanRecord).
+    bureau_client (opcional) agrega un nodo asíncrono que consulta el score en el
+    buró antes de evaluarlo (ver kualtos_api.py); el grafo se ejecuta con ainvoke.
+    checks (opcional) agrega las verificaciones de identidad y empleo junto a la de
+    crédito: "threads" o "asyncio" las corre en ramas paralelas que terminan en un
+    nodo de unión, "sequential" las encadena (ver parallel_checks.py).
+    check_latency simula la E/S de cada verificación (segundos o dict por nodo).
+    deadlines (opcional) limita la latencia por nodo y por invocación; si algo
+    vence, la solicitud termina en revisión manual (ver deadlines.py).
+    """
+    if instrumentation is None:
+        instrumentation = profiler_from_env()  # KUALTOS_PROFILE: perfil por nodo (ver node_profiler.py)
+    if instrumentation is None:
+        workflow = StateGraph(state_schema)
+    else:
+        workflow = instrumentation.state_graph(state_schema)
     
     # Agregar nodos
-    workflow.add_node("validate", validate_application)
-    workflow.add_node("check_score", check_credit_score)
-    workflow.add_node("approve", approve_loan)
-    workflow.add_node("reject", reject_loan)
-    workflow.add_node("manual_review", manual_review)
+    # validate y las verificaciones externas no modifican el estado: un optimizador puede saltarlos
+    workflow.add_node("validate", validate_application, metadata={"no_op": True},
+                      input_schema=state_schema)
+    workflow.add_node("approve", approve_loan, input_schema=state_schema)
+    workflow.add_node("price", price_approved_loan, input_schema=state_schema)
+    workflow.add_node("reject", reject_loan, input_schema=state_schema)
+    workflow.add_node("manual_review", manual_review, input_schema=state_schema)
+    
+    # Rama de crédito: (buró →) evaluación del score
+    credit = [("check_score", check_credit_score)]
+    if bureau_client is not None:
+        from kualtos_api import make_bureau_node
+        credit.insert(0, ("bureau", make_bureau_node(bureau_client)))
     
-    # Flujo lineal inicial
     workflow.set_entry_point("validate")
-    workflow.add_edge("validate", "check_score")
+    if checks is None:
+        # Flujo lineal de la lección
+        previous = "validate"
+        for name, fn in credit:
+            workflow.add_node(name, fn, input_schema=state_schema)
+            workflow.add_edge(previous, name)
+            previous = name
+        decide_from = previous
+    else:
+        from parallel_checks import add_check_branches
+        decide_from = add_check_branches(
+            workflow, "validate",
+            {"verify_identity": verify_identity, "credit": credit, "verify_employment": verify_employment},
+            mode=checks, latency=check_latency, input_schema=state_schema,
+            no_op={"verify_identity", "verify_employment"},
+        )
     
     # Edge condicional: decide el siguiente paso
     workflow.add_conditional_edges(
-        "check_score",
+        decide_from,
         route_by_credit_score,
         {
             "approve": "approve",
@@ -137,12 +205,31 @@ def create_graph():
         }
     )
     
-    # Todos los nodos terminan
-    workflow.add_edge("approve", END)
+    # Los aprobados se cotizan; todos los nodos terminan
+    workflow.add_edge("approve", "price")
+    workflow.add_edge("price", END)
     workflow.add_edge("reject", END)
     workflow.add_edge("manual_review", END)
     
-    return workflow.compile()
+    if optimizer is not None:
+        workflow = optimizer(workflow)
+    if deadlines is None:
+        return workflow.compile()
+    # Sin tiempo para decidir: el caso pasa a un analista
+    workflow = deadlines.apply(workflow, exempt={"manual_review"})
+    return deadlines.bind(workflow.compile(), fallback=manual_review)
+
+
+register_graph("loan", create_graph)
+
+
+# Casos de demostración: (nombre, monto, score, estado laboral)
+DEMO_APPLICATIONS = [
+    ("Juan Pérez", 10000.00, 750, "empleado"),      # Aprobación (score alto + empleado)
+    ("Ana García", 15000.00, 550, "empleado"),      # Rechazo (score bajo)
+    ("Carlos López", 8000.00, 650, "empleado"),     # Revisión manual (score medio)
+    ("María Torres", 5000.00, 720, "desempleado"),  # Rechazo (desempleado)
+]
 
 
 def test_application(name: str, amount: float, score: int, employment: str):
@@ -151,7 +238,8 @@ def test_application(name: str, amount: float, score: int, employment: str):
     print(f"PROCESANDO SOLICITUD: {name}")
     print("=" * 70)
     
-    graph = create_graph()
+    # Grafo compilado una sola vez por proceso
+    graph = get_graph("loan")
     
     initial_state = {
         "applicant_name": name,
@@ -170,27 +258,23 @@ def test_application(name: str, amount: float, score: int, employment: str):
     print(f"Solicitante: {result['applicant_name']}")
     print(f"Decisión: {result['decision']}")
     print(f"Razón: {result['reason']}")
+    if result.get("quote"):
+        print(f"Pago mensual: ${result['quote']['monthly_payment']:,.2f} "
+              f"({result['quote']['term_months']} meses al {result['quote']['annual_rate']:.0%})")
     print("=" * 70)
     
     return result
 
 
 def main():
+    configure_logging()
+    
     print("\n" + "=" * 70)
     print("LECCIÓN 1.2: NODOS Y EDGES CONDICIONALES")
     print("=" * 70)
     
-    # Caso 1: Aprobación (score alto + empleado)
-    test_application("Juan Pérez", 10000.00, 750, "empleado")
-    
-    # Caso 2: Rechazo (score bajo)
-    test_application("Ana García", 15000.00, 550, "empleado")
-    
-    # Caso 3: Revisión manual (score medio)
-    test_application("Carlos López", 8000.00, 650, "empleado")
-    
-    # Caso 4: Rechazo (desempleado)
-    test_application("María Torres", 5000.00, 720, "desempleado")
+    for name, amount, score, employment in DEMO_APPLICATIONS:
+        test_application(name, amount, score, employment)
     
     print("\n" + "=" * 70)
     print("✅ Lección completada!")
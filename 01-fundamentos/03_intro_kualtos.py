@@ -3,9 +3,21 @@ Lección 1.3: Introducción a Kualtos - Agente FAQ Simple
 Primer agente de Kualtos que responde preguntas frecuentes sin LLM.
 """
 
+import logging
+import os
 from typing import TypedDict, Literal
 from langgraph.graph import StateGraph, END
 
+from graph_registry import register_graph, get_graph
+from keyword_matcher import KeywordMatcher
+from faq_retrieval import FAQRetriever, LazyRetriever, index_is_current, index_path
+from faq_store import open_faq_store
+from instrumentation import configure_logging
+from node_profiler import profiler_from_env
+
+# Salida de los nodos: se activa con configure_logging() (no cuesta nada si está apagada)
+logger = logging.getLogger("kualtos.faq")
+
 
 # Base de conocimiento FAQ (en lecciones futuras esto vendrá de archivos/PDFs)
 FAQ_DATABASE = {
@@ -57,6 +69,53 @@ Los pagos se reflejan en 24-48 horas hábiles."""
 }
 
 
+# Base de conocimiento en disco (opcional): genera el archivo con faq_store.py y
+# define KUALTOS_FAQ_STORE. Las respuestas se leen del archivo solo al pedirlas.
+if os.getenv("KUALTOS_FAQ_STORE"):
+    FAQ_DATABASE = open_faq_store(os.environ["KUALTOS_FAQ_STORE"])
+
+
+# Palabras clave por tema. El orden define la prioridad cuando coinciden varios temas.
+KEYWORDS = {
+    "requisitos": ["requisito", "necesito", "documentos"],
+    "tasas": ["tasa", "interés", "porcentaje"],
+    "plazos": ["cuánto tiempo", "cuándo", "rapidez", "aprueban"],
+    "pagos": ["pago", "pagar", "abonar"],
+}
+
+# Autómata precompilado a partir de KEYWORDS
+CLASSIFIER = KeywordMatcher(KEYWORDS, default="desconocido")
+
+def build_retriever() -> FAQRetriever:
+    """
+    Índice TF-IDF de la base FAQ. Con KUALTOS_FAQ_STORE abre el índice
+    precalculado junto al archivo (faq_store.py build) si está al día; si no,
+    lo construye en memoria recorriendo toda la base.
+    """
+    store = os.getenv("KUALTOS_FAQ_STORE")
+    if store and index_is_current(store):
+        return FAQRetriever.load(index_path(store), min_score=0.15)
+    if store:
+        logger.warning("Índice TF-IDF ausente o viejo para %s: se construye en memoria", store)
+    return FAQRetriever.from_faq(FAQ_DATABASE, min_score=0.15)
+
+
+# Índice TF-IDF sobre preguntas y respuestas: respaldo cuando no hay palabras clave.
+# Se abre en la primera búsqueda (importar la lección no lee la base); si cambia
+# FAQ_DATABASE, RETRIEVER.invalidate() lo reconstruye en la siguiente.
+RETRIEVER = LazyRetriever(build_retriever)
+
+
+# Preguntas de prueba (también usadas por los scripts de carga y benchmark)
+TEST_QUERIES = [
+    "¿Qué documentos necesito para un préstamo?",
+    "¿Cuál es la tasa de interés?",
+    "¿Cuánto tardan en aprobar mi solicitud?",
+    "¿Cómo puedo pagar mi préstamo?",
+    "¿Cuál es el horario de atención?",  # No reconocida
+]
+
+
 # Estado del agente FAQ
 class FAQAgentState(TypedDict):
     """Estado del agente de preguntas frecuentes."""
@@ -71,23 +130,12 @@ def classify_question(state: FAQAgentState) -> dict:
     Nodo que clasifica la pregunta del usuario.
     En lecciones futuras usaremos un LLM para esto.
     """
-    query = state["user_query"].lower()
-    
-    print(f"\n🔍 Clasificando pregunta: '{state['user_query']}'")
-    
-    # Clasificación simple por palabras clave
-    if any(word in query for word in ["requisito", "necesito", "documentos"]):
-        topic = "requisitos"
-    elif any(word in query for word in ["tasa", "interés", "porcentaje"]):
-        topic = "tasas"
-    elif any(word in query for word in ["cuánto tiempo", "cuándo", "rapidez", "aprueban"]):
-        topic = "plazos"
-    elif any(word in query for word in ["pago", "pagar", "abonar"]):
-        topic = "pagos"
-    else:
-        topic = "desconocido"
+    logger.info("\n🔍 Clasificando pregunta: '%s'", state["user_query"])
     
-    print(f"   → Tema identificado: {topic}")
+    # Clasificación por palabras clave en una sola pasada (sin acentos ni mayúsculas)
+    topic = CLASSIFIER.classify(state["user_query"])
+    
+    logger.info("   → Tema identificado: %s", topic)
     
     return {
         "identified_topic": topic,
@@ -99,23 +147,41 @@ def retrieve_answer(state: FAQAgentState) -> dict:
     """Nodo que recupera la respuesta de la base de datos."""
     topic = state["identified_topic"]
     
-    print(f"\n📚 Buscando respuesta para: {topic}")
+    logger.info("\n📚 Buscando respuesta para: %s", topic)
     
     if topic in FAQ_DATABASE:
         answer = FAQ_DATABASE[topic]["respuesta"]
-        print(f"   ✅ Respuesta encontrada")
+        logger.info("   ✅ Respuesta encontrada")
     else:
         answer = "No encontrada"
-        print(f"   ❌ No hay respuesta para este tema")
+        logger.info("   ❌ No hay respuesta para este tema")
     
     return {
         "response": answer
     }
 
 
+def search_similar_question(state: FAQAgentState) -> dict:
+    """
+    Nodo que busca la respuesta más parecida (TF-IDF) cuando ninguna palabra
+    clave coincidió. Solo acepta el resultado si supera el umbral de confianza.
+    """
+    match = RETRIEVER.best(state["user_query"])
+    if match is None:
+        logger.info("\n🔎 Sin preguntas parecidas con suficiente confianza")
+        return {}
+    
+    topic, score = match
+    logger.info("\n🔎 Pregunta parecida encontrada: %s (similitud %.2f)", topic, score)
+    return {
+        "identified_topic": topic,
+        "found_answer": True
+    }
+
+
 def handle_unknown_question(state: FAQAgentState) -> dict:
     """Nodo que maneja preguntas no reconocidas."""
-    print(f"\n❓ Pregunta no reconocida")
+    logger.info("\n❓ Pregunta no reconocida")
     
     response = f"""Lo siento, no pude identificar tu pregunta en nuestra base de datos.
 
@@ -132,6 +198,11 @@ Puedo ayudarte con información sobre:
     }
 
 
+def answer_on_timeout(state: FAQAgentState) -> dict:
+    """Respuesta de respaldo cuando el agente no termina a tiempo."""
+    return {**handle_unknown_question(state), "found_answer": False}
+
+
 def route_by_topic(state: FAQAgentState) -> Literal["retrieve", "unknown"]:
     """Rutea según si se encontró el tema o no."""
     if state["found_answer"]:
@@ -139,14 +210,27 @@ def route_by_topic(state: FAQAgentState) -> Literal["retrieve", "unknown"]:
     return "unknown"
 
 
-def create_faq_agent():
-    """Crea el grafo del agente FAQ."""
-    workflow = StateGraph(FAQAgentState)
+def create_faq_agent(instrumentation=None, state_schema=FAQAgentState, deadlines=None):
+    """
+    Crea el grafo del agente FAQ.
+    instrumentation (opcional) registra latencias por nodo y decisiones de ruteo.
+    state_schema permite usar un estado compacto (ver compact_state.FAQRecord).
+    deadlines (opcional) limita la latencia por nodo y por invocación; si algo
+    vence, se responde como pregunta desconocida o con una respuesta en cache
+    (ver deadlines.py).
+    """
+    if instrumentation is None:
+        instrumentation = profiler_from_env()  # KUALTOS_PROFILE: perfil por nodo (ver node_profiler.py)
+    if instrumentation is None:
+        workflow = StateGraph(state_schema)
+    else:
+        workflow = instrumentation.state_graph(state_schema)
     
     # Nodos
-    workflow.add_node("classify", classify_question)
-    workflow.add_node("retrieve", retrieve_answer)
-    workflow.add_node("unknown", handle_unknown_question)
+    workflow.add_node("classify", classify_question, input_schema=state_schema)
+    workflow.add_node("retrieve", retrieve_answer, input_schema=state_schema)
+    workflow.add_node("search", search_similar_question, input_schema=state_schema)
+    workflow.add_node("unknown", handle_unknown_question, input_schema=state_schema)
     
     # Flujo
     workflow.set_entry_point("classify")
@@ -155,6 +239,16 @@ def create_faq_agent():
     workflow.add_conditional_edges(
         "classify",
         route_by_topic,
+        {
+            "retrieve": "retrieve",
+            "unknown": "search"
+        }
+    )
+    
+    # Si la búsqueda por similitud tampoco encuentra nada, se responde como desconocida
+    workflow.add_conditional_edges(
+        "search",
+        route_by_topic,
         {
             "retrieve": "retrieve",
             "unknown": "unknown"
@@ -164,7 +258,13 @@ def create_faq_agent():
     workflow.add_edge("retrieve", END)
     workflow.add_edge("unknown", END)
     
-    return workflow.compile()
+    if deadlines is None:
+        return workflow.compile()
+    workflow = deadlines.apply(workflow, exempt={"unknown"})
+    return deadlines.bind(workflow.compile(), fallback=answer_on_timeout)
+
+
+register_graph("faq_agent", create_faq_agent)
 
 
 def ask_question(query: str):
@@ -173,7 +273,8 @@ def ask_question(query: str):
     print(f"PREGUNTA: {query}")
     print("=" * 70)
     
-    agent = create_faq_agent()
+    # Agente compilado una sola vez por proceso
+    agent = get_graph("faq_agent")
     
     initial_state = {
         "user_query": query,
@@ -194,22 +295,15 @@ def ask_question(query: str):
 
 
 def main():
+    configure_logging()
+    
     print("\n" + "=" * 70)
     print("LECCIÓN 1.3: AGENTE FAQ DE KUALTOS")
     print("=" * 70)
     print("\n💡 Este es un agente simple sin LLM que usa clasificación por palabras clave.")
     print("   En lecciones futuras lo haremos más inteligente con Claude/GPT.\n")
     
-    # Preguntas de prueba
-    test_queries = [
-        "¿Qué documentos necesito para un préstamo?",
-        "¿Cuál es la tasa de interés?",
-        "¿Cuánto tardan en aprobar mi solicitud?",
-        "¿Cómo puedo pagar mi préstamo?",
-        "¿Cuál es el horario de atención?",  # No reconocida
-    ]
-    
-    for query in test_queries:
+    for query in TEST_QUERIES:
         ask_question(query)
         input("\n[Presiona ENTER para continuar...]")
     
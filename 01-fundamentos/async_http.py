@@ -0,0 +1,129 @@
+"""
+Servidor HTTP/1.1 mínimo sobre asyncio (sin dependencias externas).
+Soporta keep-alive y concurrencia acotada. Los handlers retornan la respuesta
+completa ya codificada en bytes, para poder servir respuestas pre-codificadas.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+REASON_PHRASES = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+
+
+@dataclass
+class Request:
+    """Solicitud HTTP ya parseada."""
+    method: str
+    path: str
+    query: Dict[str, str]
+    headers: Dict[str, str]
+    body: bytes = b""
+    keep_alive: bool = True
+    extra: dict = field(default_factory=dict)
+
+
+Handler = Callable[[Request], Awaitable[bytes]]
+
+
+def build_response(status: int, body: bytes,
+                   content_type: str = "application/json; charset=utf-8") -> bytes:
+    """Codifica una respuesta HTTP/1.1 completa (encabezados + cuerpo)."""
+    head = (
+        f"HTTP/1.1 {status} {REASON_PHRASES.get(status, 'OK')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    """Lee una solicitud del stream. Retorna None si el cliente cerró la conexión."""
+    try:
+        raw_head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise ValueError("Encabezados demasiado grandes")
+
+    lines = raw_head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ", 2)
+    except ValueError:
+        raise ValueError(f"Línea de solicitud inválida: {lines[0]!r}")
+
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", "0") or 0)
+    if length > MAX_BODY_BYTES:
+        raise ValueError("Cuerpo demasiado grande")
+    body = await reader.readexactly(length) if length else b""
+
+    url = urlsplit(target)
+    query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+    return Request(method.upper(), url.path, query, headers, body, keep_alive)
+
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                            handler: Handler) -> None:
+    """Atiende todas las solicitudes de una conexión keep-alive, en orden."""
+    try:
+        while True:
+            try:
+                request = await read_request(reader)
+            except ValueError:
+                writer.write(build_response(400, b'{"error": "bad request"}'))
+                break
+            if request is None:
+                break
+
+            try:
+                response = await handler(request)
+            except Exception:
+                response = build_response(500, b'{"error": "internal error"}')
+
+            writer.write(response)
+            # Solo esperamos al socket si el buffer de salida está lleno
+            if writer.transport.get_write_buffer_size() > 64 * 1024:
+                await writer.drain()
+            if not request.keep_alive:
+                break
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(handler: Handler, host: str = "127.0.0.1", port: int = 8080,
+                       backlog: int = 1024, **kwargs) -> asyncio.AbstractServer:
+    """Inicia el servidor y retorna el objeto asyncio.Server."""
+    async def on_connect(reader, writer):
+        await handle_connection(reader, writer, handler)
+
+    return await asyncio.start_server(
+        on_connect, host, port, backlog=backlog, limit=MAX_HEADER_BYTES, **kwargs
+    )
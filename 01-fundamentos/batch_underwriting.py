@@ -0,0 +1,145 @@
+"""
+Motor de evaluación por lotes - Versión vectorizada (NumPy) del grafo de préstamos.
+Replica exactamente route_by_credit_score, approve_loan, reject_loan y manual_review
+sobre arreglos columnares, sin pasar cada solicitud por graph.invoke. Las
+condiciones salen de las reglas vigentes (loan_rules.json / KUALTOS_LOAN_RULES).
+
+Uso:
+    python batch_underwriting.py [num_solicitudes]
+"""
+
+import contextlib
+import io
+import sys
+import time
+
+import numpy as np
+
+from graph_registry import get_graph, load_lesson_module
+
+# Resultado de cada ruta de loan_rules.json (igual que approve_loan, reject_loan y manual_review)
+ROUTE_OUTCOMES = {
+    "approve": ("APROBADO", "Cumple con todos los requisitos"),
+    "manual_review": ("REVISIÓN_MANUAL", "Caso requiere evaluación por analista"),
+}
+DEFAULT_REJECT_REASON = "Score de crédito insuficiente"
+
+
+def rule_outcome(decision) -> tuple:
+    """(decision, reason) finales para un (ruta, razón) de las reglas compiladas."""
+    route, reason = decision
+    if route == "reject":
+        return "RECHAZADO", reason or DEFAULT_REJECT_REASON
+    return ROUTE_OUTCOMES[route]
+
+
+def current_rules():
+    """Las mismas reglas (ya recargadas) que usa el grafo de préstamos."""
+    return load_lesson_module("01-fundamentos", "02_nodos_y_edges").RULES.current
+
+
+def underwrite_codes(credit_score, employment_status, rules=None):
+    """
+    Evalúa las reglas compiladas (CompiledRules) sobre columnas, en el mismo orden que
+    decide(): primero el estado laboral y luego las bandas de score de mayor a menor.
+    Retorna (códigos, decisiones, razones): cada código indexa los dos arreglos.
+    """
+    rules = rules or current_rules()
+    score = np.asarray(credit_score)
+    employment = np.asarray(employment_status, dtype=object)
+
+    # Una condición por regla; la banda más baja es el valor por defecto
+    conditions = [employment == status for status in rules.employment]
+    conditions += [score >= floor for floor in rules.floors[:0:-1]]
+    outcomes = [rule_outcome(d) for d in list(rules.employment.values()) + rules.decisions[:0:-1]]
+    outcomes.append(rule_outcome(rules.decisions[0]))
+
+    # np.select respeta la prioridad: la primera condición verdadera gana
+    codes = np.select(conditions, np.arange(len(conditions)), default=len(conditions))
+    decisions = np.array([decision for decision, _ in outcomes], dtype=object)
+    reasons = np.array([reason for _, reason in outcomes], dtype=object)
+    return codes.astype(np.int16), decisions, reasons
+
+
+def underwrite_batch(credit_score, employment_status, requested_amount=None, rules=None) -> dict:
+    """
+    Evalúa un lote de solicitudes en formato columnar.
+    Retorna arreglos 'decision' y 'reason' alineados con la entrada.
+    rules: CompiledRules a usar (por defecto las vigentes del grafo, ver rules_engine.py).
+    requested_amount se acepta por compatibilidad; las reglas actuales no lo usan.
+    """
+    codes, decisions, reasons = underwrite_codes(credit_score, employment_status, rules)
+    if requested_amount is not None and len(requested_amount) != len(codes):
+        raise ValueError("Las columnas deben tener la misma longitud")
+
+    return {
+        "decision": decisions[codes],
+        "reason": reasons[codes],
+    }
+
+
+def random_applications(n: int, seed: int = 0) -> dict:
+    """Genera solicitudes aleatorias, incluyendo los valores frontera (599/600/699/700)."""
+    rng = np.random.default_rng(seed)
+    scores = rng.integers(300, 851, size=n)
+    scores[: min(n, 8)] = [599, 600, 699, 700, 300, 850, 650, 720][: min(n, 8)]
+    employment = rng.choice(
+        np.array(["empleado", "desempleado", "independiente", "jubilado"], dtype=object),
+        size=n,
+    )
+    amounts = rng.uniform(5000, 50000, size=n).round(2)
+    return {"credit_score": scores, "employment_status": employment, "requested_amount": amounts}
+
+
+def verify_equivalence(n: int = 2000, seed: int = 0) -> int:
+    """
+    Compara el motor vectorizado contra el grafo (graph.invoke) con entradas aleatorias.
+    Retorna el número de solicitudes verificadas; lanza AssertionError si alguna difiere.
+    """
+    load_lesson_module("01-fundamentos", "02_nodos_y_edges")
+    graph = get_graph("loan")
+
+    apps = random_applications(n, seed)
+    batch = underwrite_batch(**apps)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(n):
+            result = graph.invoke({
+                "applicant_name": f"Solicitante {i}",
+                "requested_amount": float(apps["requested_amount"][i]),
+                "credit_score": int(apps["credit_score"][i]),
+                "employment_status": str(apps["employment_status"][i]),
+                "decision": "",
+                "reason": "",
+            })
+            expected = (result["decision"], result["reason"])
+            actual = (batch["decision"][i], batch["reason"][i])
+            assert actual == expected, f"Solicitud {i} difiere: {actual} != {expected}"
+
+    return n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+
+    print("=" * 70)
+    print("EVALUACIÓN POR LOTES (NumPy)")
+    print("=" * 70)
+
+    verified = verify_equivalence()
+    print(f"✅ Equivalencia con el grafo verificada en {verified:,} solicitudes aleatorias")
+
+    apps = random_applications(n, seed=1)
+    start = time.perf_counter()
+    batch = underwrite_batch(**apps)
+    elapsed = time.perf_counter() - start
+
+    decisions, counts = np.unique(batch["decision"], return_counts=True)
+    print(f"\n📊 {n:,} solicitudes en {elapsed * 1000:,.1f} ms ({n / elapsed:,.0f} solicitudes/s)")
+    for decision, count in zip(decisions, counts):
+        print(f"   {decision}: {count:,}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
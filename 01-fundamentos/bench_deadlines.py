@@ -0,0 +1,137 @@
+"""
+Prueba de presupuestos de latencia (deadlines.py) con nodos artificialmente lentos.
+- Préstamos: verificaciones en paralelo (hilos) donde la de identidad tarda
+  2 ms casi siempre y --slow-ms en una fracción --slow-rate de las llamadas.
+- FAQ: la búsqueda por similitud (nodo "search") tiene la misma cola lenta; el
+  respaldo usa la respuesta en cache si existe y si no "pregunta desconocida".
+
+Compara p50/p99/máx sin y con presupuestos, y falla si el p99 con presupuesto
+supera el presupuesto del grafo más un margen.
+
+Uso:
+    python bench_deadlines.py [invocaciones] [--slow-ms 300] [--slow-rate 0.05]
+                              [--node-ms 50] [--graph-ms 80] [--slack-ms 25]
+"""
+
+import argparse
+import random
+import time
+
+from deadlines import Deadlines, cached_answer_fallback
+from faq_cache import FAQAnswerCache
+from graph_registry import load_lesson_module
+from latency_histogram import LatencyHistogram
+
+LOAN_STATES = [
+    {"applicant_name": name, "requested_amount": amount, "credit_score": score,
+     "employment_status": employment, "decision": "", "reason": ""}
+    for name, amount, score, employment in [
+        ("Juan Pérez", 10000.0, 750, "empleado"),
+        ("Ana García", 15000.0, 550, "empleado"),
+        ("Carlos López", 8000.0, 650, "empleado"),
+    ]
+]
+# Preguntas sin palabras clave: pasan por la búsqueda por similitud
+FAQ_QUERIES = [
+    "¿Qué documentos debo presentar?",
+    "¿Cuál es el horario de atención?",
+    "¿Puedo adelantar mensualidades?",
+]
+
+
+def heavy_tail(rng: random.Random, fast: float, slow: float, rate: float):
+    """Latencia con cola: `fast` casi siempre, `slow` con probabilidad `rate`."""
+    return lambda: slow if rng.random() < rate else fast
+
+
+class SlowRetriever:
+    """Retriever con latencia simulada (ej: un índice remoto) antes de buscar."""
+
+    def __init__(self, retriever, delay):
+        self.retriever = retriever
+        self.delay = delay
+
+    def best(self, query: str):
+        time.sleep(self.delay())
+        return self.retriever.best(query)
+
+
+def measure(invoke, inputs, count: int) -> LatencyHistogram:
+    histogram = LatencyHistogram()
+    for i in range(count):
+        start = time.perf_counter_ns()
+        invoke(inputs[i % len(inputs)])
+        histogram.record(time.perf_counter_ns() - start)
+    return histogram
+
+
+def report(label: str, histogram: LatencyHistogram) -> None:
+    print(f"{label:<34}{histogram.percentile(50) / 1e6:>10.1f}"
+          f"{histogram.percentile(99) / 1e6:>10.1f}{histogram.max / 1e6:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="p99 acotado con presupuestos de latencia")
+    parser.add_argument("count", type=int, nargs="?", default=400)
+    parser.add_argument("--slow-ms", type=float, default=300)
+    parser.add_argument("--slow-rate", type=float, default=0.05)
+    parser.add_argument("--node-ms", type=float, default=50)
+    parser.add_argument("--graph-ms", type=float, default=80)
+    parser.add_argument("--slack-ms", type=float, default=25,
+                        help="Margen sobre el presupuesto del grafo (scheduling, nodo de respaldo)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    slow = heavy_tail(rng, 0.002, args.slow_ms / 1000, args.slow_rate)
+    loans = load_lesson_module("01-fundamentos", "02_nodos_y_edges")
+    kualtos = load_lesson_module("01-fundamentos", "03_intro_kualtos")
+    kualtos.RETRIEVER = SlowRetriever(kualtos.RETRIEVER, slow)
+    latency = {"verify_identity": slow, "check_score": 0.002, "verify_employment": 0.002}
+
+    def budgets(**kwargs) -> Deadlines:
+        return Deadlines(node_budget=args.node_ms / 1000, graph_budget=args.graph_ms / 1000, **kwargs)
+
+    loan_deadlines = budgets()
+    cache = FAQAnswerCache()
+    cache.put(FAQ_QUERIES[0], {"user_query": FAQ_QUERIES[0], "identified_topic": "requisitos",
+                               "response": kualtos.FAQ_DATABASE["requisitos"]["respuesta"],
+                               "found_answer": True})
+    faq_deadlines = budgets(fallback=cached_answer_fallback(cache, kualtos.answer_on_timeout))
+
+    cases = [
+        ("préstamos", LOAN_STATES,
+         loans.create_graph(checks="threads", check_latency=latency),
+         loans.create_graph(checks="threads", check_latency=latency, deadlines=loan_deadlines),
+         loan_deadlines),
+        ("FAQ", [{"user_query": q, "identified_topic": "", "response": "", "found_answer": False}
+                 for q in FAQ_QUERIES],
+         kualtos.create_faq_agent(), kualtos.create_faq_agent(deadlines=faq_deadlines),
+         faq_deadlines),
+    ]
+
+    print("=" * 64)
+    print(f"PRESUPUESTOS DE LATENCIA: {args.count:,} invocaciones, {args.slow_rate:.0%} "
+          f"de llamadas lentas ({args.slow_ms:g} ms)")
+    print(f"Presupuesto por nodo {args.node_ms:g} ms, por grafo {args.graph_ms:g} ms")
+    print("=" * 64)
+    print(f"{'Grafo':<34}{'p50 (ms)':>10}{'p99 (ms)':>10}{'máx (ms)':>10}")
+    print("-" * 64)
+    failures = []
+    for name, inputs, plain, bounded, deadlines in cases:
+        report(f"{name}, sin presupuesto", measure(plain.invoke, inputs, args.count))
+        histogram = measure(bounded.invoke, inputs, args.count)
+        report(f"{name}, con presupuesto", histogram)
+        stats = deadlines.stats()
+        print(f"   vencimientos: {stats['miss_total']} {stats['misses']}, "
+              f"respaldos: {stats['fallbacks']}")
+        if histogram.percentile(99) / 1e6 > args.graph_ms + args.slack_ms:
+            failures.append(name)
+    print("-" * 64)
+    if failures:
+        raise AssertionError(f"p99 fuera del presupuesto en: {', '.join(failures)}")
+    print(f"✅ p99 con presupuesto ≤ {args.graph_ms:g} ms + {args.slack_ms:g} ms de margen")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark: latencia de un acierto en cache vs. un invoke completo del agente FAQ.
+
+Uso:
+    python bench_faq_cache.py [iteraciones]
+"""
+
+import contextlib
+import io
+import statistics
+import sys
+import time
+
+from faq_cache import FAQAnswerCache
+from graph_registry import get_graph, load_lesson_module
+
+# Variantes de redacción de la misma pregunta
+PHRASINGS = [
+    "¿Cuál es la tasa de interés?",
+    "cual es la tasa de interes",
+    "¿¿CUÁL ES LA TASA DE INTERÉS??",
+    "  Cuál es la tasa   de interés ",
+]
+
+
+def measure(fn, iterations: int) -> list:
+    samples = []
+    for i in range(iterations):
+        query = PHRASINGS[i % len(PHRASINGS)]
+        start = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    load_lesson_module("01-fundamentos", "03_intro_kualtos")
+    agent = get_graph("faq_agent")
+    cache = FAQAnswerCache(agent, maxsize=128, ttl=60.0)
+
+    def full_invoke(query):
+        return agent.invoke({"user_query": query, "identified_topic": "",
+                             "response": "", "found_answer": False})
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        cache.ask(PHRASINGS[0])  # Llenar el cache con la primera variante
+        invoke_us = measure(full_invoke, iterations)
+        hit_us = measure(cache.ask, iterations)
+
+    stats = cache.stats()
+    print("=" * 70)
+    print("BENCHMARK: CACHE DE RESPUESTAS FAQ")
+    print("=" * 70)
+    print(f"invoke completo  p50: {statistics.median(invoke_us):>10,.2f} µs")
+    print(f"acierto en cache p50: {statistics.median(hit_us):>10,.2f} µs")
+    print(f"Mejora: {statistics.median(invoke_us) / statistics.median(hit_us):,.0f}x")
+    print(f"\nEntradas: {stats['size']} | Aciertos: {stats['hits']:,} | "
+          f"Fallos: {stats['misses']:,} | Tasa de acierto: {stats['hit_rate']:.1%}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: grafos originales vs. optimizados con graph_fusion.
+Verifica que el estado final sea idéntico y compara la latencia por invoke de
+hello_langgraph (cadena de 3 nodos) y del grafo de préstamos (2 nodos no-op
+antes del ruteo condicional).
+
+Uso:
+    python bench_graph_fusion.py [iteraciones]
+"""
+
+import functools
+import sys
+import time
+
+from graph_fusion import optimize_graph
+from graph_registry import load_lesson_module
+
+
+def loan_state(name: str, amount: float, score: int, employment: str) -> dict:
+    return {"applicant_name": name, "requested_amount": amount, "credit_score": score,
+            "employment_status": employment, "decision": "", "reason": ""}
+
+
+def per_invoke_us(graph, states, iterations: int) -> float:
+    for state in states:
+        graph.invoke(state)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for state in states:
+            graph.invoke(state)
+    return (time.perf_counter() - start) / (iterations * len(states)) * 1e6
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    hello = load_lesson_module("00-lab-setup", "hello_langgraph")
+    loans = load_lesson_module("01-fundamentos", "02_nodos_y_edges")
+
+    suites = [
+        ("hello", hello.create_graph, [{"message": "", "counter": 0}], [
+            ("fusión de cadena", optimize_graph),
+        ]),
+        ("loan", loans.create_graph, [
+            loan_state("Juan Pérez", 10000.00, 750, "empleado"),
+            loan_state("Ana García", 15000.00, 550, "empleado"),
+            loan_state("Carlos López", 8000.00, 650, "empleado"),
+            loan_state("María Torres", 5000.00, 720, "desempleado"),
+        ], [
+            ("fusión sin eliminar no-op", functools.partial(optimize_graph, elide=False)),
+            ("no-op eliminados", optimize_graph),
+        ]),
+    ]
+
+    print("=" * 70)
+    print(f"BENCHMARK: FUSIÓN DE NODOS ({iterations:,} iteraciones)")
+    print("=" * 70)
+    print(f"{'Grafo':<10}{'Variante':<30}{'Nodos':>8}{'µs/invoke':>12}{'Mejora':>10}")
+    print("-" * 70)
+
+    for name, factory, states, variants in suites:
+        baseline_graph = factory()
+        expected = [baseline_graph.invoke(state) for state in states]
+        baseline = per_invoke_us(baseline_graph, states, iterations)
+        nodes = len(baseline_graph.builder.nodes)
+        print(f"{name:<10}{'original':<30}{nodes:>8}{baseline:>12.1f}{'':>10}")
+
+        for label, optimizer in variants:
+            graph = factory(optimizer=optimizer)
+            results = [graph.invoke(state) for state in states]
+            if results != expected:
+                raise AssertionError(f"{name}/{label}: el estado final difiere del original")
+            elapsed = per_invoke_us(graph, states, iterations)
+            print(f"{'':<10}{label:<30}{len(graph.builder.nodes):>8}{elapsed:>12.1f}"
+                  f"{baseline / elapsed:>9.1f}x")
+    print("-" * 70)
+    print("✅ Estados finales idénticos en todas las variantes")
+
+
+if __name__ == "__main__":
+    main()
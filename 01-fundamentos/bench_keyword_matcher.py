@@ -0,0 +1,85 @@
+"""
+Benchmark: búsqueda secuencial any(word in query) vs. autómata Aho-Corasick
+con tablas de 4, 400 y 40,000 palabras clave.
+
+Uso:
+    python bench_keyword_matcher.py
+"""
+
+import random
+import string
+import time
+
+from graph_registry import load_lesson_module
+from keyword_matcher import KeywordMatcher, normalize_text
+
+TABLE_SIZES = [4, 400, 40_000]
+
+
+def sequential_classify(keywords: dict, text: str, default: str = "desconocido") -> str:
+    """Algoritmo original: un escaneo de subcadenas por tema, en orden de prioridad."""
+    query = normalize_text(text)
+    for topic, words in keywords.items():
+        if any(word in query for word in words):
+            return topic
+    return default
+
+
+def synthetic_keywords(base: dict, total: int, seed: int = 0) -> dict:
+    """Reparte `total` palabras clave entre los temas de `base` (incluye las reales)."""
+    rng = random.Random(seed)
+    topics = list(base)
+    table = {topic: [normalize_text(w) for w in base[topic]] for topic in topics}
+    real = sum(len(words) for words in table.values())
+
+    if total <= len(topics):
+        return {topic: table[topic][:1] for topic in topics[:total]}
+
+    for i in range(max(0, total - real)):
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(6, 10)))
+        table[topics[i % len(topics)]].append(word)
+    return table
+
+
+def time_per_query(fn, queries: list, rounds: int) -> float:
+    """Tiempo promedio por pregunta en microsegundos."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            fn(query)
+    return (time.perf_counter() - start) * 1e6 / (rounds * len(queries))
+
+
+def main():
+    kualtos = load_lesson_module("01-fundamentos", "03_intro_kualtos")
+    queries = kualtos.TEST_QUERIES + [
+        "la tasa de interes es alta?",
+        "cuando me aprueban el credito",
+        "quiero abonar a mi cuenta",
+    ]
+
+    print("=" * 70)
+    print("BENCHMARK: CLASIFICACIÓN POR PALABRAS CLAVE")
+    print("=" * 70)
+    print(f"{'Palabras':>10}{'Secuencial (µs)':>18}{'Aho-Corasick (µs)':>20}{'Mejora':>10}")
+    print("-" * 58)
+
+    for size in TABLE_SIZES:
+        table = synthetic_keywords(kualtos.KEYWORDS, size)
+        matcher = KeywordMatcher(table)
+
+        # Ambos métodos deben coincidir antes de comparar tiempos
+        for query in queries:
+            assert matcher.classify(query) == sequential_classify(table, query), query
+
+        rounds = max(1, 20_000 // size)
+        sequential = time_per_query(lambda q: sequential_classify(table, q), queries, rounds)
+        automaton = time_per_query(matcher.classify, queries, max(rounds, 2_000))
+        print(f"{size:>10,}{sequential:>18,.2f}{automaton:>20,.2f}{sequential / automaton:>9.1f}x")
+
+    print("-" * 58)
+    print("Tiempo promedio por pregunta (incluye normalización de acentos).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: cliente ingenuo (una conexión por consulta) vs. KualtosClient.
+Levanta la API simulada en un subproceso y mide consultas de buró por segundo
+con la misma concurrencia:
+  1. Ingenuo: un httpx.AsyncClient nuevo por consulta (sin keep-alive)
+  2. Pool: KualtosClient con conexiones reutilizadas, una solicitud por consulta
+  3. Pool + lotes: KualtosClient agrupando consultas en POST /bureau/batch
+
+Uso:
+    python bench_kualtos_api.py [consultas] [--concurrency 50] [--latency-ms 2] [--fail-rate 0.02]
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from kualtos_api import KualtosClient
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+async def wait_until_ready(base_url: str, timeout: float = 10.0) -> None:
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while True:
+            try:
+                await client.get("/health")
+                return
+            except httpx.TransportError:
+                if time.perf_counter() > deadline:
+                    raise
+                await asyncio.sleep(0.1)
+
+
+async def run_bounded(lookup, total: int, concurrency: int) -> float:
+    """Ejecuta `total` consultas con a lo más `concurrency` en vuelo. Retorna consultas/s."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            report = await lookup(f"Solicitante {i}")
+            assert report["applicant_id"] == f"Solicitante {i}"
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return total / (time.perf_counter() - start)
+
+
+async def naive_lookup(base_url: str, applicant_id: str) -> dict:
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        response = await client.get(f"/bureau/{applicant_id}")
+        response.raise_for_status()
+        return response.json()
+
+
+async def benchmark(args, base_url: str) -> None:
+    await wait_until_ready(base_url)
+
+    print("=" * 66)
+    print(f"BENCHMARK: CLIENTE DE LA API DE KUALTOS ({args.requests:,} consultas, "
+          f"concurrencia {args.concurrency})")
+    print("=" * 66)
+    print(f"{'Cliente':<30}{'consultas/s':>14}{'HTTP':>10}{'Reintentos':>12}")
+    print("-" * 66)
+
+    if args.fail_rate == 0:
+        # Crear un cliente por consulta es tan lento que basta con una muestra
+        sample = min(args.requests, args.naive_sample)
+        rate = await run_bounded(lambda i: naive_lookup(base_url, i), sample, args.concurrency)
+        print(f"{'ingenuo (conexión por consulta)':<30}{rate:>14,.0f}{sample:>10,}{'-':>12}")
+        baseline = rate
+    else:
+        baseline = None  # El cliente ingenuo no reintenta: fallaría con --fail-rate
+
+    for label, batch_size in [("pool keep-alive", 1), ("pool keep-alive + lotes", 50)]:
+        async with KualtosClient(base_url, batch_size=batch_size,
+                                 max_connections=args.concurrency) as client:
+            rate = await run_bounded(client.credit_report, args.requests, args.concurrency)
+            speedup = f" ({rate / baseline:.1f}x)" if baseline else ""
+            print(f"{label:<30}{rate:>14,.0f}{client.stats['requests']:>10,}"
+                  f"{client.stats['retries']:>12,}{speedup}")
+    print("-" * 66)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del cliente de la API de Kualtos")
+    parser.add_argument("requests", type=int, nargs="?", default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--naive-sample", type=int, default=200,
+                        help="Consultas medidas con el cliente ingenuo")
+    args = parser.parse_args()
+
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(HERE, "kualtos_mock_server.py"), "--port", str(args.port),
+         "--latency-ms", str(args.latency_ms), "--fail-rate", str(args.fail_rate), "--api-key", ""],
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        asyncio.run(benchmark(args, f"http://127.0.0.1:{args.port}"))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: add_messages vs. registro append-only en conversaciones largas.
+Mide tiempo total y memoria pico (tracemalloc) al agregar un mensaje por turno,
+y el costo de extremo a extremo ejecutando el grafo de 01_state_basico.
+
+Uso:
+    python bench_message_log.py [turnos] [turnos_grafo]
+"""
+
+import contextlib
+import io
+import sys
+import time
+import tracemalloc
+
+from langgraph.graph.message import add_messages
+
+from graph_registry import load_lesson_module
+from message_log import WindowedConversationState, count_summarizer, windowed_messages
+
+
+def run_reducer(reducer, turns: int):
+    """Simula una conversación de `turns` turnos aplicando el reducer como lo hace el grafo."""
+    value = None if reducer is not add_messages else []
+    for turn in range(turns):
+        value = reducer(value, [f"Mensaje del turno {turn}"])
+    return value
+
+
+def measure(reducer, turns: int) -> tuple:
+    """Retorna (segundos, memoria pico en KB)."""
+    start = time.perf_counter()
+    run_reducer(reducer, turns)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    run_reducer(reducer, turns)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024
+
+
+def measure_graph(state_schema, turns: int) -> float:
+    """Segundos para `turns` invocaciones del grafo, reanudando el estado cada vez."""
+    lesson = load_lesson_module("01-fundamentos", "01_state_basico")
+    graph = lesson.create_graph(state_schema)
+    state = {"messages": [], "user_name": "María", "turn_count": 0, "user_age": 25}
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(turns):
+            state = graph.invoke(state)
+    return time.perf_counter() - start
+
+
+def main():
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    graph_turns = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    print("=" * 70)
+    print(f"BENCHMARK: REGISTRO DE MENSAJES ({turns:,} turnos)")
+    print("=" * 70)
+    print(f"{'Reducer':<34}{'Tiempo (s)':>14}{'Memoria pico (KB)':>20}")
+    print("-" * 68)
+
+    variants = [
+        ("add_messages", add_messages),
+        ("append-only (historial completo)", windowed_messages(window=20)),
+        ("ventana 20 + resumen", windowed_messages(window=20, keep_history=False,
+                                                   summarizer=count_summarizer)),
+    ]
+    for name, reducer in variants:
+        elapsed, peak_kb = measure(reducer, turns)
+        print(f"{name:<34}{elapsed:>14.3f}{peak_kb:>20,.0f}")
+
+    lesson = load_lesson_module("01-fundamentos", "01_state_basico")
+    baseline = measure_graph(lesson.ConversationState, graph_turns)
+    windowed = measure_graph(WindowedConversationState, graph_turns)
+
+    print("-" * 68)
+    print(f"\nGrafo 01_state_basico, {graph_turns:,} invocaciones reanudando la conversación:")
+    print(f"   ConversationState (add_messages): {baseline:.2f} s")
+    print(f"   WindowedConversationState:        {windowed:.2f} s ({baseline / windowed:.1f}x)")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
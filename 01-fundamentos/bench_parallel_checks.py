@@ -0,0 +1,106 @@
+"""
+Benchmark de las verificaciones en paralelo (parallel_checks.py).
+Simula servicios externos lentos para identidad, crédito y empleo, y compara
+la latencia de punta a punta con las verificaciones encadenadas contra las
+ramas paralelas con hilos y con asyncio. Luego procesa un lote de solicitudes
+concurrentes con cada modo. Verifica que todas las variantes decidan igual.
+
+Uso:
+    python bench_parallel_checks.py [--identity-ms 150] [--credit-ms 300]
+                                    [--employment-ms 200] [--runs 5] [--concurrent 50]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from graph_registry import load_lesson_module
+
+APPLICATIONS = [
+    ("Juan Pérez", 10000.0, 750, "empleado"),
+    ("Ana García", 15000.0, 550, "empleado"),
+    ("Carlos López", 8000.0, 650, "empleado"),
+    ("María Torres", 5000.0, 720, "desempleado"),
+]
+
+
+def initial_state(i: int) -> dict:
+    name, amount, score, employment = APPLICATIONS[i % len(APPLICATIONS)]
+    return {"applicant_name": name, "requested_amount": amount, "credit_score": score,
+            "employment_status": employment, "decision": "", "reason": ""}
+
+
+def invoke(graph, mode: str, state: dict) -> dict:
+    return asyncio.run(graph.ainvoke(state)) if mode == "asyncio" else graph.invoke(state)
+
+
+def latency_ms(graph, mode: str, runs: int) -> list:
+    samples = []
+    for i in range(runs):
+        start = time.perf_counter()
+        invoke(graph, mode, initial_state(i))
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def concurrent_seconds(graph, mode: str, count: int) -> float:
+    start = time.perf_counter()
+    if mode == "asyncio":
+        async def run_all():
+            return await asyncio.gather(*(graph.ainvoke(initial_state(i)) for i in range(count)))
+        results = asyncio.run(run_all())
+    else:
+        with ThreadPoolExecutor(count) as pool:
+            results = list(pool.map(lambda i: graph.invoke(initial_state(i)), range(count)))
+    elapsed = time.perf_counter() - start
+    assert len(results) == count
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verificaciones de préstamo en paralelo")
+    parser.add_argument("--identity-ms", type=float, default=150)
+    parser.add_argument("--credit-ms", type=float, default=300)
+    parser.add_argument("--employment-ms", type=float, default=200)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--concurrent", type=int, default=50)
+    args = parser.parse_args()
+
+    loans = load_lesson_module("01-fundamentos", "02_nodos_y_edges")
+    latency = {"verify_identity": args.identity_ms / 1000, "check_score": args.credit_ms / 1000,
+               "verify_employment": args.employment_ms / 1000}
+    total_ms = sum(latency.values()) * 1000
+    slowest_ms = max(latency.values()) * 1000
+
+    # Todas las variantes deben decidir lo mismo que el grafo de la lección
+    baseline = loans.create_graph()
+    expected = [baseline.invoke(initial_state(i)) for i in range(len(APPLICATIONS))]
+    graphs = {mode: loans.create_graph(checks=mode, check_latency=latency)
+              for mode in ("sequential", "threads", "asyncio")}
+    for mode in graphs:
+        graph = loans.create_graph(checks=mode)  # Sin latencia simulada
+        for i, result in enumerate(expected):
+            if invoke(graph, mode, initial_state(i)) != result:
+                raise AssertionError(f"{mode}: la decisión difiere para {APPLICATIONS[i][0]}")
+
+    print("=" * 72)
+    print(f"VERIFICACIONES DE PRÉSTAMO: identidad {args.identity_ms:g} ms, "
+          f"crédito {args.credit_ms:g} ms, empleo {args.employment_ms:g} ms")
+    print(f"Suma de las ramas: {total_ms:.0f} ms | rama más lenta: {slowest_ms:.0f} ms")
+    print("=" * 72)
+    print(f"{'Modo':<14}{'p50 (ms)':>10}{'máx (ms)':>10}{'vs suma':>10}"
+          f"{f'{args.concurrent} concurrentes (s)':>24}")
+    print("-" * 72)
+    for mode, graph in graphs.items():
+        samples = latency_ms(graph, mode, args.runs)
+        elapsed = concurrent_seconds(graph, mode, args.concurrent)
+        print(f"{mode:<14}{statistics.median(samples):>10.0f}{max(samples):>10.0f}"
+              f"{statistics.median(samples) / total_ms:>9.0%} {elapsed:>23.2f}")
+    print("-" * 72)
+    print("✅ Mismas decisiones en todos los modos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Benchmark del servidor pre-fork (prefork_server.py) contra intérpretes nuevos.
+Levanta N workers de tres formas y mide para cada una:
+- Arranque en frío por worker: desde que se crea el proceso hasta que acepta
+  conexiones (fork: lo reporta el padre; intérprete nuevo: hasta que /health
+  responde, incluye imports y compilación de grafos).
+- Memoria por worker: recién arrancado, después de atender tráfico y después
+  de una recolección completa del GC (SIGUSR1 → gc.collect() en cada worker):
+  RSS (lo que reporta `ps`), USS (memoria privada, lo que cuesta cada worker
+  adicional) y PSS (páginas compartidas repartidas entre quienes las usan).
+  La suma de PSS de todos los procesos (incluido el padre) es la memoria total.
+
+Variantes: intérpretes nuevos (--no-fork), pre-fork con gc.freeze() y pre-fork
+sin gc.freeze().
+
+Uso:
+    python bench_prefork.py [--workers 4] [--requests 400] [--port 18400]
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from prefork_server import memory_usage
+
+SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prefork_server.py")
+LOAN = {"applicant_name": "Ana García", "requested_amount": 15000, "credit_score": 720,
+        "employment_status": "empleado"}
+QUERIES = ["¿Cuál es la tasa de interés?", "¿Qué requisitos necesito?",
+           "¿Cuánto tiempo tarda la aprobación?", "¿Puedo pagar antes?"]
+
+
+def wait_health(port: int, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.005)
+    raise TimeoutError(f"El servidor en el puerto {port} no respondió")
+
+
+def traffic(ports, requests: int) -> None:
+    """Consultas FAQ y préstamos repartidas entre los puertos (o el kernel, si es uno)."""
+    clients = [httpx.Client(base_url=f"http://127.0.0.1:{port}") for port in ports]
+    try:
+        for i in range(requests):
+            client = clients[i % len(clients)]
+            if i % 2:
+                response = client.post("/loan", json=LOAN)
+            else:
+                response = client.get("/faq", params={"q": QUERIES[i % len(QUERIES)]})
+            response.raise_for_status()
+    finally:
+        for client in clients:
+            client.close()
+
+
+def fresh_interpreters(workers: int, port: int):
+    """(procesos, arranque en ms por worker, puertos, pid del padre=None)."""
+    processes, cold_starts, ports = [], [], []
+    for i in range(workers):
+        start = time.monotonic()
+        process = subprocess.Popen([sys.executable, SERVER, "--no-fork", "--port", str(port + i)],
+                                   stderr=subprocess.DEVNULL)
+        wait_health(port + i)
+        cold_starts.append((time.monotonic() - start) * 1000)
+        processes.append(process)
+        ports.append(port + i)
+    return processes, cold_starts, [p.pid for p in processes], ports, None
+
+
+def prefork(workers: int, port: int, freeze: bool):
+    stats_path = os.path.join(tempfile.mkdtemp(), "stats.json")
+    command = [sys.executable, SERVER, "--workers", str(workers), "--port", str(port),
+               "--stats-json", stats_path]
+    if not freeze:
+        command.append("--no-freeze")
+    process = subprocess.Popen(command, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while not os.path.exists(stats_path) or not os.path.getsize(stats_path):
+        if time.monotonic() > deadline or process.poll() is not None:
+            raise RuntimeError("El servidor pre-fork no arrancó")
+        time.sleep(0.01)
+    time.sleep(0.05)  # El archivo se escribe de una vez, pero esperar evita leerlo a medias
+    with open(stats_path) as f:
+        stats = json.load(f)
+    wait_health(port)
+    pids = [w["pid"] for w in stats["workers"]]
+    cold_starts = [w["cold_start_ms"] for w in stats["workers"]]
+    return [process], cold_starts, pids, [port], process.pid
+
+
+def memory_row(pids, parent):
+    usage = [memory_usage(pid) for pid in pids]
+    total_pss = sum(u["pss"] for u in usage) + (memory_usage(parent)["pss"] if parent else 0)
+
+    def mean(key: str) -> float:
+        return sum(u[key] for u in usage) / len(usage) / 2**20
+
+    return mean("rss"), mean("uss"), mean("pss"), total_pss / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-fork vs intérpretes nuevos")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=400, help="Solicitudes antes de medir de nuevo")
+    parser.add_argument("--port", type=int, default=18400)
+    args = parser.parse_args()
+
+    variants = [
+        ("intérpretes nuevos", lambda: fresh_interpreters(args.workers, args.port)),
+        ("pre-fork + gc.freeze", lambda: prefork(args.workers, args.port + 100, True)),
+        ("pre-fork sin freeze", lambda: prefork(args.workers, args.port + 200, False)),
+    ]
+
+    print("=" * 84)
+    print(f"PRE-FORK vs INTÉRPRETES NUEVOS: {args.workers} workers, "
+          f"{args.requests} solicitudes entre mediciones")
+    print("=" * 84)
+    print(f"{'Variante':<22}{'Momento':<11}{'arranque ms':>12}{'RSS MB':>9}{'USS MB':>9}"
+          f"{'PSS MB':>9}{'PSS total MB':>14}")
+    print("-" * 84)
+    for name, launch in variants:
+        processes, cold_starts, pids, ports, parent = launch()
+        try:
+            cold = sum(cold_starts) / len(cold_starts)
+            rss, uss, pss, total = memory_row(pids, parent)
+            print(f"{name:<22}{'arranque':<11}{cold:>12.1f}{rss:>9.1f}{uss:>9.1f}{pss:>9.1f}{total:>14.1f}")
+            traffic(ports, args.requests)
+            rss, uss, pss, total = memory_row(pids, parent)
+            print(f"{'':<22}{'con uso':<11}{'':>12}{rss:>9.1f}{uss:>9.1f}{pss:>9.1f}{total:>14.1f}")
+            for pid in pids:
+                os.kill(pid, signal.SIGUSR1)
+            time.sleep(0.5)
+            rss, uss, pss, total = memory_row(pids, parent)
+            print(f"{'':<22}{'tras gc':<11}{'':>12}{rss:>9.1f}{uss:>9.1f}{pss:>9.1f}{total:>14.1f}")
+        finally:
+            for process in processes:
+                process.send_signal(signal.SIGTERM)
+            for process in processes:
+                process.wait(timeout=10)
+    print("-" * 84)
+    print("USS: memoria que solo usa ese worker. PSS total: memoria real de todos los procesos.")
+
+
+if __name__ == "__main__":
+    main()
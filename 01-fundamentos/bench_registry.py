@@ -0,0 +1,76 @@
+"""
+Micro-benchmark: latencia por solicitud recompilando el grafo vs. registro compartido.
+
+Uso:
+    python bench_registry.py [iteraciones]
+"""
+
+import contextlib
+import io
+import statistics
+import sys
+import time
+
+from graph_registry import COURSE_GRAPHS, REGISTRY, load_lesson_module
+
+# Un estado de entrada representativo por grafo
+SAMPLE_INPUTS = {
+    "hello": {"message": "", "counter": 0},
+    "conversation": {"messages": [], "user_name": "María", "turn_count": 0, "user_age": 25},
+    "loan": {
+        "applicant_name": "Juan Pérez",
+        "requested_amount": 10000.00,
+        "credit_score": 750,
+        "employment_status": "empleado",
+        "decision": "",
+        "reason": "",
+    },
+    "faq_agent": {
+        "user_query": "¿Cuál es la tasa de interés?",
+        "identified_topic": "",
+        "response": "",
+        "found_answer": False,
+    },
+}
+
+
+def measure(fn, iterations: int) -> list:
+    """Ejecuta fn varias veces y retorna las latencias en microsegundos."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print("=" * 70)
+    print("BENCHMARK: RECOMPILAR POR SOLICITUD VS. REGISTRO COMPARTIDO")
+    print("=" * 70)
+    print(f"Iteraciones por caso: {iterations}\n")
+    print(f"{'Grafo':<14}{'Recompilar (µs)':>18}{'Registro (µs)':>16}{'Mejora':>10}")
+    print("-" * 58)
+
+    for name, (folder, module_name, factory_name) in COURSE_GRAPHS.items():
+        factory = getattr(load_lesson_module(folder, module_name), factory_name)
+        state = SAMPLE_INPUTS[name]
+
+        # Los nodos imprimen en cada paso; silenciamos la salida para medir solo el grafo
+        with contextlib.redirect_stdout(io.StringIO()):
+            REGISTRY.get(name)  # Calentamiento: primera compilación
+            before = measure(lambda: factory().invoke(state), iterations)
+            after = measure(lambda: REGISTRY.get(name).invoke(state), iterations)
+
+        p50_before = statistics.median(before)
+        p50_after = statistics.median(after)
+        print(f"{name:<14}{p50_before:>18,.1f}{p50_after:>16,.1f}{p50_before / p50_after:>9.1f}x")
+
+    print("-" * 58)
+    print("Latencias reportadas como mediana (p50) por solicitud.")
+
+
+if __name__ == "__main__":
+    main()
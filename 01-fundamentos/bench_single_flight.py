@@ -0,0 +1,114 @@
+"""
+Prueba de carga: ráfagas de preguntas idénticas con y sin coalescencia.
+Simula una campaña: miles de usuarios preguntan lo mismo al mismo tiempo (con
+variaciones de mayúsculas y acentos). Compara ejecutar el grafo por cada
+llamada contra CoalescingFAQAgent, con hilos y con asyncio. --io-ms agrega a
+cada ejecución una espera de E/S (como la de un LLM o una API) para que las
+llamadas realmente se traslapen también con hilos.
+
+Uso:
+    python bench_single_flight.py [llamadas] [--threads 32] [--io-ms 20]
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from graph_registry import get_graph, load_lesson_module
+from single_flight import CoalescingFAQAgent
+
+# Variantes de la misma pregunta que normalize_query lleva a la misma llave
+BURST_QUERIES = [
+    "¿Cuál es la tasa de interés?",
+    "cual es la tasa de interes",
+    "¿CUÁL ES LA TASA DE INTERÉS?",
+    "¿Cómo puedo pagar mi préstamo?",
+    "como puedo pagar mi prestamo",
+]
+
+
+def initial_state(query: str) -> dict:
+    return {"user_query": query, "identified_topic": "", "response": "", "found_answer": False}
+
+
+class SlowAgent:
+    """Agente con latencia de E/S simulada antes de ejecutar el grafo."""
+
+    def __init__(self, graph, io_seconds: float):
+        self.graph = graph
+        self.io_seconds = io_seconds
+
+    def invoke(self, state: dict) -> dict:
+        time.sleep(self.io_seconds)
+        return self.graph.invoke(state)
+
+    async def ainvoke(self, state: dict) -> dict:
+        await asyncio.sleep(self.io_seconds)
+        return await self.graph.ainvoke(state)
+
+
+def run_threads(ask, calls: int, threads: int) -> float:
+    queries = [BURST_QUERIES[i % len(BURST_QUERIES)] for i in range(calls)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(ask, queries))
+    elapsed = time.perf_counter() - start
+    assert all(r["found_answer"] for r in results)
+    return elapsed
+
+
+async def run_asyncio(aask, calls: int) -> float:
+    queries = [BURST_QUERIES[i % len(BURST_QUERIES)] for i in range(calls)]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(aask(q) for q in queries))
+    elapsed = time.perf_counter() - start
+    assert all(r["found_answer"] for r in results)
+    return elapsed
+
+
+def report(label: str, elapsed: float, calls: int, executions: int, baseline: float = None) -> None:
+    speedup = f"{baseline / elapsed:>9.1f}x" if baseline else f"{'':>10}"
+    print(f"{label:<30}{elapsed:>10.2f}{calls / elapsed:>12,.0f}{executions:>12,}{speedup}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de coalescencia")
+    parser.add_argument("calls", type=int, nargs="?", default=2000)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--io-ms", type=float, default=20.0,
+                        help="Latencia de E/S simulada por ejecución (0 = solo el grafo)")
+    args = parser.parse_args()
+
+    load_lesson_module("01-fundamentos", "03_intro_kualtos")
+    graph = SlowAgent(get_graph("faq_agent"), args.io_ms / 1000)
+
+    print("=" * 74)
+    print(f"PRUEBA DE CARGA: RÁFAGA DE {args.calls:,} PREGUNTAS "
+          f"({len(BURST_QUERIES)} variantes de 2 preguntas, E/S {args.io_ms:g} ms)")
+    print("=" * 74)
+    print(f"{'Modo':<30}{'Tiempo (s)':>10}{'llamadas/s':>12}{'Ejecuciones':>12}{'Mejora':>10}")
+    print("-" * 74)
+
+    baseline = run_threads(lambda q: graph.invoke(initial_state(q)), args.calls, args.threads)
+    report(f"hilos ({args.threads}), sin coalescer", baseline, args.calls, args.calls)
+    agent = CoalescingFAQAgent(graph)
+    elapsed = run_threads(agent.ask, args.calls, args.threads)
+    report(f"hilos ({args.threads}), single-flight", elapsed, args.calls,
+           agent.flight.executions, baseline)
+    thread_stats = agent.flight.stats()
+
+    baseline = asyncio.run(run_asyncio(lambda q: graph.ainvoke(initial_state(q)), args.calls))
+    report("asyncio, sin coalescer", baseline, args.calls, args.calls)
+    agent = CoalescingFAQAgent(graph)
+    elapsed = asyncio.run(run_asyncio(agent.aask, args.calls))
+    report("asyncio, single-flight", elapsed, args.calls, agent.flight.executions, baseline)
+    print("-" * 74)
+
+    for mode, stats in [("hilos", thread_stats), ("asyncio", agent.flight.stats())]:
+        print(f"{mode}: {stats['coalesced']:,} llamadas coalescidas "
+              f"({stats['coalesced_ratio']:.1%}), {stats['errors']} errores")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: tiempo al primer evento (streaming) vs. tiempo hasta que invoke retorna.
+
+Uso:
+    python bench_streaming.py [iteraciones]
+"""
+
+import asyncio
+import contextlib
+import io
+import statistics
+import sys
+import time
+
+from graph_registry import get_graph
+from graph_streaming import (
+    astream_faq, faq_initial_state, loan_initial_state, stream_faq, stream_loan,
+)
+
+LOAN_CASE = ("Carlos López", 8000.00, 650, "empleado")
+FAQ_QUERY = "¿Cuál es la tasa de interés?"
+
+
+def first_event_us(stream_factory) -> float:
+    """Microsegundos hasta recibir el primer evento (consumiendo el resto después)."""
+    start = time.perf_counter()
+    events = stream_factory()
+    next(events)
+    elapsed = (time.perf_counter() - start) * 1e6
+    for _ in events:
+        pass
+    return elapsed
+
+
+async def afirst_event_us(stream_factory) -> float:
+    start = time.perf_counter()
+    events = stream_factory()
+    await events.__anext__()
+    elapsed = (time.perf_counter() - start) * 1e6
+    async for _ in events:
+        pass
+    return elapsed
+
+
+def invoke_us(graph, state) -> float:
+    start = time.perf_counter()
+    graph.invoke(state)
+    return (time.perf_counter() - start) * 1e6
+
+
+async def ainvoke_us(graph, state) -> float:
+    start = time.perf_counter()
+    await graph.ainvoke(state)
+    return (time.perf_counter() - start) * 1e6
+
+
+async def async_samples(iterations: int) -> tuple:
+    agent = get_graph("faq_agent")
+    first = [await afirst_event_us(lambda: astream_faq(FAQ_QUERY)) for _ in range(iterations)]
+    full = [await ainvoke_us(agent, faq_initial_state(FAQ_QUERY)) for _ in range(iterations)]
+    return first, full
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    rows = []
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent, loan = get_graph("faq_agent"), get_graph("loan")
+        rows.append((
+            "FAQ (sync)",
+            [first_event_us(lambda: stream_faq(FAQ_QUERY)) for _ in range(iterations)],
+            [invoke_us(agent, faq_initial_state(FAQ_QUERY)) for _ in range(iterations)],
+        ))
+        rows.append((
+            "Préstamo (sync)",
+            [first_event_us(lambda: stream_loan(*LOAN_CASE)) for _ in range(iterations)],
+            [invoke_us(loan, loan_initial_state(*LOAN_CASE)) for _ in range(iterations)],
+        ))
+        rows.append(("FAQ (async)", *asyncio.run(async_samples(iterations))))
+
+    print("=" * 70)
+    print("BENCHMARK: TIEMPO AL PRIMER EVENTO (STREAMING) VS. INVOKE")
+    print("=" * 70)
+    print(f"{'Grafo':<18}{'Primer evento (µs)':>20}{'invoke (µs)':>16}{'Mejora':>10}")
+    print("-" * 64)
+    for name, first, full in rows:
+        p50_first, p50_full = statistics.median(first), statistics.median(full)
+        print(f"{name:<18}{p50_first:>20,.1f}{p50_full:>16,.1f}{p50_full / p50_first:>9.1f}x")
+    print("-" * 64)
+    print("Latencias reportadas como mediana (p50).")
+
+
+if __name__ == "__main__":
+    main()
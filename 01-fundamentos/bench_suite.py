@@ -0,0 +1,188 @@
+"""
+Suite de benchmarks de todos los grafos del curso.
+Mide latencia de invoke (p50/p99), throughput, memoria asignada por invoke y
+memoria pico para entradas representativas, guarda los resultados en un archivo
+JSON de referencia y falla si alguna métrica empeora más que el umbral.
+
+Uso:
+    python bench_suite.py --save-baseline          # Genera/actualiza la referencia
+    python bench_suite.py                          # Compara contra la referencia
+    python bench_suite.py --threshold 0.10 --iterations 1000
+    python bench_suite.py --only faq_known loan_approve
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from graph_registry import get_graph, load_lesson_module
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+# Métricas comparadas contra la referencia (todas: menor es mejor)
+COMPARED_METRICS = ("p50_us", "p99_us", "alloc_kb_per_invoke")
+
+
+def loan_state(name: str, amount: float, score: int, employment: str) -> dict:
+    return {"applicant_name": name, "requested_amount": amount, "credit_score": score,
+            "employment_status": employment, "decision": "", "reason": ""}
+
+
+def faq_state(query: str) -> dict:
+    return {"user_query": query, "identified_topic": "", "response": "", "found_answer": False}
+
+
+def long_conversation(turns: int) -> dict:
+    """Estado de una conversación que ya pasó `turns` veces por el grafo."""
+    graph = get_graph("conversation")
+    state = {"messages": [], "user_name": "María", "turn_count": 0, "user_age": 25}
+    for _ in range(turns):
+        state = graph.invoke(state)
+    return state
+
+
+def build_cases() -> Dict[str, tuple]:
+    """Casos representativos: nombre → (grafo, estado de entrada)."""
+    for folder, module in [("00-lab-setup", "hello_langgraph"),
+                           ("01-fundamentos", "01_state_basico"),
+                           ("01-fundamentos", "02_nodos_y_edges"),
+                           ("01-fundamentos", "03_intro_kualtos")]:
+        load_lesson_module(folder, module)
+    kualtos = load_lesson_module("01-fundamentos", "03_intro_kualtos")
+
+    return {
+        "hello": ("hello", {"message": "", "counter": 0}),
+        "conversation_new": ("conversation", {"messages": [], "user_name": "María",
+                                              "turn_count": 0, "user_age": 25}),
+        "conversation_long": ("conversation", long_conversation(100)),
+        "loan_approve": ("loan", loan_state("Juan Pérez", 10000.00, 750, "empleado")),
+        "loan_reject_score": ("loan", loan_state("Ana García", 15000.00, 550, "empleado")),
+        "loan_manual_review": ("loan", loan_state("Carlos López", 8000.00, 650, "empleado")),
+        "loan_reject_unemployed": ("loan", loan_state("María Torres", 5000.00, 720, "desempleado")),
+        "faq_known": ("faq_agent", faq_state(kualtos.TEST_QUERIES[1])),
+        "faq_unknown": ("faq_agent", faq_state(kualtos.TEST_QUERIES[-1])),
+    }
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run_case(invoke: Callable[[], object], iterations: int, warmup: int = 20) -> dict:
+    """Mide un caso: latencias exactas, throughput y memoria (tracemalloc)."""
+    for _ in range(warmup):
+        invoke()
+
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter_ns()
+        invoke()
+        samples.append((time.perf_counter_ns() - t0) / 1e3)
+    elapsed = time.perf_counter() - start
+    samples.sort()
+
+    # Memoria en una pasada aparte: tracemalloc distorsiona los tiempos
+    alloc_runs = max(1, min(iterations, 50))
+    tracemalloc.start()
+    peak_per_invoke = 0
+    for _ in range(alloc_runs):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        invoke()
+        _, peak = tracemalloc.get_traced_memory()
+        peak_per_invoke += peak - before
+    _, run_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "p50_us": round(percentile(samples, 50), 2),
+        "p99_us": round(percentile(samples, 99), 2),
+        "mean_us": round(sum(samples) / len(samples), 2),
+        "throughput_per_s": round(iterations / elapsed, 1),
+        "alloc_kb_per_invoke": round(peak_per_invoke / alloc_runs / 1024, 2),
+        "peak_memory_kb": round(run_peak / 1024, 2),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """Lista de regresiones: métricas que superan la referencia por más del umbral."""
+    regressions = []
+    for case, metrics in results.items():
+        reference = baseline.get("cases", {}).get(case)
+        if not reference:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = reference.get(metric), metrics.get(metric)
+            if old and new is not None and new > old * (1 + threshold):
+                regressions.append(
+                    f"{case}.{metric}: {old:,.2f} → {new:,.2f} (+{(new / old - 1):.0%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de los grafos del curso")
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Archivo JSON de referencia")
+    parser.add_argument("--threshold", type=float,
+                        default=float(os.getenv("BENCH_THRESHOLD", "0.25")),
+                        help="Regresión máxima tolerada (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Guarda los resultados como nueva referencia")
+    parser.add_argument("--only", nargs="*", help="Ejecuta solo estos casos")
+    args = parser.parse_args()
+
+    cases = build_cases()
+    if args.only:
+        cases = {name: cases[name] for name in args.only}
+
+    print("=" * 78)
+    print("SUITE DE BENCHMARKS - GRAFOS DEL CURSO")
+    print("=" * 78)
+    print(f"{'Caso':<24}{'p50 µs':>10}{'p99 µs':>10}{'inv/s':>10}{'KB/inv':>10}{'pico KB':>12}")
+    print("-" * 78)
+
+    results = {}
+    for name, (graph_name, state) in cases.items():
+        graph = get_graph(graph_name)
+        metrics = run_case(lambda: graph.invoke(state), args.iterations)
+        results[name] = metrics
+        print(f"{name:<24}{metrics['p50_us']:>10,.1f}{metrics['p99_us']:>10,.1f}"
+              f"{metrics['throughput_per_s']:>10,.0f}{metrics['alloc_kb_per_invoke']:>10,.1f}"
+              f"{metrics['peak_memory_kb']:>12,.1f}")
+    print("-" * 78)
+
+    if args.save_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "cases": results,
+            }, f, indent=2)
+        print(f"💾 Referencia guardada en {args.baseline}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"❌ {len(regressions)} regresiones sobre el umbral de {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"   {line}")
+        return 1
+
+    print(f"✅ Sin regresiones sobre el umbral de {args.threshold:.0%} ({args.baseline})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
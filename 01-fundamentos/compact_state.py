@@ -0,0 +1,171 @@
+"""
+Estados compactos para ejecuciones de alto volumen.
+Los TypedDict de las lecciones son dicts en tiempo de ejecución: cada registro
+guarda una tabla hash con sus llaves. Una dataclass con __slots__ guarda solo
+los valores en posiciones fijas (~3-4x menos memoria por registro) y sigue
+funcionando con los nodos existentes gracias al acceso tipo dict (state["x"],
+state.get("x"), {**state}).
+
+Uso:
+    graph = loans.create_graph(state_schema=LoanRecord)
+    result = LoanRecord.from_mapping(graph.invoke(LoanRecord("Ana", 10000.0, 720, "empleado")))
+
+    python compact_state.py [registros] [iteraciones]   # Mide memoria y asignaciones
+"""
+
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Iterator, Mapping, Optional
+
+from graph_registry import load_lesson_module
+
+
+class CompactState:
+    """Acceso tipo dict (solo lectura) para dataclasses con __slots__."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+    def keys(self) -> tuple:
+        return self.__slots__
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def to_dict(self) -> dict:
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping[str, Any]):
+        """Construye el registro desde un dict (ej: el resultado de graph.invoke)."""
+        return cls(**{key: mapping[key] for key in cls.__slots__ if key in mapping})
+
+
+@dataclass(slots=True)
+class LoanRecord(CompactState):
+    """Versión compacta de LoanApplicationState (02_nodos_y_edges)."""
+    applicant_name: str = ""
+    requested_amount: float = 0.0
+    credit_score: int = 0
+    employment_status: str = ""
+    decision: str = ""
+    reason: str = ""
+    route: str = ""
+    quote: Optional[dict] = None
+
+
+@dataclass(slots=True)
+class FAQRecord(CompactState):
+    """Versión compacta de FAQAgentState (03_intro_kualtos)."""
+    user_query: str = ""
+    identified_topic: str = ""
+    response: str = ""
+    found_answer: bool = False
+
+
+def deep_size(record: Any) -> int:
+    """Bytes del contenedor más los valores que no son compartidos entre registros."""
+    values = record.values() if isinstance(record, dict) else (getattr(record, k) for k in record.__slots__)
+    return sys.getsizeof(record) + sum(sys.getsizeof(v) for v in values if not isinstance(v, (bool, type(None))))
+
+
+def retained_kb(build, count: int) -> float:
+    """Memoria retenida (KB) al guardar `count` registros construidos con build(i)."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    records = [build(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return (after - before) / 1024
+
+
+def alloc_per_invoke_kb(graph, state, iterations: int) -> float:
+    """Pico de memoria asignada por invoke (promedio, KB)."""
+    graph.invoke(state)
+    total = 0
+    tracemalloc.start()
+    for _ in range(iterations):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        graph.invoke(state)
+        _, peak = tracemalloc.get_traced_memory()
+        total += peak - before
+    tracemalloc.stop()
+    return total / iterations / 1024
+
+
+def per_invoke_us(graph, state, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        graph.invoke(state)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    loans = load_lesson_module("01-fundamentos", "02_nodos_y_edges")
+    kualtos = load_lesson_module("01-fundamentos", "03_intro_kualtos")
+
+    loan_result = {"applicant_name": "Juan Pérez", "requested_amount": 10000.0, "credit_score": 750,
+                   "employment_status": "empleado", "decision": "APROBADO",
+                   "reason": "Cumple con todos los requisitos"}
+    faq_result = {"user_query": kualtos.TEST_QUERIES[1], "identified_topic": "tasas",
+                  "response": kualtos.FAQ_DATABASE["tasas"]["respuesta"], "found_answer": True}
+
+    print("=" * 74)
+    print(f"ESTADO COMPACTO vs TypedDict ({count:,} registros, {iterations:,} invocaciones)")
+    print("=" * 74)
+
+    print(f"\n{'Registros retenidos':<28}{'dict (KB)':>14}{'slots (KB)':>14}{'Reducción':>12}")
+    print("-" * 68)
+    for name, result, record_type in [("préstamo", loan_result, LoanRecord),
+                                      ("FAQ", faq_result, FAQRecord)]:
+        # Nombre distinto por registro, como en una corrida real
+        key = next(iter(result))
+        as_dict = retained_kb(lambda i: {**result, key: f"{result[key]} {i}"}, count)
+        as_slots = retained_kb(lambda i: record_type.from_mapping({**result, key: f"{result[key]} {i}"}), count)
+        print(f"{name:<28}{as_dict:>14,.0f}{as_slots:>14,.0f}{as_dict / as_slots:>11.1f}x")
+        print(f"   contenedor por registro: dict {sys.getsizeof(result)} B, "
+              f"slots {sys.getsizeof(record_type.from_mapping(result))} B")
+
+    print(f"\n{'Por invoke':<28}{'KB asign.':>10}{'µs':>10}{'KB slots':>10}{'µs slots':>10}")
+    print("-" * 68)
+    cases = [
+        ("préstamo", loans.create_graph, LoanRecord, loans.LoanApplicationState,
+         {**loan_result, "decision": "", "reason": ""}),
+        ("FAQ", kualtos.create_faq_agent, FAQRecord, kualtos.FAQAgentState,
+         {**faq_result, "identified_topic": "", "response": "", "found_answer": False}),
+    ]
+    for name, factory, record_type, typed_dict, state in cases:
+        graph = factory()
+        compact = factory(state_schema=record_type)
+        if record_type.from_mapping(compact.invoke(record_type.from_mapping(state))) != \
+                record_type.from_mapping(graph.invoke(state)):
+            raise AssertionError(f"{name}: el resultado con estado compacto difiere")
+        record = record_type.from_mapping(state)
+        print(f"{name:<28}{alloc_per_invoke_kb(graph, state, iterations):>10.1f}"
+              f"{per_invoke_us(graph, state, iterations):>10.0f}"
+              f"{alloc_per_invoke_kb(compact, record, iterations):>10.1f}"
+              f"{per_invoke_us(compact, record, iterations):>10.0f}")
+    print("-" * 68)
+    print("✅ Resultados idénticos con ambos esquemas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Presupuestos de latencia por nodo y por grafo, con ruta de respaldo.
+Un nodo que excede su presupuesto se cancela y la invocación termina por la
+ruta de respaldo (ej: revisión manual en préstamos, respuesta en cache o
+"pregunta desconocida" en el FAQ) en lugar de esperar al servicio lento.
+
+- Presupuesto por nodo: node_budgets={"verify_identity": 0.05} o node_budget
+  para todos. Presupuesto por grafo: graph_budget, compartido por todos los
+  nodos de la invocación (cada nodo recibe lo que quede).
+- Nodos async: asyncio.wait_for los cancela de verdad. Nodos síncronos: se
+  ejecutan en un pool propio y, si vencen, se abandonan (Python no puede
+  interrumpir un hilo); su resultado se descarta.
+- Después de un vencimiento, los nodos restantes se saltan (retornan {}) y al
+  terminar se aplica la función de respaldo sobre el estado final (en streaming
+  se emite como último paso).
+- Contadores de vencimientos por nodo y causa (node / graph) y de respaldos.
+
+LangGraph trae timeout= por nodo, pero solo interrumpe nodos async y termina
+la invocación con error; aquí el vencimiento se convierte en una respuesta.
+
+Uso:
+    deadlines = Deadlines(node_budgets={"verify_identity": 0.05}, graph_budget=0.1)
+    graph = loans.create_graph(checks="threads", deadlines=deadlines)
+    graph.invoke(state)        # También ainvoke, stream, astream, batch y abatch
+    deadlines.stats()          # {"misses": {...}, "fallbacks": ..., ...}
+"""
+
+import asyncio
+import contextvars
+import inspect
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Callable, Dict, Iterable, Mapping, Optional
+
+from langgraph.graph import StateGraph
+
+logger = logging.getLogger("kualtos.deadlines")
+
+
+class _Run:
+    """Presupuesto de una invocación (compartido por sus nodos, incluso en paralelo)."""
+
+    __slots__ = ("deadline", "missed")
+
+    def __init__(self, deadline: Optional[float]):
+        self.deadline = deadline
+        self.missed = False
+
+
+_RUN: contextvars.ContextVar = contextvars.ContextVar("kualtos_deadline_run", default=None)
+
+
+class Deadlines:
+    """Presupuestos de latencia y contadores de vencimientos para uno o más grafos."""
+
+    def __init__(self, node_budgets: Mapping[str, float] = None, node_budget: float = None,
+                 graph_budget: float = None, fallback: Callable[[dict], dict] = None,
+                 max_workers: int = 32):
+        self.node_budgets = dict(node_budgets or {})
+        self.node_budget = node_budget
+        self.graph_budget = graph_budget
+        self.fallback = fallback
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="deadline")
+        self._lock = threading.Lock()
+        self.misses: Dict[str, Counter] = {}
+        self.invocations = 0
+        self.fallbacks = 0
+        self.skipped = 0
+
+    def _miss(self, name: str, cause: str, run: Optional[_Run]) -> dict:
+        if run is not None:
+            run.missed = True
+        with self._lock:
+            self.misses.setdefault(name, Counter())[cause] += 1
+        logger.info("⏱️  %s excedió el presupuesto (%s): ruta de respaldo", name, cause)
+        return {}
+
+    def _timeout(self, name: str, run: Optional[_Run]):
+        """(segundos disponibles o None si no hay límite, causa del vencimiento)."""
+        budget = self.node_budgets.get(name, self.node_budget)
+        if run is None or run.deadline is None:
+            return budget, "node"
+        remaining = run.deadline - time.monotonic()
+        if budget is None or remaining < budget:
+            return remaining, "graph"
+        return budget, "node"
+
+    def _skip(self, run: Optional[_Run]) -> bool:
+        if run is not None and run.missed:
+            with self._lock:
+                self.skipped += 1
+            return True
+        return False
+
+    def wrap_node(self, name: str, fn: Callable) -> Callable:
+        """Envuelve un nodo para que respete su presupuesto (o el que le quede al grafo)."""
+        if inspect.iscoroutinefunction(fn):
+            async def async_wrapper(state):
+                run = _RUN.get()
+                if self._skip(run):
+                    return {}
+                timeout, cause = self._timeout(name, run)
+                if timeout is None:
+                    return await fn(state)
+                if timeout <= 0:
+                    return self._miss(name, cause, run)
+                try:
+                    return await asyncio.wait_for(fn(state), timeout)
+                except asyncio.TimeoutError:
+                    return self._miss(name, cause, run)
+            async_wrapper.__name__ = getattr(fn, "__name__", name)
+            return async_wrapper
+
+        def wrapper(state):
+            run = _RUN.get()
+            if self._skip(run):
+                return {}
+            timeout, cause = self._timeout(name, run)
+            if timeout is None:
+                return fn(state)
+            if timeout <= 0:
+                return self._miss(name, cause, run)
+            future = self._pool.submit(contextvars.copy_context().run, fn, state)
+            try:
+                return future.result(timeout)
+            except FutureTimeout:
+                future.cancel()  # Si no empezó, no se ejecuta; si ya corre, se abandona
+                return self._miss(name, cause, run)
+        wrapper.__name__ = getattr(fn, "__name__", name)
+        return wrapper
+
+    def apply(self, workflow: StateGraph, exempt: Iterable[str] = ()) -> StateGraph:
+        """Envuelve los nodos del StateGraph (sin compilar); `exempt` son los nodos de respaldo."""
+        exempt = set(exempt)
+        for name, spec in list(workflow.nodes.items()):
+            runnable = spec.runnable
+            fn = getattr(runnable, "func", None) or getattr(runnable, "afunc", None)
+            if name in exempt or fn is None or getattr(runnable, "func_accepts", None):
+                continue
+            del workflow.nodes[name]
+            # StateGraph.add_node directo: la instrumentación (si hay) ya envolvió la función
+            StateGraph.add_node(workflow, name, self.wrap_node(name, fn), metadata=spec.metadata,
+                                input_schema=spec.input_schema, retry_policy=spec.retry_policy,
+                                cache_policy=spec.cache_policy, defer=spec.defer)
+        return workflow
+
+    def bind(self, graph, fallback: Callable[[dict], dict]) -> "DeadlineGraph":
+        """Grafo compilado con presupuesto por invocación y función de respaldo."""
+        return DeadlineGraph(graph, self, self.fallback or fallback)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "invocations": self.invocations,
+                "fallbacks": self.fallbacks,
+                "skipped_nodes": self.skipped,
+                "misses": {name: dict(causes) for name, causes in self.misses.items()},
+                "miss_total": sum(sum(causes.values()) for causes in self.misses.values()),
+            }
+
+
+def cached_answer_fallback(cache, otherwise: Callable[[dict], dict]) -> Callable[[dict], dict]:
+    """Respaldo para el FAQ: la respuesta en cache (FAQAnswerCache) si existe, si no `otherwise`."""
+    def fallback(state: dict) -> dict:
+        cached = cache.get(state["user_query"])
+        return cached if cached is not None else otherwise(state)
+    return fallback
+
+
+FALLBACK_NODE = "deadline_fallback"  # Nombre del paso de respaldo en stream_mode="updates"
+
+
+class DeadlineGraph:
+    """Envuelve invoke/ainvoke/stream/astream/batch/abatch de un grafo compilado.
+
+    El resto de los atributos se delega sin cambios. En streaming, si algún nodo
+    venció, al final se emite el respaldo: el estado completo corregido en
+    stream_mode="values" y un paso FALLBACK_NODE en stream_mode="updates".
+    """
+
+    def __init__(self, graph, deadlines: Deadlines, fallback: Callable[[dict], dict]):
+        self.graph = graph
+        self.deadlines = deadlines
+        self.fallback = fallback
+
+    def __getattr__(self, name):
+        return getattr(self.graph, name)
+
+    def _start(self) -> _Run:
+        budget = self.deadlines.graph_budget
+        with self.deadlines._lock:
+            self.deadlines.invocations += 1
+        return _Run(time.monotonic() + budget if budget is not None else None)
+
+    def _finish(self, run: _Run, result: dict) -> dict:
+        if not run.missed:
+            return result
+        with self.deadlines._lock:
+            self.deadlines.fallbacks += 1
+        return {**result, **self.fallback(result)}
+
+    def invoke(self, state, config=None, **kwargs) -> dict:
+        run = self._start()
+        token = _RUN.set(run)
+        try:
+            result = self.graph.invoke(state, config, **kwargs)
+        finally:
+            _RUN.reset(token)
+        return self._finish(run, result)
+
+    async def ainvoke(self, state, config=None, **kwargs) -> dict:
+        run = self._start()
+        token = _RUN.set(run)
+        try:
+            result = await self.graph.ainvoke(state, config, **kwargs)
+        finally:
+            _RUN.reset(token)
+        return self._finish(run, result)
+
+    def _stream_modes(self, stream_mode, kwargs):
+        """(modos pedidos, si se pidió uno solo, modos a ejecutar: siempre con "values")."""
+        if kwargs.get("subgraphs") or kwargs.get("version", "v1") != "v1":
+            raise NotImplementedError("DeadlineGraph solo soporta stream sin subgrafos (version v1)")
+        if stream_mode is None:
+            stream_mode = self.graph.stream_mode
+        single = isinstance(stream_mode, str)
+        requested = [stream_mode] if single else list(stream_mode)
+        return requested, single, requested + ([] if "values" in requested else ["values"])
+
+    def _fallback_chunks(self, run: _Run, requested, single: bool, values: Optional[dict]):
+        """Pasos finales que corrigen el resultado de una invocación que venció."""
+        if not run.missed or values is None:
+            return []
+        with self.deadlines._lock:
+            self.deadlines.fallbacks += 1
+        update = self.fallback(values)
+        chunks = {"values": {**values, **update}, "updates": {FALLBACK_NODE: update}}
+        return [chunks[mode] if single else (mode, chunks[mode])
+                for mode in requested if mode in chunks]
+
+    def stream(self, state, config=None, *, stream_mode=None, **kwargs):
+        requested, single, modes = self._stream_modes(stream_mode, kwargs)
+        run = self._start()
+        # Contexto propio: _RUN no se filtra al código que consume el iterador entre pasos
+        context = contextvars.copy_context()
+        context.run(_RUN.set, run)
+        steps = context.run(self.graph.stream, state, config, stream_mode=modes, **kwargs)
+        values = None
+        while True:
+            try:
+                mode, chunk = context.run(next, steps)
+            except StopIteration:
+                break
+            if mode == "values":
+                values = chunk
+            if mode in requested:
+                yield chunk if single else (mode, chunk)
+        yield from self._fallback_chunks(run, requested, single, values)
+
+    async def astream(self, state, config=None, *, stream_mode=None, **kwargs):
+        requested, single, modes = self._stream_modes(stream_mode, kwargs)
+        run = self._start()
+        context = contextvars.copy_context()
+        context.run(_RUN.set, run)
+        steps = self.graph.astream(state, config, stream_mode=modes, **kwargs)
+        values = None
+        try:
+            while True:
+                try:
+                    # Cada paso corre en una tarea con el contexto de esta invocación
+                    mode, chunk = await asyncio.create_task(steps.__anext__(), context=context)
+                except StopAsyncIteration:
+                    break
+                if mode == "values":
+                    values = chunk
+                if mode in requested:
+                    yield chunk if single else (mode, chunk)
+        finally:
+            await steps.aclose()
+        for chunk in self._fallback_chunks(run, requested, single, values):
+            yield chunk
+
+    def batch(self, states, config=None, *, return_exceptions: bool = False, **kwargs) -> list:
+        configs = config if isinstance(config, list) else [config] * len(states)
+        max_workers = (configs[0] or {}).get("max_concurrency") if configs else None
+
+        def one(state, state_config):
+            try:
+                return self.invoke(state, state_config, **kwargs)
+            except Exception as error:
+                if return_exceptions:
+                    return error
+                raise
+
+        with ThreadPoolExecutor(max_workers) as pool:
+            return list(pool.map(one, states, configs))
+
+    async def abatch(self, states, config=None, *, return_exceptions: bool = False,
+                     **kwargs) -> list:
+        configs = config if isinstance(config, list) else [config] * len(states)
+        return await asyncio.gather(*(self.ainvoke(state, state_config, **kwargs)
+                                      for state, state_config in zip(states, configs)),
+                                    return_exceptions=return_exceptions)
@@ -0,0 +1,124 @@
+"""
+Cache de respuestas del agente FAQ por pregunta normalizada.
+Preguntas equivalentes ("¿Cuál es la TASA de interés?" y "cual es la tasa de interes")
+comparten la misma entrada y no vuelven a ejecutar el grafo.
+Tamaño acotado (LRU), expiración por TTL y contadores de aciertos/fallos/desalojos.
+
+Es opcional: el agente y los scripts lo usan solo si se pide. faq_server.py y
+prefork_server.py lo activan con --answer-cache N (apagado por defecto, porque
+con el TTL una respuesta modificada puede tardar en verse).
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from graph_registry import get_graph
+from keyword_matcher import normalize_text
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+UNKNOWN_TOPIC = "desconocido"  # Tema que asigna el agente cuando no reconoce la pregunta
+
+
+def normalize_query(query: str) -> str:
+    """Normaliza mayúsculas, acentos, signos de puntuación y espacios."""
+    return " ".join(_PUNCTUATION.sub(" ", normalize_text(query)).split())
+
+
+class FAQAnswerCache:
+    """Cache LRU con TTL delante del agente FAQ compilado."""
+
+    def __init__(self, agent=None, maxsize: int = 1024, ttl: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.agent = agent
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, query: str) -> Optional[dict]:
+        """Retorna el resultado en cache para la pregunta, o None si no existe o expiró."""
+        key = normalize_query(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, result = entry
+            if self.clock() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(result)
+
+    def put(self, query: str, result: dict) -> None:
+        """Guarda el resultado del agente, desalojando la entrada menos usada si hace falta."""
+        key = normalize_query(query)
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, dict(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def ask(self, query: str) -> dict:
+        """Responde desde el cache o ejecuta el agente completo y guarda el resultado."""
+        result = self.get(query)
+        if result is not None:
+            return result
+
+        agent = self.agent or get_graph("faq_agent")
+        result = agent.invoke({
+            "user_query": query,
+            "identified_topic": "",
+            "response": "",
+            "found_answer": False,
+        })
+        self.put(query, result)
+        return result
+
+    def invalidate(self, topic: Optional[str] = None) -> int:
+        """
+        Descarta entradas cuando cambia FAQ_DATABASE: todas, o las del tema indicado
+        más las preguntas sin respuesta (el tema nuevo o modificado puede responderlas).
+        Retorna cuántas entradas se eliminaron.
+        """
+        with self._lock:
+            if topic is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+
+            stale = [key for key, (_, result) in self._entries.items()
+                     if result.get("identified_topic") in (topic, UNKNOWN_TOPIC)
+                     or not result.get("found_answer")]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def stats(self) -> dict:
+        """Contadores del cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
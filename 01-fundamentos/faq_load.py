@@ -0,0 +1,96 @@
+"""
+Script de carga para el servicio FAQ (faq_server.py).
+Abre N conexiones keep-alive y envía preguntas de TEST_QUERIES tan rápido como
+el servidor responde, reportando solicitudes por segundo y latencias. Es un
+bucle cerrado: mide el throughput máximo, pero sus latencias no incluyen la
+cola que se forma al saturar (ver load_generator.py).
+
+Uso:
+    python faq_server.py &
+    python faq_load.py [--connections 64] [--duration 10] [--port 8080]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import quote
+
+from graph_registry import load_lesson_module
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    """Lee una respuesta HTTP completa y retorna el código de estado."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head[9:12])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line[:15].lower() == b"content-length:":
+            length = int(line[15:])
+    await reader.readexactly(length)
+    return status
+
+
+async def worker(host: str, port: int, requests: list, deadline: float,
+                 latencies: list, errors: list) -> None:
+    """Una conexión keep-alive que envía solicitudes en bucle hasta el deadline."""
+    reader, writer = await asyncio.open_connection(host, port)
+    i = 0
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(requests[i % len(requests)])
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+            i += 1
+    finally:
+        writer.close()
+
+
+async def run_load(host: str, port: int, connections: int, duration: float) -> None:
+    kualtos = load_lesson_module("01-fundamentos", "03_intro_kualtos")
+    requests = [
+        (f"GET /faq?q={quote(query)} HTTP/1.1\r\nHost: {host}\r\n\r\n").encode("latin-1")
+        for query in kualtos.TEST_QUERIES
+    ]
+
+    latencies: list = []
+    errors: list = []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*[
+        worker(host, port, requests, deadline, latencies, errors)
+        for _ in range(connections)
+    ])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    total = len(latencies)
+    print("=" * 70)
+    print("PRUEBA DE CARGA - SERVICIO FAQ")
+    print("=" * 70)
+    print(f"Conexiones: {connections} | Duración: {elapsed:.1f}s")
+    print(f"Solicitudes: {total:,} | Errores: {len(errors):,}")
+    print(f"Throughput: {total / elapsed:,.0f} solicitudes/s")
+    if total:
+        print(f"Latencia p50: {statistics.median(latencies) * 1000:.2f} ms")
+        print(f"Latencia p99: {latencies[int(total * 0.99) - 1] * 1000:.2f} ms")
+        print(f"Latencia máx: {latencies[-1] * 1000:.2f} ms")
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del servicio FAQ")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    asyncio.run(run_load(args.host, args.port, args.connections, args.duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Recuperación TF-IDF sobre la base FAQ (sin LLM ni red).
+Se construye una sola vez a partir de las preguntas y respuestas: vocabulario,
+IDF y un índice invertido en arreglos NumPy (término → documentos y pesos
+normalizados). Una consulta no recorre toda la base:
+1. Candidatos: para cada término se guardan aparte sus `champion_size`
+   documentos de mayor peso ("champion lists"); los candidatos son la unión de
+   las listas de los términos de la consulta. Así las palabras muy comunes no
+   obligan a visitar todos los documentos.
+2. Puntaje exacto: la similitud coseno de cada candidato se calcula con
+   búsqueda binaria (searchsorted) en las listas completas, ordenadas por
+   documento, y el top-k sale de argpartition.
+El costo depende de la consulta y no del tamaño de la base. Si un término tiene
+menos de `champion_size` documentos (siempre, en bases chicas) es exacto.
+
+Con bases grandes el índice se construye offline (faq_store.py build lo guarda
+junto al archivo FAQ) y se abre con mmap: abrirlo no lee los arreglos y varios
+procesos comparten sus páginas. LazyRetriever difiere la construcción o la
+apertura hasta la primera búsqueda y se reconstruye después de invalidate().
+
+Uso:
+    retriever = FAQRetriever.from_faq(FAQ_DATABASE, min_score=0.2)
+    retriever.search("¿Puedo pagar en OXXO?")   # [("pagos", 0.41), ...]
+    retriever.best("¿Puedo pagar en OXXO?")     # ("pagos", 0.41) o None
+    retriever.save("faq.kfaq.tfidf")            # FAQRetriever.load(...) lo abre con mmap
+
+    python faq_retrieval.py [entradas] [consultas]   # Benchmark de latencia
+"""
+
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from keyword_matcher import normalize_text
+
+TOKEN_RE = re.compile(r"[a-zñ0-9]+")
+
+# Arreglos del índice guardados en disco (un .npy por arreglo, abiertos con mmap)
+INDEX_ARRAYS = ("idf", "_docs", "_weights", "_offsets", "_champions", "_champion_offsets")
+
+# Palabras vacías en español (ya sin acentos, como las deja normalize_text)
+STOPWORDS = frozenset("""
+a al algo ante como con cual cuales cuando cuanto de del desde donde el ella en entre
+es esta este esto hay la las le les lo los mas me mi mis muy ni no nos o para pero
+por que se si sin sobre su sus te tu tus un una uno unos y ya yo puedo puede
+""".split())
+
+
+def stem(token: str) -> str:
+    """Reducción mínima de plurales: 'pagos' → 'pago', 'requisitos' → 'requisito'."""
+    if len(token) > 4 and token.endswith("es") and token[-3] not in "aeiou":
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return [stem(token) for token in TOKEN_RE.findall(normalize_text(text))
+            if len(token) > 1 and token not in STOPWORDS]
+
+
+def _log_tf(counts: Counter) -> Dict[str, float]:
+    return {term: 1.0 + math.log(count) for term, count in counts.items()}
+
+
+class FAQRetriever:
+    """Índice TF-IDF con similitud coseno y umbral de confianza."""
+
+    def __init__(self, documents: Mapping[str, str], min_score: float = 0.2,
+                 champion_size: int = 256):
+        self.min_score = min_score
+        self.topics: List[str] = list(documents)
+        doc_terms = [_log_tf(Counter(tokenize(text))) for text in documents.values()]
+
+        # Vocabulario e IDF suavizado
+        df = Counter(term for terms in doc_terms for term in terms)
+        self.vocabulary: Dict[str, int] = {term: i for i, term in enumerate(df)}
+        n_docs = len(self.topics)
+        self.idf = np.array([math.log((1 + n_docs) / (1 + df[term])) + 1.0 for term in df],
+                            dtype=np.float32)
+
+        # Triples (término, documento, peso) con cada documento normalizado (L2)
+        term_ids, doc_ids, weights = [], [], []
+        for doc_id, terms in enumerate(doc_terms):
+            ids = [self.vocabulary[term] for term in terms]
+            w = np.fromiter(terms.values(), dtype=np.float32, count=len(ids)) * self.idf[ids]
+            norm = float(np.linalg.norm(w)) or 1.0
+            term_ids.extend(ids)
+            doc_ids.extend([doc_id] * len(ids))
+            weights.append(w / norm)
+
+        # Índice invertido: postings por término, ordenados por documento + offsets
+        term_ids = np.array(term_ids, dtype=np.int32)
+        doc_ids = np.array(doc_ids, dtype=np.int32)
+        weights = np.concatenate(weights) if weights else np.zeros(0, np.float32)
+        order = np.lexsort((doc_ids, term_ids))
+        self._docs = doc_ids[order]
+        self._weights = weights[order]
+        counts = np.bincount(term_ids, minlength=len(self.vocabulary))
+        self._offsets = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self._offsets[1:])
+
+        # Champion lists: los `champion_size` documentos de mayor peso por término
+        order = np.lexsort((-weights, term_ids))
+        rank = np.arange(len(order)) - self._offsets[term_ids[order]]
+        keep = order[rank < champion_size]
+        self._champions = doc_ids[keep]
+        self._champion_offsets = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.minimum(counts, champion_size), out=self._champion_offsets[1:])
+
+    @classmethod
+    def from_faq(cls, faq_database: Mapping[str, Mapping[str, str]], question_weight: int = 2,
+                 **kwargs) -> "FAQRetriever":
+        """Índice sobre pregunta + respuesta; la pregunta pesa `question_weight` veces."""
+        documents = {
+            topic: " ".join([entry["pregunta"]] * question_weight + [entry["respuesta"]])
+            for topic, entry in faq_database.items()
+        }
+        return cls(documents, **kwargs)
+
+    def save(self, directory: str) -> None:
+        """Guarda el índice: un .npy por arreglo más temas y vocabulario en meta.json."""
+        os.makedirs(directory, exist_ok=True)
+        for name in INDEX_ARRAYS:
+            np.save(os.path.join(directory, f"{name.lstrip('_')}.npy"), getattr(self, name))
+        # meta.json se escribe al final: su fecha marca un índice completo
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"topics": self.topics, "vocabulary": list(self.vocabulary)}, f,
+                      ensure_ascii=False)
+
+    @classmethod
+    def load(cls, directory: str, min_score: float = 0.2) -> "FAQRetriever":
+        """Abre un índice guardado con save(); los arreglos quedan mapeados (mmap)."""
+        retriever = cls.__new__(cls)
+        retriever.min_score = min_score
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        retriever.topics = meta["topics"]
+        retriever.vocabulary = {term: i for i, term in enumerate(meta["vocabulary"])}
+        for name in INDEX_ARRAYS:
+            setattr(retriever, name, np.load(os.path.join(directory, f"{name.lstrip('_')}.npy"),
+                                             mmap_mode="r"))
+        return retriever
+
+    def __len__(self) -> int:
+        return len(self.topics)
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[str, float]]:
+        """Los k temas más parecidos a la consulta, con su similitud coseno."""
+        counts = Counter(term for term in tokenize(query) if term in self.vocabulary)
+        if not counts:
+            return []
+
+        ids = [self.vocabulary[term] for term in counts]
+        q = np.fromiter(_log_tf(counts).values(), dtype=np.float32, count=len(ids)) * self.idf[ids]
+        q /= np.linalg.norm(q)
+
+        # Candidatos: unión de las champion lists de los términos de la consulta
+        candidates = np.concatenate(
+            [self._champions[self._champion_offsets[i]:self._champion_offsets[i + 1]] for i in ids]
+        )
+        candidates.sort()
+        candidates = candidates[np.concatenate(([True], candidates[1:] != candidates[:-1]))]
+
+        # Puntaje exacto de cada candidato: búsqueda binaria en la lista completa del término
+        scores = np.zeros(len(candidates), dtype=np.float32)
+        for term_id, weight in zip(ids, q):
+            docs = self._docs[self._offsets[term_id]:self._offsets[term_id + 1]]
+            pos = np.minimum(np.searchsorted(docs, candidates), len(docs) - 1)
+            hit = docs[pos] == candidates
+            scores[hit] += weight * self._weights[self._offsets[term_id] + pos[hit]]
+
+        if len(scores) > k:
+            top = np.argpartition(scores, -k)[-k:]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(scores[top])[::-1]]
+        return [(self.topics[candidates[i]], float(scores[i])) for i in top]
+
+    def best(self, query: str) -> Optional[Tuple[str, float]]:
+        """El tema más parecido si supera el umbral de confianza; None si no."""
+        results = self.search(query, k=1)
+        if results and results[0][1] >= self.min_score:
+            return results[0]
+        return None
+
+
+def index_path(store_path: str) -> str:
+    """Directorio del índice precalculado de un archivo FAQ (faq_store.py)."""
+    return f"{store_path}.tfidf"
+
+
+def index_is_current(store_path: str) -> bool:
+    """True si el índice junto al archivo existe y es posterior al archivo."""
+    meta = os.path.join(index_path(store_path), "meta.json")
+    try:
+        return os.path.getmtime(meta) >= os.path.getmtime(store_path)
+    except OSError:
+        return False
+
+
+class LazyRetriever:
+    """Construye (o abre) el índice en la primera búsqueda; invalidate() lo descarta."""
+
+    def __init__(self, build: Callable[[], FAQRetriever]):
+        self.build = build
+        self._retriever: Optional[FAQRetriever] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> FAQRetriever:
+        retriever = self._retriever
+        if retriever is None:
+            with self._lock:
+                if self._retriever is None:
+                    self._retriever = self.build()
+                retriever = self._retriever
+        return retriever
+
+    def invalidate(self) -> None:
+        """Llamar cuando cambia la base FAQ: la siguiente búsqueda reconstruye el índice."""
+        with self._lock:
+            self._retriever = None
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[str, float]]:
+        return self.get().search(query, k)
+
+    def best(self, query: str) -> Optional[Tuple[str, float]]:
+        return self.get().best(query)
+
+    def __len__(self) -> int:
+        return len(self.get())
+
+
+def synthetic_corpus(n: int, vocabulary: int = 20_000, seed: int = 0) -> Dict[str, str]:
+    """Documentos con frecuencias de palabras tipo Zipf, para pruebas de escala."""
+    rng = random.Random(seed)
+    words = [f"palabra{i}" for i in range(vocabulary)]
+    weights = [1.0 / (rank + 1) for rank in range(vocabulary)]
+    return {f"tema_{i:07d}": " ".join(rng.choices(words, weights, k=60)) for i in range(n)}
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    print("=" * 62)
+    print(f"BENCHMARK: RECUPERACIÓN TF-IDF ({n:,} entradas)")
+    print("=" * 62)
+
+    corpus = synthetic_corpus(n)
+    start = time.perf_counter()
+    retriever = FAQRetriever(corpus)
+    print(f"Construcción del índice: {time.perf_counter() - start:.1f} s "
+          f"({len(retriever.vocabulary):,} términos, {len(retriever._docs):,} postings, "
+          f"{(retriever._docs.nbytes + retriever._weights.nbytes) / 2**20:.0f} MB)")
+
+    # Consultas de 4 palabras tomadas de documentos reales (incluye términos frecuentes)
+    rng = random.Random(1)
+    texts = list(corpus.values())
+    samples = [" ".join(rng.sample(rng.choice(texts).split(), 4)) for _ in range(queries)]
+    latencies = []
+    for query in samples:
+        t0 = time.perf_counter_ns()
+        retriever.search(query)
+        latencies.append((time.perf_counter_ns() - t0) / 1e3)
+    latencies.sort()
+
+    print(f"Latencia por consulta (µs): p50 {latencies[len(latencies) // 2]:,.0f} | "
+          f"p99 {latencies[int(len(latencies) * 0.99)]:,.0f} | máx {latencies[-1]:,.0f}")
+
+    # Calidad de las champion lists: mismo top-1 que la búsqueda exhaustiva
+    approx = [retriever.search(query, k=1) for query in samples[:200]]
+    retriever._champions, retriever._champion_offsets = retriever._docs, retriever._offsets
+    exact = [retriever.search(query, k=1) for query in samples[:200]]
+    agreement = sum(a[:1] == e[:1] or (a and e and abs(a[0][1] - e[0][1]) < 1e-6)
+                    for a, e in zip(approx, exact)) / len(exact)
+    print(f"Top-1 igual a la búsqueda exhaustiva: {agreement:.1%}")
+    print("=" * 62)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Servicio HTTP asyncio para el agente FAQ de Kualtos.
+Ejecuta create_faq_agent con ainvoke y concurrencia acotada; preguntas equivalentes
+que llegan al mismo tiempo comparten una sola ejecución (single_flight.py). Cada
+respuesta de FAQ_DATABASE se codifica en UTF-8 la primera vez que se pide y se
+guarda en un memo acotado (LRU, --encoded-cache); con la base en disco
+(KUALTOS_FAQ_STORE) arrancar no lee ni copia el corpus. El mensaje de
+handle_unknown_question se codifica al arrancar.
+
+Con --answer-cache N, el tema de cada pregunta normalizada se guarda en
+faq_cache.FAQAnswerCache (LRU con TTL) y las preguntas repetidas no ejecutan el
+grafo aunque no lleguen al mismo tiempo. Está apagado por defecto.
+
+Throughput (cliente y servidor en el mismo núcleo): ~5,400 solicitudes/s con
+faq_load.py, cuyas preguntas se repiten y comparten ejecución (~10,000/s con
+--answer-cache, que evita el grafo en las repetidas); ~350-600/s con
+preguntas todas distintas (load_generator.py), limitado por el ainvoke del grafo
+y no por HTTP. Miles por núcleo con preguntas distintas sigue pendiente.
+
+Uso:
+    python faq_server.py [--host 127.0.0.1] [--port 8080] [--max-concurrency 256]
+    python faq_server.py --answer-cache 4096 [--answer-ttl 300]
+
+Endpoints:
+    GET  /faq?q=<pregunta>
+    POST /faq            {"query": "<pregunta>"}
+    GET  /health
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from functools import lru_cache
+
+from async_http import Request, build_response, start_server
+from faq_cache import UNKNOWN_TOPIC, FAQAnswerCache, normalize_query
+from graph_registry import get_graph, load_lesson_module
+from instrumentation import configure_logging
+from single_flight import SingleFlight
+
+ENCODED_CACHE_SIZE = 1024  # Respuestas codificadas en memoria (las más pedidas)
+
+
+def encode_answer(topic: str, found: bool, text: str) -> bytes:
+    """Serializa una respuesta JSON completa (HTTP incluido) una sola vez."""
+    body = json.dumps(
+        {"topic": topic, "found_answer": found, "response": text},
+        ensure_ascii=False,
+    ).encode("utf-8")
+    return build_response(200, body)
+
+
+class FAQService:
+    """Atiende preguntas usando el agente compilado y respuestas codificadas una sola vez."""
+
+    def __init__(self, max_concurrency: int = 256, encoded_cache_size: int = ENCODED_CACHE_SIZE,
+                 answer_cache_size: int = 0, answer_ttl: float = 300.0):
+        self.kualtos = load_lesson_module("01-fundamentos", "03_intro_kualtos")
+        self.agent = get_graph("faq_agent")
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.flight = SingleFlight()
+        # Tema por pregunta normalizada (opcional): evita el grafo en preguntas repetidas
+        self.answers = (FAQAnswerCache(self.agent, maxsize=answer_cache_size, ttl=answer_ttl)
+                        if answer_cache_size > 0 else None)
+
+        # Cada respuesta se codifica al pedirse por primera vez (memo LRU acotado)
+        self.encoded = lru_cache(maxsize=encoded_cache_size)(self._encode_topic)
+        fallback = self.kualtos.handle_unknown_question({"user_query": ""})["response"]
+        self.fallback = encode_answer(UNKNOWN_TOPIC, False, fallback)
+
+        self.health = build_response(200, b'{"status": "ok"}')
+        self.not_found = build_response(404, b'{"error": "not found"}')
+        self.bad_request = build_response(400, b'{"error": "missing query"}')
+
+    async def _classify(self, query: str) -> str:
+        async with self.semaphore:
+            result = await self.agent.ainvoke({
+                "user_query": query,
+                "identified_topic": "",
+                "response": "",
+                "found_answer": False,
+            })
+        topic = result["identified_topic"]
+        if self.answers is not None:
+            self.answers.put(query, {"identified_topic": topic,
+                                     "found_answer": topic != UNKNOWN_TOPIC})
+        return topic
+
+    def _encode_topic(self, topic: str) -> bytes:
+        entry = self.kualtos.FAQ_DATABASE.get(topic)
+        if entry is None:
+            return self.fallback
+        return encode_answer(topic, True, entry["respuesta"])
+
+    def invalidate(self, topic: str = None) -> None:
+        """Descarta las respuestas codificadas y en cache (llamar cuando cambia FAQ_DATABASE)."""
+        self.encoded.cache_clear()
+        if self.answers is not None:
+            self.answers.invalidate(topic)
+
+    async def answer(self, query: str) -> bytes:
+        """Ejecuta el agente (una vez por pregunta en vuelo) y retorna la respuesta codificada."""
+        cached = self.answers.get(query) if self.answers is not None else None
+        if cached is not None:
+            return self.encoded(cached["identified_topic"])
+        topic = await self.flight.ado(normalize_query(query), lambda: self._classify(query))
+        return self.encoded(topic)
+
+    async def handle(self, request: Request) -> bytes:
+        """Handler HTTP: enruta la solicitud al endpoint correspondiente."""
+        if request.path == "/health":
+            return self.health
+        if request.path != "/faq":
+            return self.not_found
+
+        if request.method == "POST":
+            try:
+                query = json.loads(request.body or b"{}").get("query", "")
+            except (ValueError, AttributeError):
+                return self.bad_request
+        else:
+            query = request.query.get("q", "")
+
+        if not query:
+            return self.bad_request
+        return await self.answer(query)
+
+
+async def serve(host: str, port: int, max_concurrency: int,
+                encoded_cache_size: int = ENCODED_CACHE_SIZE, answer_cache_size: int = 0,
+                answer_ttl: float = 300.0) -> None:
+    """Arranca el servicio y atiende solicitudes hasta que se interrumpa."""
+    service = FAQService(max_concurrency, encoded_cache_size, answer_cache_size, answer_ttl)
+    server = await start_server(service.handle, host, port)
+
+    # El estado del servicio va a stderr; stdout queda para la salida de los nodos
+    print(f"🤖 Agente FAQ de Kualtos escuchando en http://{host}:{port}/faq", file=sys.stderr)
+    print(f"   Respuestas codificadas en memoria: hasta {encoded_cache_size}", file=sys.stderr)
+    if service.answers is not None:
+        print(f"   Cache de preguntas: hasta {answer_cache_size} (TTL {answer_ttl:g} s)", file=sys.stderr)
+    print(f"   Concurrencia máxima: {max_concurrency}", file=sys.stderr)
+
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio HTTP del agente FAQ de Kualtos")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-concurrency", type=int, default=256)
+    parser.add_argument("--encoded-cache", type=int, default=ENCODED_CACHE_SIZE,
+                        help="Respuestas codificadas que se conservan en memoria (LRU)")
+    parser.add_argument("--answer-cache", type=int, default=0,
+                        help="Preguntas normalizadas en cache (faq_cache.py); 0 = apagado")
+    parser.add_argument("--answer-ttl", type=float, default=300.0,
+                        help="Segundos que vive cada entrada del cache de preguntas")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Muestra la salida de cada nodo (reduce el throughput)")
+    args = parser.parse_args()
+
+    if args.verbose:
+        configure_logging("INFO")
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_concurrency, args.encoded_cache,
+                          args.answer_cache, args.answer_ttl))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
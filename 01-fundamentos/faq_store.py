@@ -0,0 +1,236 @@
+"""
+Base de conocimiento FAQ en disco, abierta con mmap.
+El archivo guarda los textos en UTF-8 y un índice compacto de offsets ordenado
+por tema. Abrirlo no lee las respuestas: cada consulta hace una búsqueda binaria
+en el índice y decodifica solo la entrada pedida. Como el mapeo es de solo
+lectura, varios procesos comparten las mismas páginas del cache del sistema.
+
+Formato (little-endian):
+    encabezado  "KFAQSTR1" | count: u64 | index_offset: u64 | reservado: u64
+    datos       por entrada: tema | pregunta | respuesta (UTF-8, contiguos)
+    índice      count registros (offset: u64, len_tema: u32, len_pregunta: u32,
+                len_respuesta: u32), ordenados por tema en bytes
+
+`build` también guarda el índice TF-IDF de la búsqueda por similitud en
+faq.kfaq.tfidf/ (ver faq_retrieval.py), para no construirlo al arrancar.
+
+Uso:
+    python faq_store.py build faq.kfaq                  # Desde FAQ_DATABASE
+    python faq_store.py build grande.kfaq --synthetic 50000
+    python faq_store.py bench grande.kfaq
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import time
+from collections.abc import Mapping
+from typing import Iterator, Mapping as MappingType
+
+MAGIC = b"KFAQSTR1"
+HEADER = struct.Struct("<8sQQQ")
+RECORD = struct.Struct("<QIII")
+
+
+def write_faq_store(path: str, database: MappingType[str, MappingType[str, str]]) -> int:
+    """Escribe la base FAQ en formato de archivo. Retorna el número de entradas."""
+    entries = sorted(
+        (topic.encode("utf-8"), entry["pregunta"].encode("utf-8"), entry["respuesta"].encode("utf-8"))
+        for topic, entry in database.items()
+    )
+
+    index = bytearray()
+    with open(path, "wb") as f:
+        f.write(b"\0" * HEADER.size)
+        offset = HEADER.size
+        for key, question, answer in entries:
+            f.write(key)
+            f.write(question)
+            f.write(answer)
+            index += RECORD.pack(offset, len(key), len(question), len(answer))
+            offset += len(key) + len(question) + len(answer)
+
+        f.write(index)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, len(entries), offset, 0))
+
+    return len(entries)
+
+
+class FAQEntry(Mapping):
+    """Entrada perezosa: decodifica 'pregunta' o 'respuesta' solo al accederlas."""
+
+    __slots__ = ("_store", "_offset", "_key_len", "_question_len", "_answer_len")
+
+    def __init__(self, store, offset, key_len, question_len, answer_len):
+        self._store = store
+        self._offset = offset
+        self._key_len = key_len
+        self._question_len = question_len
+        self._answer_len = answer_len
+
+    def __getitem__(self, field: str) -> str:
+        start = self._offset + self._key_len
+        if field == "pregunta":
+            return self._store._text(start, self._question_len)
+        if field == "respuesta":
+            return self._store._text(start + self._question_len, self._answer_len)
+        raise KeyError(field)
+
+    def __iter__(self):
+        return iter(("pregunta", "respuesta"))
+
+    def __len__(self):
+        return 2
+
+
+class FAQStore(Mapping):
+    """Vista de solo lectura (tema → entrada) sobre un archivo FAQ mapeado en memoria."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # Acceso aleatorio: evita que el kernel lea por adelantado páginas vecinas
+        if hasattr(self._mmap, "madvise"):
+            self._mmap.madvise(mmap.MADV_RANDOM)
+
+        magic, self._count, self._index_offset, _ = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} no es un archivo FAQ válido")
+
+    def _record(self, i: int):
+        return RECORD.unpack_from(self._mmap, self._index_offset + i * RECORD.size)
+
+    def _key(self, i: int) -> bytes:
+        offset, key_len, _, _ = self._record(i)
+        return self._mmap[offset:offset + key_len]
+
+    def _text(self, start: int, length: int) -> str:
+        return self._mmap[start:start + length].decode("utf-8")
+
+    def _find(self, topic: str) -> int:
+        """Búsqueda binaria del tema en el índice. Retorna -1 si no existe."""
+        target = topic.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            if self._key(mid) < target:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self._count and self._key(low) == target:
+            return low
+        return -1
+
+    def __getitem__(self, topic: str) -> FAQEntry:
+        i = self._find(topic) if isinstance(topic, str) else -1
+        if i < 0:
+            raise KeyError(topic)
+        return FAQEntry(self, *self._record(i))
+
+    def __contains__(self, topic) -> bool:
+        return isinstance(topic, str) and self._find(topic) >= 0
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._count):
+            yield self._key(i).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        self._mmap.close()
+
+
+def open_faq_store(path: str) -> FAQStore:
+    """Abre una base FAQ en disco."""
+    return FAQStore(path)
+
+
+def current_rss_kb() -> dict:
+    """
+    Memoria residente del proceso en KB (Linux), separada en privada (RssAnon)
+    y páginas de archivo compartibles entre procesos (RssFile).
+    """
+    rss = {"RssAnon": 0, "RssFile": 0}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in rss:
+                    rss[name] = int(value.split()[0])
+    except OSError:
+        pass
+    return rss
+
+
+def synthetic_database(n: int) -> dict:
+    """Genera n entradas de FAQ de ~1 KB para pruebas de escala."""
+    return {
+        f"tema_{i:07d}": {
+            "pregunta": f"¿Pregunta frecuente número {i}?",
+            "respuesta": f"Respuesta detallada para el tema {i}. " * 25,
+        }
+        for i in range(n)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Base de conocimiento FAQ en disco")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Genera un archivo FAQ")
+    build.add_argument("path")
+    build.add_argument("--synthetic", type=int, default=0,
+                       help="Genera N entradas sintéticas en lugar de usar FAQ_DATABASE")
+
+    bench = sub.add_parser("bench", help="Mide apertura, consulta y memoria")
+    bench.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if args.synthetic:
+            database = synthetic_database(args.synthetic)
+        else:
+            from graph_registry import load_lesson_module
+            database = load_lesson_module("01-fundamentos", "03_intro_kualtos").FAQ_DATABASE
+        count = write_faq_store(args.path, database)
+        size = os.path.getsize(args.path)
+        print(f"✅ {count:,} entradas escritas en {args.path} ({size / 1024:,.1f} KB)")
+
+        from faq_retrieval import FAQRetriever, index_path
+        start = time.perf_counter()
+        FAQRetriever.from_faq(database).save(index_path(args.path))
+        print(f"✅ Índice TF-IDF en {index_path(args.path)} ({time.perf_counter() - start:.1f} s)")
+        return
+
+    rss_before = current_rss_kb()
+    start = time.perf_counter()
+    store = open_faq_store(args.path)
+    open_ms = (time.perf_counter() - start) * 1000
+
+    topics = [store._key(i).decode("utf-8") for i in range(0, len(store), max(1, len(store) // 1000))]
+    start = time.perf_counter()
+    for topic in topics:
+        store[topic]["respuesta"]
+    lookup_us = (time.perf_counter() - start) * 1e6 / len(topics)
+
+    print("=" * 70)
+    print(f"BASE FAQ EN DISCO: {args.path}")
+    print("=" * 70)
+    print(f"Entradas: {len(store):,}")
+    print(f"Apertura: {open_ms:.3f} ms")
+    print(f"Consulta (búsqueda + decodificación): {lookup_us:.2f} µs")
+    rss_after = current_rss_kb()
+    print(f"RSS privada adicional tras {len(topics):,} consultas: "
+          f"{rss_after['RssAnon'] - rss_before['RssAnon']:,} KB")
+    print(f"Páginas del archivo (compartidas entre procesos): "
+          f"{rss_after['RssFile'] - rss_before['RssFile']:,} KB")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
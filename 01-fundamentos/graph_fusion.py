@@ -0,0 +1,226 @@
+"""
+Optimizador de grafos: fusión de cadenas lineales y eliminación de nodos no-op.
+Cada nodo de LangGraph paga un superstep completo (tareas, escritura de canales,
+checkpoint de versiones) aunque solo concatene texto o retorne {}. Esta pasada
+reescribe un StateGraph antes de compilarlo:
+
+- Elimina los nodos declarados como no-op (metadata={"no_op": True} o por nombre):
+  sus edges de entrada se redirigen al siguiente nodo, o sus edges condicionales
+  pasan al nodo anterior (el ruteo ve el mismo estado porque el nodo no lo cambia).
+- Fusiona secuencias A → B → C sin bifurcaciones en un solo nodo que ejecuta las
+  funciones en orden, aplicando cada actualización antes de llamar a la siguiente.
+  El nodo fusionado conserva los edges y ruteos de salida del último de la cadena.
+
+Solo se fusionan nodos síncronos simples (sin retry, cache, timeout ni config)
+en grafos cuyos canales son de último valor: con reducers (ej: add_messages) la
+composición de actualizaciones no es equivalente en general y esos grafos se
+dejan sin fusionar.
+
+Uso:
+    graph = create_graph(optimizer=optimize_graph)
+    graph = create_graph(optimizer=functools.partial(optimize_graph, no_op={"validate"}))
+"""
+
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from langgraph.channels.last_value import LastValue
+from langgraph.graph import END, StateGraph
+
+logger = logging.getLogger("kualtos.fusion")
+
+
+def is_no_op(spec) -> bool:
+    return bool((spec.metadata or {}).get("no_op"))
+
+
+def node_function(spec, state_schema) -> Optional[Callable]:
+    """Función síncrona del nodo si se puede llamar directamente; None si no."""
+    runnable = spec.runnable
+    func = getattr(runnable, "func", None)
+    if (func is None or getattr(runnable, "func_accepts", None)
+            or spec.input_schema not in (None, state_schema)
+            or spec.retry_policy or spec.cache_policy or spec.ends or spec.defer
+            or getattr(spec, "timeout", None) or getattr(spec, "error_handler_node", None)):
+        return None
+    return func
+
+
+def fuse_functions(functions: List[Callable]) -> Callable:
+    """Ejecuta las funciones en orden; cada una ve el estado con las actualizaciones previas."""
+    def fused(state):
+        update = {}
+        for fn in functions:
+            result = fn({**state, **update} if update else state)
+            if result:
+                update.update(result)
+        return update
+    return fused
+
+
+class _GraphModel:
+    """Vista editable de la topología de un StateGraph (edges, ruteos, nodos)."""
+
+    def __init__(self, workflow: StateGraph):
+        self.nodes = dict(workflow.nodes)
+        self.edges: Dict[str, List[str]] = defaultdict(list)
+        for start, end in sorted(workflow.edges):
+            self.edges[start].append(end)
+        self.branches = {source: dict(specs) for source, specs in workflow.branches.items() if specs}
+        # Funciones (posiblemente ya fusionadas) por nodo
+        self.functions: Dict[str, List[Callable]] = {}
+        self.names: Dict[str, List[str]] = {name: [name] for name in self.nodes}
+
+    def predecessors(self, node: str) -> List[str]:
+        return [start for start, ends in self.edges.items() if node in ends]
+
+    def branch_targets(self, node: str) -> bool:
+        """True si algún ruteo condicional puede llegar a `node` (o no declara destinos)."""
+        for specs in self.branches.values():
+            for branch in specs.values():
+                if branch.ends is None or node in branch.ends.values():
+                    return True
+        return False
+
+    def retarget_branches(self, old: str, new: str) -> bool:
+        """Cambia el destino `old` por `new` en todos los ruteos. False si no es posible."""
+        for specs in self.branches.values():
+            for branch in specs.values():
+                if branch.ends is None:
+                    return False
+        for source, specs in self.branches.items():
+            for name, branch in specs.items():
+                if old in branch.ends.values():
+                    specs[name] = branch._replace(
+                        ends={key: new if value == old else value for key, value in branch.ends.items()}
+                    )
+        return True
+
+    def remove(self, node: str) -> None:
+        del self.nodes[node]
+        self.edges.pop(node, None)
+        self.branches.pop(node, None)
+        self.names.pop(node, None)
+        self.functions.pop(node, None)
+
+
+def elide_no_op_nodes(model: _GraphModel, no_op: Iterable[str]) -> List[str]:
+    """Quita los nodos no-op que se pueden saltar sin cambiar el flujo. Retorna los eliminados."""
+    candidates = set(no_op) | {name for name, spec in model.nodes.items() if is_no_op(spec)}
+    removed = []
+    changed = True
+    while changed:
+        changed = False
+        for node in sorted(candidates & set(model.nodes)):
+            outs = model.edges.get(node, [])
+            branches = model.branches.get(node, {})
+            preds = model.predecessors(node)
+
+            if len(outs) == 1 and not branches:
+                # Nodo intermedio: los edges de entrada saltan directo al siguiente
+                target = outs[0]
+                if target == node or not model.retarget_branches(node, target):
+                    continue
+                for pred in preds:
+                    model.edges[pred] = [target if end == node else end for end in model.edges[pred]]
+            elif not outs and branches and len(preds) == 1 and not model.branch_targets(node):
+                # Nodo con ruteo: el ruteo pasa al nodo anterior (START incluido)
+                pred = preds[0]
+                if model.edges[pred] != [node] or model.branches.get(pred):
+                    continue
+                del model.edges[pred]
+                model.branches[pred] = branches
+            else:
+                continue
+
+            model.remove(node)
+            removed.append(node)
+            changed = True
+    return removed
+
+
+def fuse_linear_chains(model: _GraphModel, state_schema) -> List[List[str]]:
+    """Fusiona pares A → B mientras B tenga a A como única entrada. Retorna las cadenas."""
+    for name, spec in model.nodes.items():
+        func = node_function(spec, state_schema)
+        if func is not None:
+            model.functions[name] = [func]
+
+    changed = True
+    while changed:
+        changed = False
+        for first in list(model.nodes):
+            outs = model.edges.get(first, [])
+            if first not in model.functions or len(outs) != 1 or model.branches.get(first):
+                continue
+            second = outs[0]
+            if (second == END or second == first or second not in model.functions
+                    or model.predecessors(second) != [first] or model.branch_targets(second)):
+                continue
+
+            fused_name = f"{first}+{second}"
+            functions = model.functions[first] + model.functions[second]
+            names = model.names[first] + model.names[second]
+            edges = model.edges.get(second, [])
+            branches = model.branches.get(second, {})
+            preds = model.predecessors(first)
+            if not model.retarget_branches(first, fused_name):
+                continue
+
+            model.remove(first)
+            model.remove(second)
+            model.nodes[fused_name] = None
+            model.functions[fused_name] = functions
+            model.names[fused_name] = names
+            if edges:
+                model.edges[fused_name] = list(edges)
+            if branches:
+                model.branches[fused_name] = branches
+            for pred in preds:
+                model.edges[pred] = [fused_name if end == first else end for end in model.edges[pred]]
+            changed = True
+            break
+    return [names for names in model.names.values() if len(names) > 1]
+
+
+def optimize_graph(workflow: StateGraph, no_op: Iterable[str] = (), elide: bool = True,
+                   fuse: bool = True) -> StateGraph:
+    """
+    Retorna un StateGraph nuevo (sin compilar) con los no-op eliminados y las
+    cadenas lineales fusionadas. El grafo original no se modifica.
+    """
+    if workflow.waiting_edges:
+        logger.debug("Grafo con edges de espera (fan-in): se deja sin optimizar")
+        return workflow
+
+    state_schema = workflow.state_schema
+    model = _GraphModel(workflow)
+    removed = elide_no_op_nodes(model, no_op) if elide else []
+
+    chains = []
+    if fuse and all(isinstance(channel, LastValue) for channel in workflow.channels.values()):
+        chains = fuse_linear_chains(model, state_schema)
+
+    optimized = StateGraph(state_schema, context_schema=workflow.context_schema,
+                           input_schema=workflow.input_schema, output_schema=workflow.output_schema)
+    for name, spec in model.nodes.items():
+        if spec is not None and len(model.names[name]) == 1:
+            # Nodo sin cambios: se reutiliza su especificación tal cual
+            if spec.input_schema is not None:
+                optimized._add_schema(spec.input_schema)
+            optimized.nodes[name] = spec
+        else:
+            optimized.add_node(name, fuse_functions(model.functions[name]),
+                               metadata={"fused": model.names[name]})
+    for start, ends in model.edges.items():
+        for end in ends:
+            optimized.add_edge(start, end)
+    for source, specs in model.branches.items():
+        for branch in specs.values():
+            if branch.input_schema is not None:
+                optimized._add_schema(branch.input_schema)
+        optimized.branches[source].update(specs)
+
+    logger.info("Optimización: eliminados %s, fusionados %s", removed or "-", chains or "-")
+    return optimized
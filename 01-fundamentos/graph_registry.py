@@ -0,0 +1,94 @@
+"""
+Registro de grafos compilados - Compila cada grafo una sola vez por proceso.
+Evita reconstruir y recompilar el StateGraph en cada solicitud.
+"""
+
+import importlib
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+COURSE_ROOT = Path(__file__).resolve().parent.parent
+
+# Grafos del curso que se pueden cargar bajo demanda: nombre -> (carpeta, módulo, fábrica)
+COURSE_GRAPHS: Dict[str, Tuple[str, str, str]] = {
+    "hello": ("00-lab-setup", "hello_langgraph", "create_graph"),
+    "conversation": ("01-fundamentos", "01_state_basico", "create_graph"),
+    "loan": ("01-fundamentos", "02_nodos_y_edges", "create_graph"),
+    "faq_agent": ("01-fundamentos", "03_intro_kualtos", "create_faq_agent"),
+}
+
+
+def load_lesson_module(folder: str, module_name: str):
+    """Importa un módulo de lección (ej: '02_nodos_y_edges') desde su carpeta."""
+    path = str(COURSE_ROOT / folder)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return importlib.import_module(module_name)
+
+
+class GraphRegistry:
+    """Registro thread-safe que compila cada grafo de forma perezosa y una sola vez."""
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._compiled: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """Registra la fábrica de un grafo. Si cambia, descarta la versión compilada."""
+        with self._lock:
+            if self._factories.get(name) is not factory:
+                self._factories[name] = factory
+                self._compiled.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """Retorna el grafo compilado compartido, compilándolo la primera vez."""
+        graph = self._compiled.get(name)
+        if graph is not None:
+            return graph
+
+        with self._lock:
+            # Otro hilo pudo compilarlo mientras esperábamos el lock
+            graph = self._compiled.get(name)
+            if graph is None:
+                graph = self._resolve_factory(name)()
+                self._compiled[name] = graph
+            return graph
+
+    def clear(self, name: Optional[str] = None) -> None:
+        """Descarta grafos compilados (todos o uno) para forzar recompilación."""
+        with self._lock:
+            if name is None:
+                self._compiled.clear()
+            else:
+                self._compiled.pop(name, None)
+
+    def _resolve_factory(self, name: str) -> Callable[[], Any]:
+        factory = self._factories.get(name)
+        if factory is not None:
+            return factory
+        if name not in COURSE_GRAPHS:
+            raise KeyError(f"Grafo no registrado: {name}")
+
+        folder, module_name, factory_name = COURSE_GRAPHS[name]
+        module = load_lesson_module(folder, module_name)
+        # El módulo pudo registrarse al importarse; si no, usamos su fábrica
+        factory = self._factories.get(name) or getattr(module, factory_name)
+        self._factories[name] = factory
+        return factory
+
+
+# Registro global del proceso
+REGISTRY = GraphRegistry()
+
+
+def register_graph(name: str, factory: Callable[[], Any]) -> None:
+    """Registra una fábrica en el registro global."""
+    REGISTRY.register(name, factory)
+
+
+def get_graph(name: str) -> Any:
+    """Obtiene el grafo compilado compartido del registro global."""
+    return REGISTRY.get(name)
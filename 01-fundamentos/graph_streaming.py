@@ -0,0 +1,94 @@
+"""
+Ejecución en streaming de los grafos de la lección.
+En lugar de esperar a que graph.invoke retorne el estado final, emite un evento
+por cada nodo en cuanto termina (ej: "tema identificado" y después la respuesta),
+y puede partir textos largos como `response` en fragmentos.
+Funciona tanto para consumidores síncronos como asíncronos.
+"""
+
+from typing import AsyncIterator, Iterable, Iterator, Optional
+
+from graph_registry import get_graph
+
+# Campos de texto que se emiten en fragmentos cuando son largos
+TEXT_FIELDS = ("response",)
+
+
+def _node_events(node: str, update: Optional[dict], chunk_size: Optional[int],
+                 text_fields: Iterable[str]) -> Iterator[dict]:
+    """
+    Convierte la actualización de un nodo en eventos. Los textos largos no van en
+    el evento del nodo: se emiten después como fragmentos de chunk_size caracteres.
+    """
+    update = update or {}
+    long_fields = [
+        field for field in text_fields
+        if chunk_size and isinstance(update.get(field), str) and len(update[field]) > chunk_size
+    ]
+    if long_fields:
+        yield {"type": "node", "node": node,
+               "update": {k: v for k, v in update.items() if k not in long_fields}}
+    else:
+        yield {"type": "node", "node": node, "update": update}
+
+    for field in long_fields:
+        text = update[field]
+        for start in range(0, len(text), chunk_size):
+            yield {"type": "chunk", "node": node, "field": field,
+                   "text": text[start:start + chunk_size]}
+
+
+def stream_updates(graph, state: dict, chunk_size: Optional[int] = None,
+                   text_fields: Iterable[str] = TEXT_FIELDS) -> Iterator[dict]:
+    """
+    Ejecuta el grafo y produce eventos a medida que cada nodo termina:
+        {"type": "node", "node": "classify", "update": {...}}
+        {"type": "chunk", "node": "retrieve", "field": "response", "text": "..."}
+    """
+    for step in graph.stream(state, stream_mode="updates"):
+        for node, update in step.items():
+            yield from _node_events(node, update, chunk_size, text_fields)
+
+
+async def astream_updates(graph, state: dict, chunk_size: Optional[int] = None,
+                          text_fields: Iterable[str] = TEXT_FIELDS) -> AsyncIterator[dict]:
+    """Versión asíncrona de stream_updates (usa graph.astream)."""
+    async for step in graph.astream(state, stream_mode="updates"):
+        for node, update in step.items():
+            for event in _node_events(node, update, chunk_size, text_fields):
+                yield event
+
+
+def faq_initial_state(query: str) -> dict:
+    return {"user_query": query, "identified_topic": "", "response": "", "found_answer": False}
+
+
+def loan_initial_state(name: str, amount: float, score: int, employment: str) -> dict:
+    return {
+        "applicant_name": name,
+        "requested_amount": amount,
+        "credit_score": score,
+        "employment_status": employment,
+        "decision": "",
+        "reason": "",
+    }
+
+
+def stream_faq(query: str, chunk_size: Optional[int] = 80) -> Iterator[dict]:
+    """Streaming del agente FAQ compartido."""
+    return stream_updates(get_graph("faq_agent"), faq_initial_state(query), chunk_size)
+
+
+def astream_faq(query: str, chunk_size: Optional[int] = 80) -> AsyncIterator[dict]:
+    """Streaming asíncrono del agente FAQ compartido."""
+    return astream_updates(get_graph("faq_agent"), faq_initial_state(query), chunk_size)
+
+
+def stream_loan(name: str, amount: float, score: int, employment: str) -> Iterator[dict]:
+    """Streaming del grafo de préstamos compartido."""
+    return stream_updates(get_graph("loan"), loan_initial_state(name, amount, score, employment))
+
+
+def astream_loan(name: str, amount: float, score: int, employment: str) -> AsyncIterator[dict]:
+    """Streaming asíncrono del grafo de préstamos compartido."""
+    return astream_updates(get_graph("loan"), loan_initial_state(name, amount, score, employment))
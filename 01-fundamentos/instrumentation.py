@@ -0,0 +1,221 @@
+"""
+Instrumentación por nodo para los grafos de la lección.
+- Logging por niveles: los nodos usan loggers "kualtos.*" que no cuestan nada
+  (más allá de revisar el nivel) mientras el logging esté desactivado.
+- Métricas: tiempo de pared por nodo en histogramas de latencia, conteo de
+  llamadas y errores, decisiones de ruteo y tamaño del estado recibido.
+- Exportación del resumen en texto o JSON bajo demanda.
+
+Uso:
+    metrics = Instrumentation()
+    graph = create_faq_agent(instrumentation=metrics)
+    graph.invoke(...)
+    print(metrics.to_text())
+
+    python instrumentation.py [--json]   # Demo con los grafos de la lección
+"""
+
+import argparse
+import functools
+import inspect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Optional
+
+from langgraph.graph import StateGraph
+
+from graph_registry import load_lesson_module
+from latency_histogram import LatencyHistogram
+
+LOG_FORMAT = "%(message)s"
+
+
+def configure_logging(level: Optional[str] = None) -> None:
+    """
+    Activa la salida de los nodos (loggers "kualtos.*") en stdout.
+    El nivel viene del argumento o de la variable LOG_LEVEL (INFO por defecto).
+    """
+    logger = logging.getLogger("kualtos")
+    logger.setLevel((level or os.getenv("LOG_LEVEL", "INFO")).upper())
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        logger.addHandler(handler)
+    logger.propagate = False
+
+
+def approximate_size(state: Any) -> int:
+    """Tamaño aproximado del estado en bytes (superficial: contenedor + valores)."""
+    if isinstance(state, dict):
+        return sys.getsizeof(state) + sum(sys.getsizeof(v) for v in state.values())
+    return sys.getsizeof(state)
+
+
+class NodeMetrics:
+    """Métricas acumuladas de un nodo."""
+
+    __slots__ = ("calls", "errors", "latency", "state_bytes")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()      # nanosegundos
+        self.state_bytes = LatencyHistogram()  # bytes del estado de entrada
+
+
+class Instrumentation:
+    """Recolector de métricas que se conecta a las fábricas de grafos."""
+
+    def __init__(self, record_state_size: bool = True):
+        self.record_state_size = record_state_size
+        self.nodes: Dict[str, NodeMetrics] = {}
+        self.routes: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def state_graph(self, state_schema, **kwargs) -> StateGraph:
+        """Crea un StateGraph cuyos nodos y ruteos quedan instrumentados."""
+        return InstrumentedStateGraph(state_schema, self, **kwargs)
+
+    def _record(self, name: str, elapsed_ns: int, state: Any, failed: bool) -> None:
+        size = approximate_size(state) if self.record_state_size else 0
+        with self._lock:
+            metrics = self.nodes.get(name)
+            if metrics is None:
+                metrics = self.nodes[name] = NodeMetrics()
+            metrics.calls += 1
+            metrics.errors += failed
+            metrics.latency.record(elapsed_ns)
+            if self.record_state_size:
+                metrics.state_bytes.record(size)
+
+    def wrap_node(self, name: str, fn: Callable) -> Callable:
+        """Envuelve un nodo para medir su tiempo de pared."""
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(state, *args, **kwargs):
+                start = time.perf_counter_ns()
+                failed = True
+                try:
+                    result = await fn(state, *args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    self._record(name, time.perf_counter_ns() - start, state, failed)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(state, *args, **kwargs):
+            start = time.perf_counter_ns()
+            failed = True
+            try:
+                result = fn(state, *args, **kwargs)
+                failed = False
+                return result
+            finally:
+                self._record(name, time.perf_counter_ns() - start, state, failed)
+        return wrapper
+
+    def wrap_router(self, source: str, fn: Callable) -> Callable:
+        """Envuelve una función de ruteo para contar sus decisiones."""
+        @functools.wraps(fn)
+        def router(state, *args, **kwargs):
+            decision = fn(state, *args, **kwargs)
+            with self._lock:
+                self.routes.setdefault(source, Counter())[str(decision)] += 1
+            return decision
+        return router
+
+    def reset(self) -> None:
+        with self._lock:
+            self.nodes.clear()
+            self.routes.clear()
+
+    def summary(self) -> dict:
+        """Resumen de métricas (latencias en µs, tamaños en bytes)."""
+        with self._lock:
+            return {
+                "nodes": {
+                    name: {
+                        "calls": m.calls,
+                        "errors": m.errors,
+                        "latency_us": m.latency.summary(scale=1e3),
+                        "state_bytes": m.state_bytes.summary(percentiles=(50, 99)),
+                    }
+                    for name, m in self.nodes.items()
+                },
+                "routes": {source: dict(counts) for source, counts in self.routes.items()},
+            }
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.summary(), indent=indent, ensure_ascii=False)
+
+    def to_text(self) -> str:
+        data = self.summary()
+        lines = [
+            f"{'Nodo':<16}{'Llamadas':>10}{'Errores':>9}{'p50 µs':>10}{'p99 µs':>10}"
+            f"{'máx µs':>10}{'Estado B':>10}",
+            "-" * 75,
+        ]
+        for name, node in data["nodes"].items():
+            latency = node["latency_us"]
+            lines.append(
+                f"{name:<16}{node['calls']:>10,}{node['errors']:>9,}{latency['p50']:>10.1f}"
+                f"{latency['p99']:>10.1f}{latency['max']:>10.1f}{node['state_bytes']['p50']:>10,.0f}"
+            )
+        for source, counts in data["routes"].items():
+            decisions = ", ".join(f"{route}={count:,}" for route, count in counts.items())
+            lines.append(f"Ruteo desde {source}: {decisions}")
+        return "\n".join(lines)
+
+
+class InstrumentedStateGraph(StateGraph):
+    """StateGraph que envuelve cada nodo y cada función de ruteo al agregarlos."""
+
+    def __init__(self, state_schema, instrumentation: Instrumentation, **kwargs):
+        super().__init__(state_schema, **kwargs)
+        self.instrumentation = instrumentation
+
+    def add_node(self, node, action=None, **kwargs):
+        if isinstance(node, str) and callable(action):
+            action = self.instrumentation.wrap_node(node, action)
+        return super().add_node(node, action, **kwargs)
+
+    def add_conditional_edges(self, source, path, path_map=None, **kwargs):
+        return super().add_conditional_edges(
+            source, self.instrumentation.wrap_router(source, path), path_map, **kwargs
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Métricas por nodo de los grafos de la lección")
+    parser.add_argument("--json", action="store_true", help="Exporta el resumen en JSON")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    loans = load_lesson_module("01-fundamentos", "02_nodos_y_edges")
+    kualtos = load_lesson_module("01-fundamentos", "03_intro_kualtos")
+
+    metrics = Instrumentation()
+    loan_graph = loans.create_graph(instrumentation=metrics)
+    faq_graph = kualtos.create_faq_agent(instrumentation=metrics)
+
+    cases = [(750, "empleado"), (550, "empleado"), (650, "empleado"), (720, "desempleado")]
+    for _ in range(args.rounds):
+        for score, employment in cases:
+            loan_graph.invoke({"applicant_name": "Demo", "requested_amount": 10000.0,
+                               "credit_score": score, "employment_status": employment,
+                               "decision": "", "reason": ""})
+        for query in kualtos.TEST_QUERIES:
+            faq_graph.invoke({"user_query": query, "identified_topic": "",
+                              "response": "", "found_answer": False})
+
+    print(metrics.to_json() if args.json else metrics.to_text())
+
+
+if __name__ == "__main__":
+    main()
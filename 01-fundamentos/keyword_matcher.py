@@ -0,0 +1,93 @@
+"""
+Clasificador de palabras clave multi-patrón (autómata Aho-Corasick).
+Encuentra todas las palabras clave de todos los temas en una sola pasada sobre
+la pregunta, sin importar cuántas palabras clave existan.
+"""
+
+import unicodedata
+from typing import Dict, Iterable, List
+
+
+def _build_accent_table() -> Dict[int, str]:
+    """Tabla de traducción que quita acentos (á→a, ü→u) pero conserva la ñ."""
+    table = {}
+    for code in range(0xC0, 0x250):
+        char = chr(code)
+        if char in "ñÑ":
+            continue
+        base = "".join(c for c in unicodedata.normalize("NFD", char)
+                       if not unicodedata.combining(c))
+        if len(base) == 1 and base != char:
+            table[code] = base
+    return table
+
+
+_ACCENT_TABLE = _build_accent_table()
+
+
+def normalize_text(text: str) -> str:
+    """Convierte a minúsculas y quita acentos para que 'interes' coincida con 'interés'."""
+    return text.lower().translate(_ACCENT_TABLE)
+
+
+class KeywordMatcher:
+    """
+    Autómata Aho-Corasick construido a partir de una tabla tema → palabras clave.
+    El orden de la tabla define la prioridad: si una pregunta contiene palabras de
+    varios temas, gana el que aparece primero en la tabla.
+    """
+
+    def __init__(self, keywords: Dict[str, Iterable[str]], default: str = "desconocido"):
+        self.topics: List[str] = list(keywords)
+        self.default = default
+        no_match = len(self.topics)
+
+        # Trie: transiciones por nodo y mejor prioridad (índice de tema) de cada nodo
+        self._goto: List[Dict[str, int]] = [{}]
+        self._best: List[int] = [no_match]
+
+        for priority, topic in enumerate(self.topics):
+            for word in keywords[topic]:
+                node = 0
+                for char in normalize_text(word):
+                    next_node = self._goto[node].get(char)
+                    if next_node is None:
+                        next_node = len(self._goto)
+                        self._goto[node][char] = next_node
+                        self._goto.append({})
+                        self._best.append(no_match)
+                    node = next_node
+                self._best[node] = min(self._best[node], priority)
+
+        self._build_failure_links()
+
+    def _build_failure_links(self) -> None:
+        """Calcula los enlaces de falla (BFS) y propaga la mejor prioridad por ellos."""
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+
+        for node in queue:
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._best[child] = min(self._best[child], self._best[self._fail[child]])
+                queue.append(child)
+
+    def classify(self, text: str) -> str:
+        """Retorna el tema de mayor prioridad presente en el texto (una sola pasada)."""
+        goto, fail, best_at = self._goto, self._fail, self._best
+        best = len(self.topics)
+        node = 0
+
+        for char in normalize_text(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if best_at[node] < best:
+                best = best_at[node]
+                if best == 0:
+                    break  # Ningún tema puede superar al de mayor prioridad
+
+        return self.topics[best] if best < len(self.topics) else self.default
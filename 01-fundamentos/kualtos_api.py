@@ -0,0 +1,161 @@
+"""
+Cliente asíncrono de la API de Kualtos (buró de crédito).
+- Un solo httpx.AsyncClient con pool de conexiones y keep-alive: las llamadas
+  reutilizan conexiones abiertas en vez de abrir una por solicitud.
+- Agrupación: las consultas que llegan dentro de una ventana corta (batch_delay)
+  se envían juntas a POST /bureau/batch, hasta batch_size por lote.
+- Reintentos con backoff exponencial y jitter ante errores de red, 429 y 5xx
+  (respeta Retry-After).
+
+La URL y la API key vienen de KUALTOS_API_URL / KUALTOS_API_KEY (.env.example).
+
+Uso:
+    async with KualtosClient() as client:
+        report = await client.credit_report("Juan Pérez")
+
+    graph = loans.create_graph(bureau_client=client)   # Nodo "bureau" asíncrono
+    await graph.ainvoke(...)
+"""
+
+import asyncio
+import os
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import httpx
+
+DEFAULT_API_URL = "http://localhost:8000"
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class KualtosAPIError(Exception):
+    """Error de la API de Kualtos (después de agotar los reintentos)."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class KualtosClient:
+    """Cliente con pool de conexiones, agrupación de consultas y reintentos."""
+
+    def __init__(self, base_url: str = None, api_key: str = None, max_connections: int = 20,
+                 timeout: float = 5.0, retries: int = 3, backoff: float = 0.05,
+                 batch_size: int = 50, batch_delay: float = 0.002,
+                 transport: httpx.AsyncBaseTransport = None):
+        self.base_url = base_url or os.getenv("KUALTOS_API_URL", DEFAULT_API_URL)
+        api_key = api_key or os.getenv("KUALTOS_API_KEY")
+        self.retries = retries
+        self.backoff = backoff
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.stats = {"requests": 0, "retries": 0, "batches": 0}
+
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"X-API-Key": api_key} if api_key else None,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._inflight: set = set()
+
+    async def __aenter__(self) -> "KualtosClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        self._flush()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        await self._client.aclose()
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None and response.headers.get("retry-after"):
+            try:
+                return float(response.headers["retry-after"])
+            except ValueError:
+                pass
+        return self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    async def request(self, method: str, path: str, **kwargs) -> dict:
+        """Envía una solicitud con reintentos y retorna el JSON de la respuesta."""
+        for attempt in range(self.retries + 1):
+            response = None
+            self.stats["requests"] += 1
+            try:
+                response = await self._client.request(method, path, **kwargs)
+            except httpx.TransportError as e:
+                if attempt == self.retries:
+                    raise KualtosAPIError(f"{method} {path}: {e!r}") from e
+            else:
+                if response.status_code < 400:
+                    return response.json()
+                if response.status_code not in RETRY_STATUS or attempt == self.retries:
+                    raise KualtosAPIError(
+                        f"{method} {path}: HTTP {response.status_code} {response.text[:200]}",
+                        response.status_code,
+                    )
+            self.stats["retries"] += 1
+            await asyncio.sleep(self._retry_delay(attempt, response))
+
+    async def credit_report(self, applicant_id: str) -> dict:
+        """Reporte de buró de un solicitante (agrupado con otras consultas concurrentes)."""
+        if self.batch_size <= 1:
+            return await self.request("GET", f"/bureau/{quote(applicant_id, safe='')}")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((applicant_id, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_delay, self._flush)
+        return await future
+
+    async def credit_reports(self, applicant_ids: List[str]) -> Dict[str, dict]:
+        """Reportes de varios solicitantes, en lotes de batch_size."""
+        reports = await asyncio.gather(*(self.credit_report(i) for i in applicant_ids))
+        return dict(zip(applicant_ids, reports))
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._send_batch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _send_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        self.stats["batches"] += 1
+        ids = list(dict.fromkeys(applicant_id for applicant_id, _ in batch))
+        try:
+            reports = (await self.request("POST", "/bureau/batch", json={"applicant_ids": ids}))["reports"]
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for applicant_id, future in batch:
+            if future.done():
+                continue
+            if applicant_id in reports:
+                future.set_result(reports[applicant_id])
+            else:
+                future.set_exception(KualtosAPIError(f"Sin reporte para {applicant_id!r}"))
+
+
+def make_bureau_node(client: KualtosClient) -> Callable:
+    """Nodo asíncrono que reemplaza credit_score con el score del buró."""
+    async def fetch_bureau_data(state) -> dict:
+        report = await client.credit_report(state["applicant_name"])
+        return {"credit_score": report["score"]}
+    return fetch_bureau_data
@@ -0,0 +1,112 @@
+"""
+Servidor simulado de la API de Kualtos (buró de crédito) para desarrollo y pruebas.
+Corre sobre async_http (keep-alive, sin dependencias) y responde con datos
+deterministas por solicitante. Puede simular latencia y fallas para probar
+reintentos del cliente.
+
+Endpoints:
+    GET  /health
+    GET  /bureau/{applicant_id}      → reporte de un solicitante
+    POST /bureau/batch               → {"applicant_ids": [...]} → {"reports": {id: reporte}}
+
+Uso:
+    python kualtos_mock_server.py [--port 8000] [--latency-ms 5] [--fail-rate 0.05]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import zlib
+from urllib.parse import unquote
+
+from async_http import Request, build_response, start_server
+
+MAX_BATCH = 1000
+
+
+def bureau_report(applicant_id: str) -> dict:
+    """Reporte determinista: el mismo solicitante siempre recibe el mismo score."""
+    seed = zlib.crc32(applicant_id.encode("utf-8"))
+    return {
+        "applicant_id": applicant_id,
+        "score": 300 + seed % 551,
+        "open_accounts": seed % 7,
+        "delinquencies": (seed >> 8) % 3,
+    }
+
+
+def json_response(status: int, payload: dict) -> bytes:
+    return build_response(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+
+class MockBureau:
+    """Handler del servidor simulado."""
+
+    def __init__(self, api_key: str = None, latency_ms: float = 0.0, fail_rate: float = 0.0):
+        self.api_key = api_key
+        self.latency = latency_ms / 1000
+        self.fail_rate = fail_rate
+        self.requests = 0
+
+    async def handle(self, request: Request) -> bytes:
+        self.requests += 1
+        if request.path == "/health":
+            return json_response(200, {"status": "ok", "requests": self.requests})
+
+        if self.api_key and request.headers.get("x-api-key") != self.api_key:
+            return json_response(401, {"error": "API key inválida"})
+        if self.fail_rate and random.random() < self.fail_rate:
+            return json_response(503, {"error": "Servicio no disponible"})
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if request.path == "/bureau/batch":
+            if request.method != "POST":
+                return json_response(405, {"error": "Usa POST"})
+            try:
+                ids = json.loads(request.body)["applicant_ids"]
+            except (ValueError, KeyError, TypeError):
+                return json_response(400, {"error": "Se esperaba {'applicant_ids': [...]}"})
+            if len(ids) > MAX_BATCH:
+                return json_response(413, {"error": f"Máximo {MAX_BATCH} solicitantes por lote"})
+            return json_response(200, {"reports": {str(i): bureau_report(str(i)) for i in ids}})
+
+        if request.path.startswith("/bureau/") and request.method == "GET":
+            return json_response(200, bureau_report(unquote(request.path[len("/bureau/"):])))
+
+        return json_response(404, {"error": "Ruta no encontrada"})
+
+
+async def serve(host: str, port: int, bureau: MockBureau) -> None:
+    server = await start_server(bureau.handle, host, port)
+    print(f"🏦 API simulada de Kualtos en http://{host}:{port} "
+          f"(latencia {bureau.latency * 1000:.0f} ms, fallas {bureau.fail_rate:.0%})",
+          file=sys.stderr, flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API simulada de Kualtos")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=float, default=5.0,
+                        help="Latencia simulada por solicitud")
+    parser.add_argument("--fail-rate", type=float, default=0.0,
+                        help="Fracción de solicitudes que responden 503")
+    parser.add_argument("--api-key", default=os.getenv("KUALTOS_API_KEY"),
+                        help="Si se define, exige el encabezado X-API-Key")
+    args = parser.parse_args()
+
+    bureau = MockBureau(args.api_key, args.latency_ms, args.fail_rate)
+    try:
+        asyncio.run(serve(args.host, args.port, bureau))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""
+Generador de carga de lazo abierto para los grafos FAQ y de préstamos.
+Un bucle cerrado (invocar, esperar, invocar otra vez) deja de enviar trabajo
+justo cuando el sistema se atora, así que nunca mide la cola que se forma
+("coordinated omission"). Aquí las llegadas siguen un horario fijo
+(--rate por segundo) sin importar si las respuestas anteriores terminaron, y
+cada latencia se mide desde la llegada programada:
+
+- servicio: desde que la solicitud empieza a ejecutarse (lo que ve un bucle cerrado).
+- respuesta: desde su llegada programada; incluye la espera en cola (corregida).
+
+Los histogramas son LatencyHistogram (log-lineal, estilo HDR). Con --saturate
+se duplica la tasa por escalones hasta que el sistema no la sostiene, y se
+reporta el throughput de saturación por núcleo (solicitudes por segundo de CPU).
+
+Destinos:
+- En proceso: graph.invoke de los grafos compilados con --workers hilos. La CPU
+  por núcleo es la de esos hilos (y los que abra LangGraph), sin el hilo que
+  programa las llegadas.
+- HTTP: faq_server.py (--http host:port, o --spawn para arrancarlo aquí y medir
+  también su CPU). No hay servicio HTTP de préstamos.
+
+Las preguntas vienen de TEST_QUERIES y las solicitudes de DEMO_APPLICATIONS.
+Como faq_server coalesce preguntas idénticas en vuelo, a cada pregunta se le
+agrega un número distinto (--same-queries lo desactiva).
+
+Uso:
+    python load_generator.py faq --rate 300 --duration 10
+    python load_generator.py loan --rate 300 --workers 4 --saturate
+    python load_generator.py faq --spawn --rate 500 --saturate
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import quote
+
+from faq_load import read_response
+from graph_registry import get_graph, load_lesson_module
+from latency_histogram import LatencyHistogram
+
+PERCENTILES = (50, 90, 99, 99.9, 99.99)
+
+# (llegada programada, inicio, fin, ok) en segundos de perf_counter
+Sample = Tuple[float, float, float, bool]
+
+
+class LoadResult:
+    """Resultado de un escalón de carga a tasa fija."""
+
+    def __init__(self, rate: float, samples: List[Sample], elapsed: float,
+                 cpu_seconds: Optional[float]):
+        self.rate = rate
+        self.elapsed = elapsed
+        self.cpu_seconds = cpu_seconds
+        self.service = LatencyHistogram()
+        self.response = LatencyHistogram()
+        self.errors = 0
+        for intended, started, finished, ok in samples:
+            self.service.record((finished - started) * 1e9)
+            self.response.record((finished - intended) * 1e9)
+            self.errors += not ok
+        self.completed = len(samples)
+
+    @property
+    def throughput(self) -> float:
+        return self.completed / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def per_core(self) -> Optional[float]:
+        """Solicitudes por segundo de CPU consumido (None si no se midió la CPU)."""
+        if not self.cpu_seconds:
+            return None
+        return self.completed / self.cpu_seconds
+
+
+def schedule(rate: float, duration: float) -> List[float]:
+    """Tiempos de llegada relativos (segundos) a tasa constante."""
+    interval = 1.0 / rate
+    return [i * interval for i in range(max(1, int(rate * duration)))]
+
+
+def run_in_process(invoke: Callable, payloads: list, rate: float, duration: float,
+                   workers: int) -> LoadResult:
+    """Lazo abierto en proceso: un hilo programa llegadas y --workers hilos las ejecutan."""
+    samples: List[Sample] = []
+
+    def job(intended: float, payload) -> None:
+        started = time.perf_counter()
+        ok = True
+        try:
+            invoke(payload)
+        except Exception:  # noqa: BLE001 - se cuenta como error
+            ok = False
+        samples.append((intended, started, time.perf_counter(), ok))
+
+    # CPU de los hilos que ejecutan el grafo: la del hilo programador (este) se resta
+    cpu_start, scheduler_start = time.process_time(), time.thread_time()
+    with ThreadPoolExecutor(workers, thread_name_prefix="load") as pool:
+        start = time.perf_counter()
+        for i, offset in enumerate(schedule(rate, duration)):
+            intended = start + offset
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            # Si el programador se atrasa, la solicitud sale tarde pero se mide desde `intended`
+            pool.submit(job, intended, payloads[i % len(payloads)])
+    elapsed = max(finished for _, _, finished, _ in samples) - start
+    scheduler_cpu = time.thread_time() - scheduler_start
+    return LoadResult(rate, samples, elapsed, time.process_time() - cpu_start - scheduler_cpu)
+
+
+async def _run_http(host: str, port: int, requests: List[bytes], rate: float, duration: float,
+                    connections: int) -> Tuple[List[Sample], float]:
+    idle: asyncio.Queue = asyncio.Queue()
+    for _ in range(connections):
+        idle.put_nowait(await asyncio.open_connection(host, port))
+    samples: List[Sample] = []
+
+    async def send(intended: float, request: bytes) -> None:
+        connection = await idle.get()  # Sin conexión libre, la espera cuenta como cola
+        started = time.perf_counter()
+        try:
+            if connection is None:  # La anterior se descartó por un error: se abre otra
+                connection = await asyncio.open_connection(host, port)
+            reader, writer = connection
+            writer.write(request)
+            ok = await read_response(reader) == 200
+        except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            # La respuesta quedó a medias: la conexión no se puede reutilizar
+            ok = False
+            if connection is not None:
+                connection[1].close()
+                connection = None
+        samples.append((intended, started, time.perf_counter(), ok))
+        idle.put_nowait(connection)
+
+    tasks = []
+    start = time.perf_counter()
+    for i, offset in enumerate(schedule(rate, duration)):
+        intended = start + offset
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(intended, requests[i % len(requests)])))
+    await asyncio.gather(*tasks)
+    elapsed = max(finished for _, _, finished, _ in samples) - start
+
+    while not idle.empty():
+        connection = idle.get_nowait()
+        if connection is not None:
+            connection[1].close()
+    return samples, elapsed
+
+
+def process_cpu_seconds(pid: int) -> Optional[float]:
+    """CPU (usuario + sistema) de otro proceso, leída de /proc (solo Linux)."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def run_http(host: str, port: int, requests: List[bytes], rate: float, duration: float,
+             connections: int, server_pid: Optional[int]) -> LoadResult:
+    cpu_start = process_cpu_seconds(server_pid) if server_pid else None
+    samples, elapsed = asyncio.run(_run_http(host, port, requests, rate, duration, connections))
+    cpu = None
+    if cpu_start is not None:
+        cpu_end = process_cpu_seconds(server_pid)
+        cpu = cpu_end - cpu_start if cpu_end is not None else None
+    return LoadResult(rate, samples, elapsed, cpu)
+
+
+def spawn_faq_server() -> Tuple[subprocess.Popen, int]:
+    """Arranca faq_server.py en un puerto libre y espera a que responda /health."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "faq_server.py"),
+         "--port", str(port)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5) as conn:
+                conn.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\n\r\n")
+                if conn.recv(12).endswith(b"200"):
+                    return server, port
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("faq_server.py no respondió a tiempo")
+
+
+def faq_queries(same: bool, count: int = 1000) -> List[str]:
+    kualtos = load_lesson_module("01-fundamentos", "03_intro_kualtos")
+    if same:
+        return list(kualtos.TEST_QUERIES)
+    # Un número distinto por pregunta: otra llave para single-flight, mismo tema
+    return [f"{kualtos.TEST_QUERIES[i % len(kualtos.TEST_QUERIES)]} {i}" for i in range(count)]
+
+
+def loan_states() -> List[dict]:
+    loans = load_lesson_module("01-fundamentos", "02_nodos_y_edges")
+    return [{"applicant_name": name, "requested_amount": amount, "credit_score": score,
+             "employment_status": employment, "decision": "", "reason": ""}
+            for name, amount, score, employment in loans.DEMO_APPLICATIONS]
+
+
+def print_histograms(result: LoadResult) -> None:
+    print(f"\n{'Percentil':<12}{'servicio (ms)':>16}{'respuesta (ms)':>18}")
+    print("-" * 46)
+    for pct in PERCENTILES:
+        print(f"{f'p{pct:g}':<12}{result.service.percentile(pct) / 1e6:>16.2f}"
+              f"{result.response.percentile(pct) / 1e6:>18.2f}")
+    print(f"{'máx':<12}{(result.service.max or 0) / 1e6:>16.2f}{(result.response.max or 0) / 1e6:>18.2f}")
+
+
+def print_step(result: LoadResult) -> None:
+    per_core = f"{result.per_core:>12,.0f}" if result.per_core else f"{'-':>12}"
+    print(f"{result.rate:>10,.0f}{result.throughput:>12,.0f}"
+          f"{result.response.percentile(50) / 1e6:>10.1f}{result.response.percentile(99) / 1e6:>10.1f}"
+          f"{result.response.percentile(99.9) / 1e6:>10.1f}{result.errors:>8}{per_core}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de carga de lazo abierto")
+    parser.add_argument("graph", choices=("faq", "loan"))
+    parser.add_argument("--rate", type=float, default=200, help="Llegadas por segundo")
+    parser.add_argument("--duration", type=float, default=5.0, help="Segundos por escalón")
+    parser.add_argument("--workers", type=int, default=4, help="Hilos en proceso")
+    parser.add_argument("--http", default=None, help="host:puerto de faq_server.py")
+    parser.add_argument("--spawn", action="store_true", help="Arranca faq_server.py y mide su CPU")
+    parser.add_argument("--connections", type=int, default=64, help="Conexiones HTTP keep-alive")
+    parser.add_argument("--saturate", action="store_true",
+                        help="Duplica la tasa hasta que el throughput no la sostenga")
+    parser.add_argument("--max-steps", type=int, default=8)
+    parser.add_argument("--slo-ms", type=float, default=100.0,
+                        help="p99 de respuesta máximo para considerar sostenida una tasa")
+    parser.add_argument("--same-queries", action="store_true",
+                        help="Repite TEST_QUERIES tal cual (el servidor las coalescerá)")
+    args = parser.parse_args()
+
+    if (args.http or args.spawn) and args.graph != "faq":
+        parser.error("Solo existe servicio HTTP para el FAQ (faq_server.py)")
+
+    server = None
+    if args.http or args.spawn:
+        if args.spawn:
+            server, port = spawn_faq_server()
+            host, server_pid = "127.0.0.1", server.pid
+        else:
+            host, _, port = args.http.rpartition(":")
+            port, server_pid = int(port), None
+        requests = [f"GET /faq?q={quote(q)} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1")
+                    for q in faq_queries(args.same_queries)]
+        target = f"HTTP {host}:{port} ({args.connections} conexiones)"
+
+        def step(rate: float) -> LoadResult:
+            return run_http(host, port, requests, rate, args.duration, args.connections, server_pid)
+    else:
+        if args.graph == "faq":
+            agent = get_graph("faq_agent")
+            payloads = [{"user_query": q, "identified_topic": "", "response": "", "found_answer": False}
+                        for q in faq_queries(args.same_queries)]
+        else:
+            loan_states()  # Registra el grafo "loan"
+            agent = get_graph("loan")
+            payloads = loan_states()
+        agent.invoke(payloads[0])  # Calentamiento
+        target = f"en proceso ({args.workers} hilos)"
+
+        def step(rate: float) -> LoadResult:
+            return run_in_process(agent.invoke, payloads, rate, args.duration, args.workers)
+
+    print("=" * 72)
+    print(f"CARGA DE LAZO ABIERTO - {args.graph.upper()} {target}")
+    print(f"Núcleos disponibles: {os.cpu_count()}")
+    print("=" * 72)
+    try:
+        if not args.saturate:
+            result = step(args.rate)
+            print(f"Tasa {args.rate:,.0f}/s durante {args.duration:g}s: {result.completed:,} "
+                  f"completadas ({result.throughput:,.0f}/s), {result.errors} errores")
+            print_histograms(result)
+            if result.per_core:
+                print(f"\nThroughput por núcleo: {result.per_core:,.0f} solicitudes/s de CPU")
+            return
+
+        print(f"{'ofrecida':>10}{'lograda':>12}{'p50 ms':>10}{'p99 ms':>10}{'p99.9 ms':>10}"
+              f"{'errores':>8}{'por núcleo':>12}")
+        print("-" * 72)
+        rate, saturation = args.rate, None
+        for _ in range(args.max_steps):
+            result = step(rate)
+            print_step(result)
+            sustained = (result.throughput >= 0.9 * rate
+                         and result.response.percentile(99) / 1e6 <= args.slo_ms)
+            if saturation is None or result.throughput > saturation.throughput:
+                saturation = result
+            if not sustained:
+                break
+            rate *= 2
+        print("-" * 72)
+        print(f"Saturación: ~{saturation.throughput:,.0f} solicitudes/s", end="")
+        if saturation.per_core:
+            print(f", {saturation.per_core:,.0f} por segundo de CPU (por núcleo)")
+        else:
+            print(" (sin medición de CPU del servidor; usa --spawn)")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
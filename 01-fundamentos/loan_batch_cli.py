@@ -0,0 +1,242 @@
+"""
+CLI de procesamiento masivo de solicitudes de préstamo (02_nodos_y_edges).
+Lee un archivo JSONL o CSV en streaming, reparte bloques de solicitudes a un pool
+de procesos (cada uno con su propio grafo compilado) y escribe las decisiones en
+el mismo orden de entrada. Solo hay un número acotado de bloques en vuelo, así
+que la memoria no crece con el tamaño del archivo.
+
+Uso:
+    python loan_batch_cli.py generate solicitudes.jsonl --rows 1000000
+    python loan_batch_cli.py run solicitudes.jsonl decisiones.jsonl [--workers 8]
+    python loan_batch_cli.py run solicitudes.csv decisiones.csv --chunk-size 5000
+    python loan_batch_cli.py run solicitudes.jsonl decisiones.jsonl --engine numpy
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+from typing import Iterable, Iterator, List, Tuple
+
+from graph_registry import get_graph, load_lesson_module
+
+INPUT_FIELDS = ["applicant_name", "requested_amount", "credit_score", "employment_status"]
+OUTPUT_FIELDS = INPUT_FIELDS + ["decision", "reason"]
+INVALID_KEY = "_invalid"  # Marca de una línea ilegible: el worker la convierte en fila ERROR
+
+_graph = None  # Grafo compilado del proceso worker
+
+
+def detect_format(path: str, explicit: str = None) -> str:
+    if explicit:
+        return explicit
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_records(path: str, fmt: str) -> Iterator[dict]:
+    """Lee solicitudes una por una (sin cargar el archivo completo)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield {INVALID_KEY: f"línea {number}: JSON inválido ({e})"}
+                    continue
+                if not isinstance(record, dict):
+                    record = {INVALID_KEY: f"línea {number}: se esperaba un objeto JSON"}
+                yield record
+
+
+def chunked(records: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def to_state(record: dict) -> dict:
+    """Convierte un registro de entrada en LoanApplicationState (CSV trae todo como texto)."""
+    if INVALID_KEY in record:
+        raise ValueError(record[INVALID_KEY])
+    return {
+        "applicant_name": str(record.get("applicant_name", "")),
+        "requested_amount": float(record["requested_amount"]),
+        "credit_score": int(record["credit_score"]),
+        "employment_status": str(record["employment_status"]),
+        "decision": "",
+        "reason": "",
+    }
+
+
+def init_worker(engine: str) -> None:
+    """Inicializa el worker: importa la lección y compila su propio grafo una vez."""
+    global _graph
+    if engine == "graph":
+        load_lesson_module("01-fundamentos", "02_nodos_y_edges")
+        _graph = get_graph("loan")
+
+
+def process_chunk(args: Tuple[List[dict], str]) -> List[Tuple[str, str]]:
+    """Evalúa un bloque de solicitudes. Retorna (decision, reason) por registro."""
+    records, engine = args
+
+    if engine == "numpy":
+        from batch_underwriting import underwrite_batch
+        results, valid, states = [], [], []
+        for i, record in enumerate(records):
+            try:
+                states.append(to_state(record))
+                valid.append(i)
+                results.append(None)
+            except (KeyError, TypeError, ValueError) as e:
+                results.append(("ERROR", f"Registro inválido: {e}"))
+        batch = underwrite_batch(
+            [s["credit_score"] for s in states],
+            [s["employment_status"] for s in states],
+            [s["requested_amount"] for s in states],
+        )
+        for i, decision, reason in zip(valid, batch["decision"].tolist(), batch["reason"].tolist()):
+            results[i] = (decision, reason)
+        return results
+
+    results = []
+    for record in records:
+        try:
+            state = _graph.invoke(to_state(record))
+            results.append((state["decision"], state["reason"]))
+        except (KeyError, TypeError, ValueError) as e:
+            results.append(("ERROR", f"Registro inválido: {e}"))
+    return results
+
+
+class ResultWriter:
+    """Escribe registros con su decisión en JSONL o CSV."""
+
+    def __init__(self, path: str, fmt: str):
+        self.fmt = fmt
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        if fmt == "csv":
+            self.csv = csv.DictWriter(self.file, fieldnames=OUTPUT_FIELDS, extrasaction="ignore")
+            self.csv.writeheader()
+
+    def write(self, records: List[dict], results: List[Tuple[str, str]]) -> None:
+        for record, (decision, reason) in zip(records, results):
+            if INVALID_KEY in record:
+                record = {}  # La línea original no se pudo leer; el motivo va en reason
+            row = dict(record, decision=decision, reason=reason)
+            if self.fmt == "csv":
+                self.csv.writerow(row)
+            else:
+                self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def run(args) -> None:
+    in_fmt = detect_format(args.input, args.input_format)
+    out_fmt = detect_format(args.output, args.output_format)
+    writer = ResultWriter(args.output, out_fmt)
+    chunks = chunked(read_records(args.input, in_fmt), args.chunk_size)
+
+    # Bloques en vuelo acotados: la memoria no depende del tamaño del archivo
+    max_in_flight = args.workers * args.prefetch
+    pending: deque = deque()
+    rows = 0
+    start = last_report = time.perf_counter()
+
+    with Pool(args.workers, initializer=init_worker, initargs=(args.engine,)) as pool:
+        def drain_one():
+            nonlocal rows
+            records, result = pending.popleft()
+            writer.write(records, result.get())
+            rows += len(records)
+
+        for chunk in chunks:
+            pending.append((chunk, pool.apply_async(process_chunk, ((chunk, args.engine),))))
+            while len(pending) >= max_in_flight or (pending and pending[0][1].ready()):
+                drain_one()
+
+            now = time.perf_counter()
+            if now - last_report >= 1.0:
+                print(f"\r⏳ {rows:,} filas | {rows / (now - start):,.0f} filas/s",
+                      end="", file=sys.stderr, flush=True)
+                last_report = now
+
+        while pending:
+            drain_one()
+
+    writer.close()
+    elapsed = time.perf_counter() - start
+    print(f"\r✅ {rows:,} filas en {elapsed:,.1f} s | {rows / elapsed:,.0f} filas/s "
+          f"({args.workers} workers, motor: {args.engine})", file=sys.stderr)
+
+
+def generate(args) -> None:
+    """Genera un archivo de solicitudes sintéticas para pruebas de volumen."""
+    rng = random.Random(args.seed)
+    fmt = detect_format(args.path, args.format)
+    employment = ["empleado", "empleado", "empleado", "independiente", "desempleado"]
+
+    with open(args.path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=INPUT_FIELDS) if fmt == "csv" else None
+        if writer:
+            writer.writeheader()
+        for i in range(args.rows):
+            record = {
+                "applicant_name": f"Solicitante {i}",
+                "requested_amount": round(rng.uniform(5000, 50000), 2),
+                "credit_score": rng.randint(300, 850),
+                "employment_status": rng.choice(employment),
+            }
+            if writer:
+                writer.writerow(record)
+            else:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    print(f"✅ {args.rows:,} solicitudes escritas en {args.path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Procesamiento masivo de solicitudes de préstamo")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="Procesa un archivo de solicitudes")
+    run_parser.add_argument("input")
+    run_parser.add_argument("output")
+    run_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    run_parser.add_argument("--chunk-size", type=int, default=2000)
+    run_parser.add_argument("--prefetch", type=int, default=4,
+                            help="Bloques en vuelo por worker")
+    run_parser.add_argument("--engine", choices=["graph", "numpy"], default="graph",
+                            help="graph: invoke por solicitud; numpy: batch_underwriting")
+    run_parser.add_argument("--input-format", choices=["jsonl", "csv"])
+    run_parser.add_argument("--output-format", choices=["jsonl", "csv"])
+
+    gen_parser = sub.add_parser("generate", help="Genera solicitudes sintéticas")
+    gen_parser.add_argument("path")
+    gen_parser.add_argument("--rows", type=int, default=100_000)
+    gen_parser.add_argument("--seed", type=int, default=0)
+    gen_parser.add_argument("--format", choices=["jsonl", "csv"])
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        generate(args)
+
+
+if __name__ == "__main__":
+    main()
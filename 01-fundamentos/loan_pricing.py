@@ -0,0 +1,228 @@
+"""
+Cotización de préstamos: tasa por banda de score y tabla de amortización.
+Las bandas vienen de la respuesta "tasas" de la FAQ y se guardan como una tabla
+de intervalos precalculada (límites inferiores ordenados + tasas): una búsqueda
+binaria encuentra la banda, tanto para una solicitud (bisect) como para un lote
+completo (np.searchsorted). Las reglas de decisión (loan_rules.json) se validan
+contra estas bandas con check_rules: no se cargan reglas que aprueben un score
+sin tasa.
+
+Los pagos son de tipo francés (cuota fija mensual); la última cuota absorbe el
+redondeo a centavos para que el saldo termine exactamente en cero.
+
+Uso:
+    quote = price_loan(10000.00, 750)              # tasa, cuota, intereses y tabla
+    batch = price_batch(amounts, scores, term_months=12)
+
+    python loan_pricing.py [num_solicitudes]       # Benchmark por cotización y por lote
+"""
+
+import math
+import sys
+import time
+from bisect import bisect_right
+from typing import List, Optional
+
+import numpy as np
+
+from rules_engine import RulesError
+
+DEFAULT_TERM_MONTHS = 12
+
+# Bandas de la FAQ "tasas": score mínimo → tasa anual
+RATE_BANDS = [
+    (600, 0.32),
+    (650, 0.24),
+    (700, 0.18),
+]
+
+# Tabla de intervalos precalculada: límites inferiores y tasa de cada intervalo.
+# El intervalo 0 (score < 600) no tiene tasa.
+BAND_FLOORS = [floor for floor, _ in RATE_BANDS]
+BAND_RATES = [None] + [rate for _, rate in RATE_BANDS]
+_FLOORS_ARRAY = np.array(BAND_FLOORS)
+_RATES_ARRAY = np.array([np.nan] + [rate for _, rate in RATE_BANDS])
+
+
+def rate_for_score(score: int) -> Optional[float]:
+    """Tasa anual de la banda del score; None si no califica (score < 600)."""
+    return BAND_RATES[bisect_right(BAND_FLOORS, score)]
+
+
+def check_rules(rules) -> None:
+    """
+    Valida reglas compiladas (rules_engine.CompiledRules) contra las bandas de
+    tasa: toda banda que aprueba debe empezar en BAND_FLOORS[0] o más arriba, y
+    ninguna regla de empleo puede aprobar sin pasar por el score.
+    """
+    for status, (route, _) in rules.employment.items():
+        if route == "approve":
+            raise RulesError(f"employment.{status}: aprueba sin revisar el score (no tendría tasa)")
+    for floor, (route, _) in zip(rules.floors, rules.decisions):
+        if route == "approve" and floor < BAND_FLOORS[0]:
+            raise RulesError(f"score_bands[min={floor}]: aprueba scores sin tasa "
+                             f"(la banda de tasa más baja empieza en {BAND_FLOORS[0]})")
+
+
+def _round_cents(value: float) -> int:
+    """Redondeo a centavo (mitad hacia arriba), igual en la versión escalar y en lote."""
+    return math.floor(value + 0.5)
+
+
+def _payment_cents(principal_cents: int, annual_rate: float, months: int) -> int:
+    r = annual_rate / 12
+    if r == 0:
+        return _round_cents(principal_cents / months)
+    return _round_cents(principal_cents * r / (1 - (1 + r) ** -months))
+
+
+def monthly_payment(principal: float, annual_rate: float, months: int) -> float:
+    """Cuota fija mensual, redondeada a centavos."""
+    return _payment_cents(_round_cents(principal * 100), annual_rate, months) / 100
+
+
+def amortization_schedule(principal: float, annual_rate: float, months: int) -> List[dict]:
+    """Tabla de amortización mes a mes. Los cálculos se hacen en centavos enteros."""
+    r = annual_rate / 12
+    balance = _round_cents(principal * 100)
+    payment = _payment_cents(balance, annual_rate, months)
+    schedule = []
+    for month in range(1, months + 1):
+        interest = _round_cents(balance * r)
+        amortized = balance if month == months else payment - interest
+        balance -= amortized
+        schedule.append({
+            "month": month,
+            "payment": (interest + amortized) / 100,
+            "interest": interest / 100,
+            "principal": amortized / 100,
+            "balance": balance / 100,
+        })
+    return schedule
+
+
+def price_loan(amount: float, score: int, term_months: int = DEFAULT_TERM_MONTHS,
+               include_schedule: bool = True) -> Optional[dict]:
+    """Cotización completa de una solicitud; None si el score no tiene tasa."""
+    rate = rate_for_score(score)
+    if rate is None:
+        return None
+    schedule = amortization_schedule(amount, rate, term_months)
+    total_interest = round(sum(row["interest"] for row in schedule), 2)
+    quote = {
+        "annual_rate": rate,
+        "term_months": term_months,
+        "monthly_payment": schedule[0]["payment"],
+        "total_interest": total_interest,
+        "total_paid": round(amount + total_interest, 2),
+    }
+    if include_schedule:
+        quote["schedule"] = schedule
+    return quote
+
+
+def rates_for_scores(scores) -> np.ndarray:
+    """Tasa anual por solicitud (NaN si no califica), con una sola búsqueda vectorizada."""
+    return _RATES_ARRAY[np.searchsorted(_FLOORS_ARRAY, np.asarray(scores), side="right")]
+
+
+def price_batch(amounts, scores, term_months: int = DEFAULT_TERM_MONTHS,
+                include_schedule: bool = False) -> dict:
+    """
+    Cotiza un lote completo en formato columnar.
+    Retorna arreglos alineados con la entrada (NaN donde el score no califica);
+    con include_schedule agrega matrices (solicitudes × meses) de interés,
+    capital y saldo. Usa centavos enteros y el mismo redondeo que price_loan,
+    así que los resultados coinciden al centavo.
+    """
+    rates = rates_for_scores(scores)
+    eligible = ~np.isnan(rates)
+    r = np.where(eligible, rates, 0.0) / 12
+    current = np.floor(np.asarray(amounts, dtype=np.float64) * 100 + 0.5).astype(np.int64)
+    principal_cents = current.copy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payments = np.floor(current * r / (1 - (1 + r) ** -term_months) + 0.5)
+    payments = np.where(eligible, payments, 0).astype(np.int64)
+
+    # El redondeo mes a mes depende del saldo anterior: se itera por mes (12-60
+    # pasos), vectorizado sobre todas las solicitudes.
+    n = len(current)
+    interest = np.empty((n, term_months), dtype=np.int64)
+    principal = np.empty((n, term_months), dtype=np.int64)
+    balance = np.empty((n, term_months), dtype=np.int64)
+    for month in range(term_months):
+        interest[:, month] = np.floor(current * r + 0.5)
+        principal[:, month] = current if month == term_months - 1 else payments - interest[:, month]
+        current = current - principal[:, month]
+        balance[:, month] = current
+
+    total_interest = interest.sum(axis=1)
+    result = {
+        "annual_rate": rates,
+        "monthly_payment": np.where(eligible, (interest[:, 0] + principal[:, 0]) / 100, np.nan),
+        "total_interest": np.where(eligible, total_interest / 100, np.nan),
+        "total_paid": np.where(eligible, (principal_cents + total_interest) / 100, np.nan),
+    }
+    if include_schedule:
+        result.update(interest=interest / 100, principal=principal / 100, balance=balance / 100)
+    return result
+
+
+def verify_batch(n: int = 1000, seed: int = 0, term_months: int = DEFAULT_TERM_MONTHS) -> int:
+    """Compara price_batch contra price_loan solicitud por solicitud."""
+    rng = np.random.default_rng(seed)
+    amounts = rng.uniform(5000, 50000, size=n).round(2)
+    scores = rng.integers(300, 851, size=n)
+    batch = price_batch(amounts, scores, term_months, include_schedule=True)
+    for i in range(n):
+        quote = price_loan(float(amounts[i]), int(scores[i]), term_months)
+        if quote is None:
+            assert np.isnan(batch["annual_rate"][i]), f"Solicitud {i}: debió quedar sin tasa"
+            continue
+        assert quote["monthly_payment"] == batch["monthly_payment"][i], f"Solicitud {i}: cuota"
+        assert quote["total_interest"] == batch["total_interest"][i], f"Solicitud {i}: intereses"
+        assert [row["balance"] for row in quote["schedule"]] == batch["balance"][i].tolist(), \
+            f"Solicitud {i}: saldos"
+    return n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    print("=" * 64)
+    print("BENCHMARK: COTIZACIÓN DE PRÉSTAMOS")
+    print("=" * 64)
+    print(f"✅ Lote y versión escalar coinciden en {verify_batch():,} solicitudes")
+
+    quote = price_loan(10000.00, 750)
+    print(f"\nEjemplo: $10,000.00 con score 750 → {quote['annual_rate']:.0%} anual, "
+          f"{quote['term_months']} cuotas de ${quote['monthly_payment']:,.2f} "
+          f"(intereses ${quote['total_interest']:,.2f})")
+
+    rng = np.random.default_rng(1)
+    amounts = rng.uniform(5000, 50000, size=n).round(2)
+    scores = rng.integers(600, 851, size=n)
+
+    sample = min(n, 20_000)
+    start = time.perf_counter()
+    for amount, score in zip(amounts[:sample].tolist(), scores[:sample].tolist()):
+        price_loan(amount, score)
+    per_quote = (time.perf_counter() - start) / sample
+
+    start = time.perf_counter()
+    price_batch(amounts, scores)
+    batch_summary = time.perf_counter() - start
+    start = time.perf_counter()
+    price_batch(amounts, scores, include_schedule=True)
+    batch_schedule = time.perf_counter() - start
+
+    print(f"\n{'Método':<30}{'µs/cotización':>16}{'cotizaciones/s':>18}")
+    print("-" * 64)
+    print(f"{'price_loan (con tabla)':<30}{per_quote * 1e6:>16.1f}{1 / per_quote:>18,.0f}")
+    print(f"{'price_batch (resumen)':<30}{batch_summary / n * 1e6:>16.2f}{n / batch_summary:>18,.0f}")
+    print(f"{'price_batch (con tabla)':<30}{batch_schedule / n * 1e6:>16.2f}{n / batch_schedule:>18,.0f}")
+    print("-" * 64)
+
+
+if __name__ == "__main__":
+    main()
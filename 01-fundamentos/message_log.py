@@ -0,0 +1,141 @@
+"""
+Registro de mensajes append-only con ventana reciente y resumen acumulado.
+Con `Annotated[list[str], add_messages]` cada nodo genera una lista nueva con
+todos los mensajes, así que el costo total crece de forma cuadrática con el largo
+de la conversación. El reducer de este módulo solo agrega los mensajes nuevos
+(el delta) al mismo registro, y los nodos pueden leer una ventana acotada de
+mensajes recientes más un resumen opcional de los anteriores.
+
+El reducer nunca modifica el registro que recibe: trabaja sobre una copia
+O(window) que comparte el historial (una lista a la que solo se agrega al final;
+cada copia ve hasta su propio `total`). Así, reusar un resultado anterior como
+entrada, reintentar un turno o guardar snapshots no altera registros ajenos.
+"""
+
+from collections import deque
+from itertools import islice
+from typing import Annotated, Any, Callable, Iterable, Iterator, List, Optional, TypedDict
+
+Summarizer = Callable[[str, Any], str]
+
+
+def count_summarizer(summary: str, message: Any) -> str:
+    """Resumen mínimo: cuenta cuántos mensajes salieron de la ventana."""
+    count = int(summary.split()[0]) + 1 if summary else 1
+    return f"{count} mensajes anteriores"
+
+
+class MessageLog:
+    """
+    Registro append-only de mensajes.
+    - recent(): últimos `window` mensajes
+    - summary: resumen acumulado de los mensajes que salieron de la ventana
+    - keep_history=False descarta los mensajes fuera de la ventana (memoria O(window))
+    """
+
+    __slots__ = ("window", "summarizer", "summary", "total", "_recent", "_history")
+
+    def __init__(self, window: int = 20, keep_history: bool = True,
+                 summarizer: Optional[Summarizer] = None):
+        self.window = window
+        self.summarizer = summarizer
+        self.summary = ""
+        self.total = 0
+        self._recent: deque = deque(maxlen=window)
+        self._history: Optional[List[Any]] = [] if keep_history else None
+
+    def copy(self) -> "MessageLog":
+        """Copia independiente en O(window): comparte el historial hasta `total`."""
+        clone = MessageLog.__new__(MessageLog)
+        clone.window = self.window
+        clone.summarizer = self.summarizer
+        clone.summary = self.summary
+        clone.total = self.total
+        clone._recent = deque(self._recent, maxlen=self.window)
+        clone._history = self._history
+        return clone
+
+    def extend(self, messages: Iterable[Any]) -> "MessageLog":
+        """Agrega mensajes al final del registro (costo proporcional al delta)."""
+        if self._history is not None and len(self._history) != self.total:
+            # Otra copia ya agregó a la lista compartida: desde aquí el historial es propio
+            self._history = self._history[:self.total]
+        for message in messages:
+            if self.summarizer and len(self._recent) == self.window:
+                self.summary = self.summarizer(self.summary, self._recent[0])
+            self._recent.append(message)
+            if self._history is not None:
+                self._history.append(message)
+            self.total += 1
+        return self
+
+    def recent(self) -> List[Any]:
+        """Mensajes dentro de la ventana, del más antiguo al más reciente."""
+        return list(self._recent)
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._history is None:
+            return iter(self._recent)
+        return islice(self._history, self.total)
+
+    def __getitem__(self, index):
+        if self._history is None:
+            return list(self._recent)[index]
+        if isinstance(index, slice):
+            return [self._history[i] for i in range(*index.indices(self.total))]
+        if index < 0:
+            index += self.total
+        if not 0 <= index < self.total:
+            raise IndexError("índice fuera del registro")
+        return self._history[index]
+
+    def __getstate__(self) -> dict:
+        # Al serializar (ej: checkpoints) solo viaja la parte del historial de esta copia
+        state = {name: getattr(self, name) for name in self.__slots__}
+        if self._history is not None:
+            state["_history"] = self._history[:self.total]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def __repr__(self) -> str:
+        # Representación compacta: imprimir el estado no recorre toda la conversación
+        return f"MessageLog(total={self.total}, recent={list(self._recent)[-3:]!r})"
+
+
+def windowed_messages(window: int = 20, keep_history: bool = True,
+                      summarizer: Optional[Summarizer] = None) -> Callable:
+    """
+    Crea un reducer para usar en el estado:
+        messages: Annotated[MessageLog, windowed_messages(window=50)]
+    """
+    def reducer(current: Optional[MessageLog], update: Any) -> MessageLog:
+        # Reanudar una conversación: el estado de entrada trae un registro existente
+        if isinstance(update, MessageLog):
+            return update.copy()
+        if not isinstance(current, MessageLog) or len(current) == 0:
+            current = MessageLog(window, keep_history, summarizer)
+        else:
+            current = current.copy()  # El valor anterior (entrada, snapshot) no cambia
+        if isinstance(update, (str, bytes)) or not isinstance(update, Iterable):
+            update = [update]
+        return current.extend(update)
+
+    return reducer
+
+
+# Reducer por defecto: ventana de 20 mensajes, historial completo
+append_messages = windowed_messages()
+
+
+class WindowedConversationState(TypedDict):
+    """ConversationState de la lección 1.1 con registro de mensajes append-only."""
+    messages: Annotated[MessageLog, append_messages]
+    user_name: str
+    turn_count: int
+    user_age: int
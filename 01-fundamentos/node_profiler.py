@@ -0,0 +1,397 @@
+"""
+Perfilado de CPU y memoria por nodo de grafo.
+Envuelve cada nodo con cProfile (siempre) y tracemalloc (una de cada N
+llamadas, porque tomar snapshots es caro) y acumula por nodo a lo largo de
+muchas invocaciones. Al terminar escribe:
+
+- nodes.collapsed: pilas colapsadas ("nodo;función;función µs") para
+  flamegraph.pl, speedscope o inferno.
+- <nodo>.prof: estadísticas de pstats (snakeviz, python -m pstats).
+- allocations.txt: resumen por nodo y las N líneas que más memoria dejan
+  asignada en cada uno.
+
+Se activa por corrida, sin cambiar código, con variables de entorno; las
+fábricas de las lecciones lo usan cuando no reciben instrumentation. Apagado
+no cuesta nada: no se envuelve ningún nodo.
+
+    KUALTOS_PROFILE=1 | <directorio>     Activa el perfilado (por defecto ./profiles)
+    KUALTOS_PROFILE_MEMORY_EVERY=20      Muestra de tracemalloc (0 = sin memoria)
+    KUALTOS_PROFILE_TOP=15               Líneas por nodo en allocations.txt
+
+Con ramas paralelas cProfile sigue a cada hilo por separado. En los nodos
+async solo se perfilan los pasos de la propia corrutina (entre un await y el
+siguiente), así que ramas en el mismo event loop no se mezclan ni anidan
+perfiladores. tracemalloc es global: las asignaciones de nodos simultáneos se
+mezclan, y si otro nodo ocupa la muestra, este la toma en su siguiente llamada.
+
+Uso:
+    KUALTOS_PROFILE=profiles python batch_underwriting.py
+    python node_profiler.py [invocaciones] [--out profiles]   # Demo con los grafos de la lección
+"""
+
+import argparse
+import atexit
+import cProfile
+import functools
+import inspect
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+from langgraph.graph import StateGraph
+
+from graph_registry import load_lesson_module
+
+MIN_FRAME_US = 1  # Las pilas con menos tiempo no se escriben
+# Las asignaciones del propio perfilador no se reportan
+_OWN_FRAMES = [tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)]
+
+
+def _frame_label(func: tuple) -> str:
+    filename, line, name = func
+    if filename == "~":  # Funciones built-in: "<built-in method time.sleep>"
+        return name.strip("<>").replace(";", ",")
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(";", ",")
+
+
+def collapsed_stacks(stats: pstats.Stats, root: str, max_depth: int = 64) -> Counter:
+    """
+    Reconstruye pilas aproximadas desde el grafo llamador → llamado de cProfile:
+    el tiempo de cada función se reparte entre sus llamadores en proporción al
+    tiempo acumulado que aportó cada uno (µs por pila).
+    """
+    entries = stats.stats
+    callees: Dict[tuple, Dict[tuple, float]] = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, {})[func] = edge[3]
+    # Raíces: la función del nodo (y el propio profile.disable(), que se descarta)
+    roots = [func for func, entry in entries.items()
+             if not entry[4] and "_lsprof.Profiler" not in func[2]]
+
+    stacks: Counter = Counter()
+
+    def visit(func: tuple, path: List[str], share: float) -> None:
+        _, _, own, cumulative, _ = entries[func]
+        path = path + [_frame_label(func)]
+        self_us = own * share * 1e6
+        if self_us >= MIN_FRAME_US:
+            stacks[";".join(path)] += int(self_us)
+        if len(path) >= max_depth:
+            return
+        for callee, edge_time in callees.get(func, {}).items():
+            callee_total = entries[callee][3]
+            if callee_total <= 0 or _frame_label(callee) in path:  # Recursión
+                continue
+            child_share = share * edge_time / callee_total
+            if child_share * callee_total * 1e6 >= MIN_FRAME_US:
+                visit(callee, path, child_share)
+
+    for func in roots:
+        visit(func, [root], 1.0)
+    return stacks
+
+
+class _Steps:
+    """Awaitable sobre un generador que reenvía cada paso de una corrutina."""
+
+    __slots__ = ("steps",)
+
+    def __init__(self, steps):
+        self.steps = steps
+
+    def __await__(self):
+        return self.steps
+
+
+class NodeProfile:
+    """CPU (un cProfile por hilo) y memoria muestreada de un nodo."""
+
+    def __init__(self):
+        self.calls = 0
+        self.wall_ns = 0
+        self.profiles: Dict[int, cProfile.Profile] = {}
+        self.memory_samples = 0
+        self.memory_due = False  # La muestra tocaba pero otro nodo la ocupaba: reintentar
+        self.peak_bytes = 0
+        self.allocations: Counter = Counter()  # "archivo:línea" → bytes que quedan asignados
+        self.allocation_counts: Counter = Counter()
+
+
+class NodeProfiler:
+    """Instrumentación (mismo contrato que instrumentation.Instrumentation) que perfila cada nodo."""
+
+    def __init__(self, output_dir: str = "profiles", memory_every: int = 20, top: int = 15):
+        self.output_dir = output_dir
+        self.memory_every = memory_every
+        self.top = top
+        self.nodes: Dict[str, NodeProfile] = {}
+        self._lock = threading.Lock()
+        self._memory_lock = threading.Lock()  # tracemalloc es global: una muestra a la vez
+        self._active = threading.local()  # Un solo perfilador activo por hilo (sin anidar)
+
+    def state_graph(self, state_schema, **kwargs) -> StateGraph:
+        from instrumentation import InstrumentedStateGraph
+        return InstrumentedStateGraph(state_schema, self, **kwargs)
+
+    def wrap_router(self, source: str, fn: Callable) -> Callable:
+        return fn
+
+    def _node(self, name: str) -> NodeProfile:
+        with self._lock:
+            node = self.nodes.get(name)
+            if node is None:
+                node = self.nodes[name] = NodeProfile()
+            node.calls += 1
+            return node
+
+    def _profile(self, node: NodeProfile) -> cProfile.Profile:
+        thread = threading.get_ident()
+        profile = node.profiles.get(thread)
+        if profile is None:
+            with self._lock:
+                profile = node.profiles.setdefault(thread, cProfile.Profile())
+        return profile
+
+    def _sample_memory(self, node: NodeProfile) -> bool:
+        if self.memory_every <= 0:
+            return False
+        if not node.memory_due and (node.calls - 1) % self.memory_every:
+            return False
+        node.memory_due = not self._memory_lock.acquire(blocking=False)
+        return not node.memory_due
+
+    def _claim(self, profile: cProfile.Profile) -> bool:
+        """
+        Reserva el hilo para este perfilador si no tiene otro activo. Quien llama
+        hace enable()/disable() directamente: una función auxiliar en medio
+        aparecería como marco propio en las pilas de cada nodo.
+        """
+        if getattr(self._active, "profile", None) is not None:
+            return False
+        self._active.profile = profile
+        return True
+
+    def _profiled_steps(self, coroutine, profile: cProfile.Profile):
+        """Ejecuta la corrutina paso a paso, con el perfilador activo solo durante cada paso."""
+        value, error = None, None
+        while True:
+            enabled = self._claim(profile)
+            if enabled:
+                try:
+                    profile.enable()
+                except ValueError:  # Python 3.12+: otra herramienta de perfilado ya está activa
+                    self._active.profile, enabled = None, False
+            try:
+                if error is not None:
+                    future = coroutine.throw(error)
+                else:
+                    future = coroutine.send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                if enabled:
+                    profile.disable()
+                    self._active.profile = None
+            try:
+                value, error = (yield future), None
+            except GeneratorExit:
+                coroutine.close()
+                raise
+            except BaseException as e:  # Cancelación u otra excepción enviada por la tarea
+                value, error = None, e
+
+    def _start_memory(self):
+        """Inicia una muestra; tracemalloc solo queda activo mientras dura."""
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        # Si alguien más ya estaba trazando, hace falta una foto previa para restar
+        return before, None if started else tracemalloc.take_snapshot(), started
+
+    def _stop_memory(self, node: NodeProfile, before: int, snapshot, started: bool) -> None:
+        try:
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(_OWN_FRAMES)
+            if started:
+                tracemalloc.stop()
+            node.memory_samples += 1
+            node.peak_bytes += peak - before
+            if snapshot is None:
+                sites = ((stat.traceback[0], stat.size, stat.count) for stat in after.statistics("lineno"))
+            else:
+                sites = ((diff.traceback[0], diff.size_diff, diff.count_diff)
+                         for diff in after.compare_to(snapshot.filter_traces(_OWN_FRAMES), "lineno"))
+            for frame, size, count in sites:
+                if size > 0:
+                    site = f"{frame.filename}:{frame.lineno}"
+                    node.allocations[site] += size
+                    node.allocation_counts[site] += count
+        finally:
+            self._memory_lock.release()
+
+    def wrap_node(self, name: str, fn: Callable) -> Callable:
+        """Envuelve un nodo: cProfile en cada llamada, tracemalloc en una de cada N."""
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(state, *args, **kwargs):
+                node = self._node(name)
+                memory = self._start_memory() if self._sample_memory(node) else None
+                profile = self._profile(node)
+                start = time.perf_counter_ns()
+                try:
+                    # Mientras el nodo espera, las demás tareas del hilo no quedan en su perfil
+                    return await _Steps(self._profiled_steps(fn(state, *args, **kwargs), profile))
+                finally:
+                    node.wall_ns += time.perf_counter_ns() - start
+                    if memory is not None:
+                        self._stop_memory(node, *memory)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(state, *args, **kwargs):
+            node = self._node(name)
+            memory = self._start_memory() if self._sample_memory(node) else None
+            profile = self._profile(node)
+            start = time.perf_counter_ns()
+            enabled = self._claim(profile)
+            if enabled:
+                try:
+                    profile.enable()
+                except ValueError:  # Python 3.12+: otra herramienta de perfilado ya está activa
+                    self._active.profile, enabled = None, False
+            try:
+                return fn(state, *args, **kwargs)
+            finally:
+                if enabled:
+                    profile.disable()
+                    self._active.profile = None
+                node.wall_ns += time.perf_counter_ns() - start
+                if memory is not None:
+                    self._stop_memory(node, *memory)
+        return wrapper
+
+    def node_stats(self, name: str) -> Optional[pstats.Stats]:
+        """Estadísticas de cProfile del nodo combinando todos sus hilos."""
+        profiles = [p for p in self.nodes[name].profiles.values() if p.getstats()]
+        if not profiles:
+            return None
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+    def allocation_report(self) -> str:
+        lines = [f"{'Nodo':<24}{'llamadas':>10}{'µs/llamada':>12}{'muestras':>10}{'pico KB':>10}",
+                 "-" * 66]
+        for name, node in sorted(self.nodes.items(), key=lambda item: -item[1].wall_ns):
+            peak = node.peak_bytes / node.memory_samples / 1024 if node.memory_samples else 0.0
+            lines.append(f"{name:<24}{node.calls:>10,}{node.wall_ns / node.calls / 1e3:>12.1f}"
+                         f"{node.memory_samples:>10,}{peak:>10.1f}")
+        for name, node in self.nodes.items():
+            if not node.allocations:
+                continue
+            lines += ["", f"[{name}] top {self.top} líneas por memoria retenida "
+                          f"(suma de {node.memory_samples} muestras)"]
+            for site, size in node.allocations.most_common(self.top):
+                lines.append(f"   {size / 1024:>10.1f} KB {node.allocation_counts[site]:>8,} bloques  {site}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, output_dir: str = None) -> List[str]:
+        """Escribe nodes.collapsed, <nodo>.prof y allocations.txt. Retorna las rutas."""
+        output_dir = output_dir or self.output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        paths = []
+        stacks: Counter = Counter()
+        for name in list(self.nodes):
+            stats = self.node_stats(name)
+            if stats is None:
+                continue
+            path = os.path.join(output_dir, f"{name.replace('/', '_')}.prof")
+            stats.dump_stats(path)
+            paths.append(path)
+            stacks.update(collapsed_stacks(stats, name))
+
+        path = os.path.join(output_dir, "nodes.collapsed")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, micros in sorted(stacks.items()):
+                f.write(f"{stack} {micros}\n")
+        paths.insert(0, path)
+
+        path = os.path.join(output_dir, "allocations.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.allocation_report())
+        paths.insert(1, path)
+        return paths
+
+
+_ENV_PROFILER: Optional[NodeProfiler] = None
+
+
+def profiler_from_env() -> Optional[NodeProfiler]:
+    """
+    NodeProfiler compartido del proceso si KUALTOS_PROFILE está definida, si no
+    None. Los resultados se escriben al salir del proceso.
+    """
+    global _ENV_PROFILER
+    setting = os.getenv("KUALTOS_PROFILE", "")
+    if setting.lower() in ("", "0", "false", "no"):
+        return None
+    if _ENV_PROFILER is None:
+        output_dir = "profiles" if setting.lower() in ("1", "true", "yes") else setting
+        _ENV_PROFILER = NodeProfiler(output_dir,
+                                     memory_every=int(os.getenv("KUALTOS_PROFILE_MEMORY_EVERY", "20")),
+                                     top=int(os.getenv("KUALTOS_PROFILE_TOP", "15")))
+        atexit.register(_write_env_profile)
+    return _ENV_PROFILER
+
+
+def _write_env_profile() -> None:
+    if _ENV_PROFILER is not None and _ENV_PROFILER.nodes:
+        paths = _ENV_PROFILER.write()
+        print(f"🔬 Perfil por nodo escrito en {_ENV_PROFILER.output_dir}/ ({len(paths)} archivos)",
+              file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perfil de CPU y memoria por nodo")
+    parser.add_argument("invocations", type=int, nargs="?", default=2000)
+    parser.add_argument("--out", default="profiles")
+    parser.add_argument("--memory-every", type=int, default=20)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    profiler = NodeProfiler(args.out, memory_every=args.memory_every, top=args.top)
+    loans = load_lesson_module("01-fundamentos", "02_nodos_y_edges")
+    kualtos = load_lesson_module("01-fundamentos", "03_intro_kualtos")
+    loan_graph = loans.create_graph(instrumentation=profiler)
+    faq_graph = kualtos.create_faq_agent(instrumentation=profiler)
+
+    start = time.perf_counter()
+    for i in range(args.invocations):
+        name, amount, score, employment = loans.DEMO_APPLICATIONS[i % len(loans.DEMO_APPLICATIONS)]
+        loan_graph.invoke({"applicant_name": name, "requested_amount": amount, "credit_score": score,
+                           "employment_status": employment, "decision": "", "reason": ""})
+        faq_graph.invoke({"user_query": kualtos.TEST_QUERIES[i % len(kualtos.TEST_QUERIES)],
+                          "identified_topic": "", "response": "", "found_answer": False})
+    elapsed = time.perf_counter() - start
+
+    print("=" * 66)
+    print(f"PERFIL POR NODO ({args.invocations:,} invocaciones de cada grafo, {elapsed:.1f}s)")
+    print("=" * 66)
+    print(profiler.allocation_report().split("\n\n")[0])
+    for path in profiler.write():
+        print(f"📄 {path}")
+    print(f"\nFlamegraph: flamegraph.pl {args.out}/nodes.collapsed > nodos.svg "
+          f"(o arrastra el archivo a speedscope.app)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Verificaciones independientes en ramas paralelas con un nodo de unión.
+Identidad, empleo y crédito no dependen entre sí: en lugar de encadenarlas,
+salen todas del mismo nodo y un nodo "join" espera a que terminen antes de
+rutear. LangGraph ejecuta los nodos de un mismo paso en paralelo, así que la
+latencia total se acerca a la de la rama más lenta y no a la suma.
+
+Modos de ejecución:
+- "sequential": cadena lineal (referencia para comparar).
+- "threads": nodos síncronos; graph.invoke los corre en su pool de hilos.
+- "asyncio": nodos async; graph.ainvoke los corre como tareas en el event loop.
+
+latency simula la E/S de cada servicio externo: segundos o una función que los
+retorna en cada llamada (latencia variable), para todas las verificaciones o
+en un dict por nodo.
+
+Uso:
+    join = add_check_branches(workflow, "validate", {"verify_identity": verify_identity, ...},
+                              mode="threads", latency={"verify_identity": 0.15})
+    workflow.add_conditional_edges(join, route_by_credit_score, {...})
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from typing import Callable, Iterable, Mapping, Union
+
+logger = logging.getLogger("kualtos.verificaciones")
+
+CHECK_MODES = ("sequential", "threads", "asyncio")
+JOIN_NODE = "join_checks"
+
+Delay = Union[float, Callable[[], float]]
+Latency = Union[Delay, Mapping[str, Delay]]
+
+
+def make_check_node(fn: Callable, mode: str, latency: Delay = 0.0) -> Callable:
+    """Adapta una verificación al modo de ejecución, con latencia de E/S simulada."""
+    delay = latency if callable(latency) else (lambda: latency)
+
+    if mode == "asyncio":
+        async def async_check(state):
+            if latency:
+                await asyncio.sleep(delay())
+            result = fn(state)
+            return await result if inspect.isawaitable(result) else result
+        async_check.__name__ = getattr(fn, "__name__", "check")
+        return async_check
+
+    if not latency:
+        return fn
+
+    if inspect.iscoroutinefunction(fn):
+        async def delayed_async_check(state):
+            await asyncio.sleep(delay())
+            return await fn(state)
+        delayed_async_check.__name__ = fn.__name__
+        return delayed_async_check
+
+    def delayed_check(state):
+        time.sleep(delay())
+        return fn(state)
+    delayed_check.__name__ = getattr(fn, "__name__", "check")
+    return delayed_check
+
+
+def join_checks(state) -> dict:
+    """Nodo de unión: se ejecuta una sola vez, cuando todas las ramas terminaron."""
+    logger.info("\n🔗 Verificaciones completas")
+    return {}
+
+
+def add_check_branches(workflow, source: str, checks: Mapping[str, Union[Callable, list]],
+                       mode: str = "threads", latency: Latency = 0.0,
+                       input_schema=None, join: str = JOIN_NODE, no_op: Iterable[str] = ()) -> str:
+    """
+    Agrega las verificaciones después de `source` y retorna el nodo desde el cual
+    rutear. Cada valor de `checks` es una función, o una lista de (nombre, función)
+    que forma una rama de varios pasos (ej: consultar el buró y luego evaluar el score).
+    Los nodos en `no_op` se marcan como que no modifican el estado (ver graph_fusion.py).
+    """
+    if mode not in CHECK_MODES:
+        raise ValueError(f"Modo {mode!r} inválido (opciones: {', '.join(CHECK_MODES)})")
+
+    branches = []
+    for name, check in checks.items():
+        steps = check if isinstance(check, list) else [(name, check)]
+        for step, fn in steps:
+            delay = latency.get(step, 0.0) if isinstance(latency, Mapping) else latency
+            metadata = {"no_op": True} if step in no_op else None
+            workflow.add_node(step, make_check_node(fn, mode, delay), metadata=metadata,
+                              input_schema=input_schema)
+        branches.append([step for step, _ in steps])
+
+    if mode == "sequential":
+        previous = source
+        for step in (step for branch in branches for step in branch):
+            workflow.add_edge(previous, step)
+            previous = step
+        return previous
+
+    for branch in branches:
+        workflow.add_edge(source, branch[0])
+        for a, b in zip(branch, branch[1:]):
+            workflow.add_edge(a, b)
+    workflow.add_node(join, join_checks, input_schema=input_schema)
+    workflow.add_edge([branch[-1] for branch in branches], join)
+    return join
@@ -0,0 +1,248 @@
+"""
+Servidor pre-fork: calienta una vez, comparte con N workers.
+El proceso padre importa langgraph y las lecciones, compila los grafos FAQ y
+de préstamos, carga FAQ_DATABASE y abre el índice TF-IDF; después llama
+a gc.freeze() y hace fork() de N workers que comparten esas páginas de memoria
+(copy-on-write) y el mismo socket de escucha. Cada worker arranca en
+milisegundos porque no importa ni compila nada.
+
+gc.freeze() mueve todos los objetos existentes a una generación permanente: el
+recolector de los hijos ya no los recorre, así que no escribe en sus
+encabezados ni fuerza copias de esas páginas. Los contadores de referencias sí
+se siguen escribiendo al usar los objetos, así que algo de memoria se vuelve
+privada con el uso (ver bench_prefork.py).
+
+Enviar SIGUSR1 a un worker fuerza gc.collect(); sirve para comparar la memoria
+privada con y sin freeze después de una recolección completa.
+
+El padre solo supervisa: si un worker termina inesperadamente, hace fork de
+otro desde el estado ya caliente.
+
+Endpoints (además de los de faq_server.py):
+    POST /loan   {"applicant_name": ..., "requested_amount": ..., "credit_score": ...,
+                  "employment_status": ...}
+
+Uso:
+    python prefork_server.py [--workers 4] [--port 8080] [--no-freeze]
+    python prefork_server.py --no-fork    # Un solo proceso, sin fork (para comparar)
+    python prefork_server.py --answer-cache 4096   # Cache de preguntas (uno por worker)
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict, Optional
+
+from async_http import Request, build_response, start_server
+
+RULES_WATCH_INTERVAL = 1.0  # Segundos entre revisiones de loan_rules.json en cada worker
+
+
+def memory_usage(pid: int) -> Optional[Dict[str, int]]:
+    """RSS, PSS y USS (memoria privada) de un proceso en bytes, desde /proc (Linux)."""
+    values = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+                    values[key] = int(rest.split()[0]) * 1024
+    except OSError:
+        return None
+    return {"rss": values.get("Rss", 0), "pss": values.get("Pss", 0),
+            "uss": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0)}
+
+
+def warm(max_concurrency: int, answer_cache_size: int = 0):
+    """Importa y compila todo lo que los workers van a compartir."""
+    from faq_server import FAQService
+    from graph_registry import get_graph, load_lesson_module
+
+    class PreforkService(FAQService):
+        """FAQService más un endpoint de préstamos con el grafo ya compilado."""
+
+        def __init__(self):
+            super().__init__(max_concurrency, answer_cache_size=answer_cache_size)
+            self.rules = load_lesson_module("01-fundamentos", "02_nodos_y_edges").RULES
+            self.loan = get_graph("loan")
+            # El índice TF-IDF se abre aquí (mmap si hay KUALTOS_FAQ_STORE) y lo heredan los workers
+            load_lesson_module("01-fundamentos", "03_intro_kualtos").RETRIEVER.get()
+
+        async def handle(self, request: Request) -> bytes:
+            if request.path != "/loan":
+                return await super().handle(request)
+            try:
+                application = json.loads(request.body or b"{}")
+                state = {
+                    "applicant_name": str(application["applicant_name"]),
+                    "requested_amount": float(application["requested_amount"]),
+                    "credit_score": int(application["credit_score"]),
+                    "employment_status": str(application["employment_status"]),
+                    "decision": "",
+                    "reason": "",
+                }
+            except (ValueError, KeyError, TypeError, AttributeError):
+                return self.bad_request
+            result = await self.loan.ainvoke(state)
+            body = json.dumps({"decision": result["decision"], "reason": result["reason"],
+                               "quote": result.get("quote")}, ensure_ascii=False)
+            return build_response(200, body.encode("utf-8"))
+
+    service = PreforkService()
+
+    # Una invocación de cada grafo: inicializa lo que LangGraph prepara de forma perezosa
+    async def first_calls():
+        await service.agent.ainvoke({"user_query": "¿Cuál es la tasa de interés?",
+                                     "identified_topic": "", "response": "", "found_answer": False})
+        await service.loan.ainvoke({"applicant_name": "Juan Pérez", "requested_amount": 10000.0,
+                                    "credit_score": 750, "employment_status": "empleado",
+                                    "decision": "", "reason": ""})
+    asyncio.run(first_calls())
+    return service
+
+
+def listen(host: str, port: int, backlog: int = 1024) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.setblocking(False)
+    return sock
+
+
+async def serve_worker(service, sock: socket.socket, ready_fd: Optional[int]) -> None:
+    # SIGUSR1 fuerza una recolección completa: muestra cuántas páginas copia el GC sin freeze
+    asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, gc.collect)
+    # Cada worker vigila loan_rules.json por su cuenta (los hilos no se heredan con fork)
+    service.rules.start_watching(RULES_WATCH_INTERVAL)
+    server = await start_server(service.handle, host=None, port=None, sock=sock)
+    if ready_fd is not None:
+        # CLOCK_MONOTONIC es el mismo para todos los procesos: el padre calcula el arranque
+        os.write(ready_fd, f"{os.getpid()} {time.monotonic()}\n".encode())
+        os.close(ready_fd)
+    async with server:
+        await server.serve_forever()
+
+
+def run_worker(service, sock: socket.socket, ready_fd: Optional[int]) -> None:
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    try:
+        asyncio.run(serve_worker(service, sock, ready_fd))
+    finally:
+        os._exit(0)  # Sin atexit del padre (ej: perfiles) ni limpieza de objetos compartidos
+
+
+class Prefork:
+    """Proceso padre: calienta, hace fork de los workers y los supervisa."""
+
+    def __init__(self, workers: int, host: str, port: int, freeze: bool = True,
+                 max_concurrency: int = 256, answer_cache_size: int = 0):
+        self.workers = workers
+        self.freeze = freeze
+        self.stopping = False
+        self.children: Dict[int, float] = {}  # pid → momento del fork
+        self.cold_starts: Dict[int, float] = {}  # pid → ms hasta aceptar conexiones
+
+        start = time.perf_counter()
+        if freeze:
+            gc.disable()  # Evita que una recolección antes del fork deje huecos en las páginas
+        self.service = warm(max_concurrency, answer_cache_size)
+        self.sock = listen(host, port)
+        if freeze:
+            gc.freeze()
+        self.warm_seconds = time.perf_counter() - start
+
+    def spawn(self) -> int:
+        ready_r, ready_w = os.pipe()
+        forked_at = time.monotonic()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_r)
+            if self.freeze:
+                gc.enable()
+            run_worker(self.service, self.sock, ready_w)
+        os.close(ready_w)
+        self.children[pid] = forked_at
+        with os.fdopen(ready_r) as ready:
+            line = ready.readline()
+        if line:
+            _, ready_at = line.split()
+            self.cold_starts[pid] = (float(ready_at) - forked_at) * 1000
+        return pid
+
+    def stop(self, *_) -> None:
+        self.stopping = True
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def supervise(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        while self.children:
+            try:
+                pid, _ = os.wait()
+            except ChildProcessError:
+                break
+            self.children.pop(pid, None)
+            if not self.stopping:
+                print(f"⚠️  Worker {pid} terminó; iniciando otro", file=sys.stderr)
+                self.spawn()
+
+    def stats(self) -> dict:
+        return {"parent_pid": os.getpid(), "warm_seconds": self.warm_seconds, "freeze": self.freeze,
+                "workers": [{"pid": pid, "cold_start_ms": self.cold_starts.get(pid)}
+                            for pid in self.children]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor pre-fork de los agentes de Kualtos")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-concurrency", type=int, default=256)
+    parser.add_argument("--answer-cache", type=int, default=0,
+                        help="Preguntas normalizadas en cache por worker (faq_cache.py); 0 = apagado")
+    parser.add_argument("--no-freeze", action="store_true", help="Sin gc.freeze() (para comparar)")
+    parser.add_argument("--no-fork", action="store_true",
+                        help="Calienta y sirve en este mismo proceso (un intérprete nuevo por worker)")
+    parser.add_argument("--stats-json", default=None,
+                        help="Escribe pid y arranque de cada worker en este archivo al estar listos")
+    args = parser.parse_args()
+
+    if args.no_fork:
+        service = warm(args.max_concurrency, args.answer_cache)
+        print(f"🤖 Worker único escuchando en http://{args.host}:{args.port}", file=sys.stderr)
+        asyncio.run(serve_worker(service, listen(args.host, args.port), None))
+        return
+
+    prefork = Prefork(args.workers, args.host, args.port, freeze=not args.no_freeze,
+                      max_concurrency=args.max_concurrency, answer_cache_size=args.answer_cache)
+    print(f"🔥 Calentamiento (imports + grafos + respuestas): {prefork.warm_seconds * 1000:.0f} ms",
+          file=sys.stderr)
+    for _ in range(args.workers):
+        prefork.spawn()
+
+    # El estado del servicio va a stderr, igual que en faq_server.py
+    print(f"🤖 {args.workers} workers escuchando en http://{args.host}:{args.port} "
+          f"(/faq, /loan, /health), gc.freeze: {'sí' if prefork.freeze else 'no'}", file=sys.stderr)
+    for pid, ms in prefork.cold_starts.items():
+        print(f"   worker {pid}: listo en {ms:.1f} ms", file=sys.stderr)
+    if args.stats_json:
+        with open(args.stats_json, "w") as f:
+            json.dump(prefork.stats(), f)
+
+    prefork.supervise()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Almacén de sesiones por niveles para el grafo de ConversationState.
+Las sesiones activas viven en un LRU en memoria de tamaño acotado; las frías se
+desalojan a un archivo SQLite local con escrituras por lotes. Así una
+conversación puede continuar entre invocaciones sin que la RAM crezca con el
+número de conversaciones.
+
+Uso:
+    python session_store.py [num_sesiones] [max_en_memoria]
+"""
+
+import contextlib
+import io
+import os
+import pickle
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from graph_registry import get_graph
+
+
+class TieredSessionStore:
+    """LRU en memoria (nivel caliente) con desalojo a SQLite (nivel frío)."""
+
+    def __init__(self, path: str = "sessions.db", max_hot: int = 10_000, batch_size: int = 500):
+        self.max_hot = max_hot
+        self.batch_size = batch_size
+        self._hot: "OrderedDict[str, dict]" = OrderedDict()
+        self._pending: dict = {}  # Desalojadas que aún no se escriben a disco
+        self._lock = threading.RLock()
+
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, state BLOB NOT NULL)"
+        )
+
+        self.hot_hits = 0
+        self.cold_hits = 0
+        self.misses = 0
+        self.spilled = 0
+
+    def get(self, session_id: str) -> Optional[dict]:
+        """Retorna el estado de la sesión (promoviéndola a memoria) o None si no existe."""
+        with self._lock:
+            state = self._hot.get(session_id)
+            if state is not None:
+                self._hot.move_to_end(session_id)
+                self.hot_hits += 1
+                return state
+
+            state = self._pending.pop(session_id, None)
+            if state is None:
+                row = self._db.execute(
+                    "SELECT state FROM sessions WHERE id = ?", (session_id,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                state = pickle.loads(row[0])
+
+            self.cold_hits += 1
+            self._promote(session_id, state)
+            return state
+
+    def put(self, session_id: str, state: dict) -> None:
+        """Guarda el estado más reciente de la sesión en el nivel caliente."""
+        with self._lock:
+            self._pending.pop(session_id, None)
+            self._promote(session_id, state)
+
+    def _promote(self, session_id: str, state: dict) -> None:
+        self._hot[session_id] = state
+        self._hot.move_to_end(session_id)
+        while len(self._hot) > self.max_hot:
+            cold_id, cold_state = self._hot.popitem(last=False)
+            self._pending[cold_id] = cold_state
+        if len(self._pending) >= self.batch_size:
+            self._flush_pending()
+
+    def _flush_pending(self) -> None:
+        """Escribe las sesiones desalojadas en una sola transacción."""
+        if not self._pending:
+            return
+        rows = [(sid, pickle.dumps(state, pickle.HIGHEST_PROTOCOL))
+                for sid, state in self._pending.items()]
+        self._db.execute("BEGIN")
+        self._db.executemany("INSERT OR REPLACE INTO sessions (id, state) VALUES (?, ?)", rows)
+        self._db.execute("COMMIT")
+        self.spilled += len(rows)
+        self._pending.clear()
+
+    def flush(self) -> None:
+        """Persiste en SQLite todas las sesiones, incluidas las calientes."""
+        with self._lock:
+            self._pending.update(self._hot)
+            self._flush_pending()
+
+    def close(self) -> None:
+        self.flush()
+        self._db.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hot": len(self._hot),
+                "pending": len(self._pending),
+                "hot_hits": self.hot_hits,
+                "cold_hits": self.cold_hits,
+                "misses": self.misses,
+                "spilled": self.spilled,
+            }
+
+
+def run_turn(store: TieredSessionStore, session_id: str, user_name: str, user_age: int = 0,
+             graph=None) -> dict:
+    """
+    Ejecuta el grafo de conversación continuando la sesión guardada (si existe)
+    y guarda el estado resultante.
+    """
+    graph = graph or get_graph("conversation")
+    state = store.get(session_id) or {
+        "messages": [],
+        "user_name": user_name,
+        "turn_count": 0,
+        "user_age": user_age,
+    }
+    result = graph.invoke(state)
+    store.put(session_id, result)
+    return result
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    max_hot = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TieredSessionStore(os.path.join(tmp, "sessions.db"), max_hot=max_hot)
+
+        # Un turno real para tener un estado representativo de ConversationState
+        with contextlib.redirect_stdout(io.StringIO()):
+            template = run_turn(store, "plantilla", "María", 25)
+
+        start = time.perf_counter()
+        for i in range(sessions):
+            store.put(f"sesion-{i}", dict(template, user_name=f"Usuario {i}"))
+        load_s = time.perf_counter() - start
+
+        def resume_us(session_id: str) -> float:
+            t0 = time.perf_counter()
+            store.get(session_id)
+            return (time.perf_counter() - t0) * 1e6
+
+        # Las últimas max_hot sesiones siguen en memoria; las primeras ya están en SQLite
+        hot = [resume_us(f"sesion-{i}") for i in range(sessions - 500, sessions)]
+        cold = [resume_us(f"sesion-{i}") for i in range(0, 500)]
+        stats = store.stats()
+        store.close()
+
+    print("=" * 70)
+    print("ALMACÉN DE SESIONES POR NIVELES")
+    print("=" * 70)
+    print(f"Sesiones: {sessions:,} | Máximo en memoria: {max_hot:,}")
+    print(f"Carga: {sessions / load_s:,.0f} sesiones/s ({stats['spilled']:,} desalojadas a SQLite)")
+    print(f"Reanudar sesión caliente: p50 {statistics.median(hot):.1f} µs | p99 {percentile(hot, 0.99):.1f} µs")
+    print(f"Reanudar sesión fría:     p50 {statistics.median(cold):.1f} µs | p99 {percentile(cold, 0.99):.1f} µs")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
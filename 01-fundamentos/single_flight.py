@@ -0,0 +1,154 @@
+"""
+Coalescencia de solicitudes en vuelo ("single-flight") para el agente FAQ.
+Si llegan varias preguntas equivalentes al mismo tiempo, solo la primera ejecuta
+el grafo; las demás esperan esa misma ejecución y reciben su resultado. A
+diferencia del cache (faq_cache.py), no guarda nada al terminar: solo evita
+trabajo duplicado mientras una ejecución está en curso.
+
+Funciona con hilos (do / ask) y con asyncio (ado / aask); cada modo mantiene su
+propio registro de ejecuciones en curso.
+
+Uso:
+    agent = CoalescingFAQAgent()
+    agent.ask("¿Cuál es la tasa de interés?")          # Desde hilos
+    await agent.aask("¿Cuál es la tasa de interés?")   # Desde asyncio
+    agent.flight.stats()                               # Ejecuciones y llamadas coalescidas
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+from faq_cache import normalize_query
+from graph_registry import get_graph
+
+
+class _Call:
+    """Ejecución en curso compartida entre hilos."""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def _share(result: Any) -> Any:
+    """Cada llamador recibe su propia copia del dict de resultado."""
+    return dict(result) if isinstance(result, dict) else result
+
+
+class SingleFlight:
+    """Registro de ejecuciones en curso por llave, con métricas de coalescencia."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._futures: Dict[str, list] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Ejecuta fn() una sola vez por llave entre todos los hilos concurrentes."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return _share(call.result)
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                self.executions += 1
+                self.errors += call.error is not None
+            call.event.set()
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Versión asyncio de do(): las corrutinas con la misma llave esperan una sola ejecución.
+        La ejecución corre en su propia tarea y todos (el primero incluido) la esperan con
+        shield: si uno se cancela solo se retira él. Si se retiran todos, se cancela.
+        """
+        entry = self._futures.get(key)
+        leader = entry is None
+        if leader:
+            task = asyncio.ensure_future(fn())
+            entry = self._futures[key] = [task, 0]  # [tarea, llamadores esperando]
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            with self._lock:
+                self.coalesced += 1
+        task = entry[0]
+
+        entry[1] += 1
+        try:
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and entry[1] == 1:
+                task.cancel()  # Nadie más espera este resultado
+            raise
+        finally:
+            entry[1] -= 1
+        return result if leader else _share(result)
+
+    def _finish(self, key: str, task: asyncio.Future) -> None:
+        entry = self._futures.get(key)
+        if entry is not None and entry[0] is task:
+            del self._futures[key]
+        failed = task.cancelled() or task.exception() is not None  # exception(): ya leída
+        with self._lock:
+            self.executions += 1
+            self.errors += failed
+
+    def stats(self) -> dict:
+        with self._lock:
+            calls = self.executions + self.coalesced
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "in_flight": len(self._calls) + len(self._futures),
+                "coalesced_ratio": self.coalesced / calls if calls else 0.0,
+            }
+
+
+class CoalescingFAQAgent:
+    """Agente FAQ que comparte una ejecución entre preguntas equivalentes concurrentes."""
+
+    def __init__(self, agent=None, flight: SingleFlight = None):
+        self.agent = agent
+        self.flight = flight or SingleFlight()
+
+    @staticmethod
+    def _initial_state(query: str) -> dict:
+        return {"user_query": query, "identified_topic": "", "response": "", "found_answer": False}
+
+    def ask(self, query: str) -> dict:
+        agent = self.agent or get_graph("faq_agent")
+        result = self.flight.do(normalize_query(query),
+                                lambda: agent.invoke(self._initial_state(query)))
+        result["user_query"] = query  # El resultado compartido trae la pregunta original del primero
+        return result
+
+    async def aask(self, query: str) -> dict:
+        agent = self.agent or get_graph("faq_agent")
+        result = await self.flight.ado(normalize_query(query),
+                                       lambda: agent.ainvoke(self._initial_state(query)))
+        result["user_query"] = query
+        return result